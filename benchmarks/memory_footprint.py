@@ -0,0 +1,166 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+
+Memory footprint per content of a loaded site.
+
+A throwaway site with a few hundred and then a few thousand marked contents is generated, loaded and measured with
+tracemalloc, each in a process of its own. The difference divided by the difference in the number of contents is the footprint of one content: its
+cfields, cpath, curl, front matter syd and what is kept for it by the object manager. It is measured right after load
+and again after every field of every content was got. The sizes of single objects of the classes there are most of
+are printed too.
+
+Run it from the repository root on two trees to compare them:
+    python benchmarks/memory_footprint.py [n_contents]
+"""
+import os
+import sys
+import gc
+import json
+import shutil
+import tempfile
+import subprocess
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+from synamic import Synamic
+
+
+_TYPE_SYD = """title: Type
+type: single
+is_public: 0
+marks: [
+    {
+        title: Post
+    }
+]
+"""
+
+_TAGS_SYD = """title: Tags
+type: multiple
+marks: [
+    {
+        title: Design
+    }
+    {
+        title: Programming
+    }
+    {
+        title: Career
+    }
+]
+"""
+
+_CONTENT_MD = """---
+title: Post {idx}
+type: post
+tags: Design, Programming
+slug: post-{idx}
+created_on: 2018-04-22 10:00:00
+updated_on: 2019-04-01 10:00:00
+summary: Summary of the post number {idx}
+---
+
+# Post {idx}
+
+Body of the post.
+"""
+
+
+def make_site(site_root, n_contents):
+    os.makedirs(os.path.join(site_root, 'metas', 'markers'))
+    with open(os.path.join(site_root, 'metas', 'markers', 'type.syd'), 'w', encoding='utf-8') as f:
+        f.write(_TYPE_SYD)
+    with open(os.path.join(site_root, 'metas', 'markers', 'tags.syd'), 'w', encoding='utf-8') as f:
+        f.write(_TAGS_SYD)
+    # contents spread over a few dirs as on a real site
+    for idx in range(n_contents):
+        dir_path = os.path.join(site_root, 'contents', 'blog', f'year{idx % 10}')
+        os.makedirs(dir_path, exist_ok=True)
+        with open(os.path.join(dir_path, f'post{idx}.md'), 'w', encoding='utf-8') as f:
+            f.write(_CONTENT_MD.format(idx=idx))
+
+
+def get_all_fields(synamic):
+    site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+    cfields_s = site.object_manager.query_cfields(':sortby title')
+    for cfields in cfields_s:
+        for key in cfields.raw.keys():
+            cfields.get(key)
+        cfields.curl.url
+    return site, cfields_s
+
+
+def deep_size(obj):
+    """Size of the object with its __dict__, if it has one"""
+    size = sys.getsizeof(obj)
+    if getattr(type(obj), '__dictoffset__', 0):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(n_contents):
+    """Returns the memory in bytes held by the loaded site with the fields not got and got, and the sizes of single
+    objects"""
+    site_root = tempfile.mkdtemp(prefix='synamic_memory_')
+    try:
+        make_site(site_root, n_contents)
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        synamic = Synamic(site_root)
+        synamic.load()
+        gc.collect()
+        loaded = tracemalloc.get_traced_memory()[0] - start
+        site, cfields_s = get_all_fields(synamic)
+        gc.collect()
+        got = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(site_root)
+
+    cfields = cfields_s[0]
+    syd = cfields.raw
+    object_sizes = [
+        ('SydContainer', deep_size(syd)),
+        ('SydData', deep_size(syd.get_child('title'))),
+        ('_ContentFields', deep_size(cfields)),
+        ('_Mark', deep_size(cfields.get('tags')[0])),
+        ('CPath', deep_size(cfields.cpath)),
+        ('ContentUrl', deep_size(cfields.curl)),
+    ]
+    return loaded, got, object_sizes
+
+
+def measure_in_process(n_contents):
+    # a process can have one synamic for a site root only
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--measure', str(n_contents)])
+    return json.loads(output)
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--measure':
+        print(json.dumps(measure(int(sys.argv[2]))))
+        return
+
+    n_contents = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_base = max(1, n_contents // 10)
+
+    base_loaded, base_got, _ = measure_in_process(n_base)
+    loaded, got, object_sizes = measure_in_process(n_contents)
+    n_diff = n_contents - n_base
+    print(f'{n_contents} contents')
+    print(f'per content after load:       {(loaded - base_loaded) / n_diff:8.0f} bytes')
+    print(f'per content after got fields: {(got - base_got) / n_diff:8.0f} bytes')
+    print('size of single objects (with their __dict__):')
+    for name, size in object_sizes:
+        print(f'    {name:16} {size:6} bytes')
+
+
+if __name__ == '__main__':
+    main()
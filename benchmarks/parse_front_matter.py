@@ -0,0 +1,49 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+
+Parsing time of a typical front matter with the flat fast path of SydParser and with the full state machine parser.
+
+Run it from the repository root:
+    python benchmarks/parse_front_matter.py [n_times]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+from synamic.core.parsing_systems.curlybrace_parser import SydParser
+
+
+FRONT_MATTER = """title: Ten things about static site generators
+slug: ten-things
+type: post
+author: user1
+tags: Career, Design, Marketing
+categories: (Programming, Python)
+created_on: 2018-04-22 10:00:00
+updated_on: 2019-04-01 10:00:00
+image: /images/ten-things.png
+summary: What we learnt building the site
+// kept for the old theme
+order: 5
+"""
+
+
+def main():
+    n_times = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    results = {}
+    for name, fast in (('full parser', False), ('fast path', True)):
+        seconds = min(timeit.repeat(lambda: SydParser(FRONT_MATTER, fast=fast).parse(), number=n_times, repeat=5))
+        results[name] = seconds / n_times
+        print(f'{name:12} {results[name] * 1e6:8.1f} us per front matter')
+    print(f'speedup      {results["full parser"] / results["fast path"]:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
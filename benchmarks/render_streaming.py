@@ -0,0 +1,135 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+
+Peak memory and time to the first byte of writing out a big page rendered as a whole (get_stream()) and rendered while
+it is being written (iter_chunks()).
+
+A throwaway site with one page of a few megabytes, its body and an index of its sections, is generated. The body is
+rendered before measuring, so that only the rendering of the template and the writing are measured.
+
+Run it from the repository root:
+    python benchmarks/render_streaming.py [n_sections]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+from synamic import Synamic
+
+
+_TYPE_SYD = """title: Type
+type: single
+is_public: 0
+marks: [
+    {
+        title: Page
+    }
+]
+"""
+
+_TEMPLATE = """<!doctype html>
+<html>
+    <head> <title> {{ content.title }} </title> </head>
+    <body>
+        {{ content.body.as_markup }}
+        <ul>{% for idx in range(N_SECTIONS) %}<li><a href="#section-{{ idx }}">Section {{ idx }}</a></li>{% endfor %}</ul>
+    </body>
+</html>
+"""
+
+_SECTION_MD = """
+## Section {idx}
+
+Paragraph of the section number {idx} with some *emphasis*, a [link](https://example.com/{idx}) and `code`.
+"""
+
+
+def make_site(site_root, n_sections):
+    os.makedirs(os.path.join(site_root, 'metas', 'markers'))
+    with open(os.path.join(site_root, 'metas', 'markers', 'type.syd'), 'w', encoding='utf-8') as f:
+        f.write(_TYPE_SYD)
+    os.makedirs(os.path.join(site_root, 'themes'))
+    with open(os.path.join(site_root, 'themes', 'default.html'), 'w', encoding='utf-8') as f:
+        f.write(_TEMPLATE.replace('N_SECTIONS', str(n_sections)))
+    os.makedirs(os.path.join(site_root, 'contents'))
+    with open(os.path.join(site_root, 'contents', 'big.md'), 'w', encoding='utf-8') as f:
+        f.write('---\ntitle: Big page\ntype: page\n---\n')
+        for idx in range(n_sections):
+            f.write(_SECTION_MD.format(idx=idx))
+
+
+def write_whole(content, file_path):
+    with content.get_stream() as fr:
+        with open(file_path, 'wb') as fw:
+            data = fr.read(1024)
+            yield
+            while data:
+                fw.write(data)
+                data = fr.read(1024)
+
+
+def write_streamed(content, file_path):
+    with open(file_path, 'wb') as fw:
+        first = True
+        for data in content.iter_chunks():
+            fw.write(data)
+            if first:
+                first = False
+                yield
+
+
+def measure(write, content, file_path):
+    """Returns the peak of memory allocated while writing, the seconds till the first byte and in total"""
+    start = time.perf_counter()
+    writing = write(content, file_path)
+    next(writing)
+    first_byte = time.perf_counter() - start
+    for _ in writing:
+        pass
+    total = time.perf_counter() - start
+
+    # timed without tracing, tracing slows down allocations
+    tracemalloc.start()
+    for _ in write(content, file_path):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, first_byte, total
+
+
+def main():
+    n_sections = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    site_root = tempfile.mkdtemp(prefix='synamic_streaming_')
+    try:
+        make_site(site_root, n_sections)
+        synamic = Synamic(site_root)
+        synamic.load()
+        site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+        cfields = site.object_manager.query_cfields('title == Big page')[0]
+        content = site.object_manager.get_marked_content(cfields.cpath)
+        content.body
+        file_path = os.path.join(site_root, 'big.html')
+        for name, write in (('whole page', write_whole), ('streamed', write_streamed)):
+            # warm up the template
+            for _ in write(content, file_path):
+                pass
+            peak, first_byte, total = measure(write, content, file_path)
+            print(f'{name:10} peak {peak / 1024 / 1024:7.2f} MiB  first byte {first_byte * 1000:8.1f} ms  '
+                  f'total {total * 1000:8.1f} ms')
+        print(f'page size  {os.path.getsize(file_path) / 1024 / 1024:.2f} MiB')
+    finally:
+        shutil.rmtree(site_root)
+
+
+if __name__ == '__main__':
+    main()
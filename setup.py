@@ -32,6 +32,9 @@ setup(
         'sly>=0.3',
         'aiohttp>=3.4.4',
     ],
+    extras_require={
+        'columnar': ['numpy>=1.13'],
+    },
     python_requires='>=3.6',
     long_description=long_description
 )
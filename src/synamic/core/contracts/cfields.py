@@ -2,6 +2,8 @@ import abc
 
 
 class CFieldsContract(metaclass=abc.ABCMeta):
+    __slots__ = ()
+
     @abc.abstractmethod
     def get(self, key, default=None):
         pass
@@ -11,6 +11,10 @@ import abc
 import enum
 
 
+# bytes read from the stream of a content at a time by iter_chunks()
+CONTENT_CHUNK_SIZE = 64 * 1024
+
+
 @enum.unique
 class CDocType(enum.Enum):
     # later, intending the use of auto() - currently this project in 3.5 and auto() is available in 3.6
@@ -76,6 +80,17 @@ class ContentContract(metaclass=abc.ABCMeta):
         This will be a file like object. 
         """
 
+    def iter_chunks(self):
+        """
+        Bytes of the content piece by piece, for writing it out without holding all of it in memory. Rendered
+        contents override it to write what is rendered while the rest is being rendered.
+        """
+        with self.get_stream() as f:
+            data = f.read(CONTENT_CHUNK_SIZE)
+            while data:
+                yield data
+                data = f.read(CONTENT_CHUNK_SIZE)
+
     @property
     @abc.abstractmethod
     def body(self):
@@ -23,9 +23,25 @@ class BaseFsBackendContract(metaclass=abc.ABCMeta):
         """Lists a directory"""
 
     @abc.abstractmethod
-    def makedirs(self, path):
+    def scandir(self, path):
+        """Lists a directory with the type of the entries: a list of (name, is_file, is_dir) tuples"""
+
+    @abc.abstractmethod
+    def makedirs(self, path, exist_ok=False):
         """Makes directories recursively"""
 
+    @abc.abstractmethod
+    def stat(self, path):
+        """Returns a tuple of (size, mtime, ctime) of the path"""
+
+    @abc.abstractmethod
+    def invalidate(self, path):
+        """Forgets anything cached about the path"""
+
+    @abc.abstractmethod
+    def invalidate_all(self):
+        """Forgets anything cached"""
+
     @abc.abstractmethod
     def getmtime(self, path):
         """Get modification? time"""
@@ -1,7 +1,10 @@
 import os
 from synamic.core.parsing_systems.curlybrace_parser import SydParser
+from synamic.core.parsing_systems.compiled_syd import SYDC_EXT, COMPILED_SYD_DIR_NAME, load_syd_file
 from synamic.core.parsing_systems.model_parser import ModelParser
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# under the compiled syd dir of the cache dir of the project
+_COMPILED_DEFAULT_DATA_DIR_NAME = 'default_data'
 
 
 def get_file_contents(fn, default=None):
@@ -14,7 +17,10 @@ def get_file_contents(fn, default=None):
 
 
 class DefaultDataManager:
-    def __init__(self):
+    def __init__(self, root_path=None):
+        """The compiled (.sydc) default syds are kept in the cache dir of the project at root_path, never in the package
+        dir. Without root_path they are parsed. dirs.syd is always parsed, it tells where the cache dir is."""
+        self.__root_path = root_path
         self.__loaded_syds = {}
         self.__loaded_models = {}
         self.__system_settings = None
@@ -23,13 +29,27 @@ class DefaultDataManager:
         if name in self.__loaded_syds:
             sydC = self.__loaded_syds[name]
         else:
-            text = get_file_contents(name + '.syd', None)
-            if text is None:
+            full_fn = os.path.join(_BASE_DIR, name + '.syd')
+            if not os.path.exists(full_fn):
                 return default
-            sydC = SydParser(text).parse()
+            sydc_dir = self.__sydc_dir(name)
+            if sydc_dir is None:
+                sydC = SydParser(get_file_contents(name + '.syd')).parse()
+            else:
+                sydC = load_syd_file(
+                    full_fn, os.path.join(sydc_dir, name + SYDC_EXT), lambda text: SydParser(text).parse()
+                )
             self.__loaded_syds[name] = sydC
         return sydC
 
+    def __sydc_dir(self, name):
+        if self.__root_path is None or name == 'dirs':
+            return None
+        cache_dir = self.get_syd('dirs')['dirs.cache.cache']
+        return os.path.join(
+            self.__root_path, cache_dir.lstrip('/'), COMPILED_SYD_DIR_NAME, _COMPILED_DEFAULT_DATA_DIR_NAME
+        )
+
     def get_system_settings(self):
         if self.__system_settings is None:
             configs_syd = self.get_syd('configs')
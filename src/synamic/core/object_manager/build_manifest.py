@@ -0,0 +1,340 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import os
+import json
+import hashlib
+from synamic.core.services.content.content_splitter import content_splitter
+from synamic.exceptions import SynamicError, SynamicFSError
+
+
+MANIFEST_VERSION = 2
+MANIFEST_FILE_NAME = 'build_manifest.json'
+
+
+def _sha1(*parts):
+    h = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        h.update(part)
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class BuildManifest:
+    """Persistent record of the last build that is kept in the cache dir.
+
+    For every file the build read it keeps size, mtime and hashes, so that unchanged files are never hashed again.
+    For every output it keeps the site, a site key, the dependencies recorded in the dependency graph when it was
+    rendered (with their fingerprints) and the hash of the output. The next build re-renders only those outputs whose
+    site key or any dependency fingerprint changed or whose output file was changed or removed.
+
+    Fingerprints of dependencies:
+        - file: hash of the file.
+        - fields: hash of the front matter and the dates of the cfields (dates may come from file times).
+        - query: paths of the resulted cfields in order - the query is run again to check it.
+        - listing: fields fingerprints of all marked contents of the site.
+        - generated: nothing of its own, its dependencies are checked instead.
+
+    Site key: settings and metas of the site. Pre processed contents also depend on the templates of all sites and on
+    the pre process dir as their sources are not recorded in the dependency graph.
+    """
+    def __init__(self, synamic):
+        self.__synamic = synamic
+        self.__dependency_graph = synamic.object_manager.dependency_graph
+        self.__old_files = {}
+        self.__old_outputs = {}
+        self.__files = {}
+        self.__outputs = {}
+        self.__templates_key = None
+        self.__fingerprints = {}
+        self.__cfields_by_path = None
+
+        self.__n_built = 0
+        self.__n_skipped = 0
+
+    @property
+    def cfile(self):
+        cache_dir = self.__synamic.system_settings['dirs.cache.cache']
+        return self.__synamic.path_tree.create_file_cpath(cache_dir + '/' + MANIFEST_FILE_NAME)
+
+    @property
+    def stats(self):
+        return {'built': self.__n_built, 'skipped': self.__n_skipped}
+
+    def load(self):
+        """Returns False when there is no usable manifest: in that case a full build is needed.
+        Dependencies of the outputs of the last build are restored into the dependency graph."""
+        cfile = self.cfile
+        if not cfile.exists():
+            return False
+        try:
+            with cfile.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (SynamicFSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+            return False
+        self.__old_files = data.get('files', {})
+        self.__old_outputs = data.get('outputs', {})
+
+        dependency_graph = self.__dependency_graph
+        for out_path, record in self.__old_outputs.items():
+            dependency_graph.set_dependencies(
+                dependency_graph.output_node(out_path),
+                *(self.__decode_node(node_str) for node_str in record['deps'])
+            )
+        return True
+
+    def reset(self):
+        self.__old_files = {}
+        self.__old_outputs = {}
+
+    def delete(self):
+        cfile = self.cfile
+        if cfile.exists():
+            cfile.remove()
+
+    def save(self):
+        cfile = self.cfile
+        cfile.parent_cpath.makedirs(exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'files': self.__files,
+            'outputs': self.__outputs,
+        }
+        with cfile.open('w', encoding='utf-8') as f:
+            json.dump(data, f, sort_keys=True, indent=1)
+
+    # files
+    def __file_record(self, abs_path, front_matter_of=None):
+        """front_matter_of: cpath of the file when the hash of the front matter is needed.
+        Returns None if the file does not exist."""
+        with_front_matter = front_matter_of is not None
+        record = self.__files.get(abs_path, None)
+        if record is not None and (not with_front_matter or record[3] is not None):
+            return record
+
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+        old = self.__old_files.get(abs_path, None)
+        if old is not None and old[0] == st.st_size and old[1] == st.st_mtime_ns and \
+                (not with_front_matter or old[3] is not None):
+            record = old
+        else:
+            with open(abs_path, 'rb') as f:
+                data = f.read()
+            fm_hash = None
+            if with_front_matter:
+                front_matter, _ = content_splitter(front_matter_of, data.decode('utf-8'))
+                fm_hash = _sha1(front_matter)
+            record = [st.st_size, st.st_mtime_ns, hashlib.sha1(data).hexdigest(), fm_hash]
+        self.__files[abs_path] = record
+        return record
+
+    def file_hash(self, path):
+        record = self.__file_record(path if isinstance(path, str) else path.abs_path)
+        return None if record is None else record[2]
+
+    def front_matter_hash(self, cpath):
+        record = self.__file_record(cpath.abs_path, front_matter_of=cpath)
+        return None if record is None else record[3]
+
+    def __dir_key(self, cdir):
+        if not cdir.exists():
+            return _sha1('')
+        parts = []
+        for cfile in sorted(cdir.list_files(respect_settings=False), key=lambda cp: cp.abs_path):
+            parts.append(cfile.abs_path)
+            parts.append(self.file_hash(cfile))
+        return _sha1(*parts)
+
+    def __get_templates_key(self):
+        if self.__templates_key is None:
+            sites = self.__synamic.sites
+            parts = []
+            for site_id in sites.ids:
+                parts.append(self.__dir_key(sites.get_by_id(site_id).cpaths.templates_cdir))
+            self.__templates_key = _sha1(*parts)
+        return self.__templates_key
+
+    # fingerprints
+    @staticmethod
+    def __encode_node(node):
+        return json.dumps(node)
+
+    @staticmethod
+    def __decode_node(node_str):
+        return tuple(json.loads(node_str))
+
+    def __get_site(self, site_id_str):
+        sites = self.__synamic.sites
+        try:
+            return sites.get_by_id(sites.make_id(site_id_str))
+        except KeyError:
+            return None
+
+    def __get_cfields(self, abs_path):
+        if self.__cfields_by_path is None:
+            self.__cfields_by_path = {}
+            sites = self.__synamic.sites
+            for site_id in sites.ids:
+                for cfields in sites.get_by_id(site_id).object_manager.get_all_cached_marked_cfields():
+                    self.__cfields_by_path[cfields.cpath.abs_path] = cfields
+        return self.__cfields_by_path.get(abs_path, None)
+
+    def fingerprint(self, node):
+        """Fingerprint of a node of the dependency graph in the current state of the project; None when it does not
+        exist any more."""
+        fingerprint = self.__fingerprints.get(node, False)
+        if fingerprint is not False:
+            return fingerprint
+
+        graph = self.__dependency_graph
+        kind = node[0]
+        if kind == graph.FILE:
+            fingerprint = self.file_hash(node[1])
+        elif kind == graph.FIELDS:
+            cfields = self.__get_cfields(node[1])
+            if cfields is None:
+                fingerprint = None
+            else:
+                fingerprint = _sha1(
+                    self.front_matter_hash(cfields.cpath), str(cfields.get('created_on')),
+                    str(cfields.get('updated_on'))
+                )
+        elif kind == graph.QUERY:
+            site = self.__get_site(node[1])
+            if site is None:
+                fingerprint = None
+            else:
+                try:
+                    result = site.object_manager.query_cfields(node[2])
+                except SynamicError:
+                    fingerprint = None
+                else:
+                    fingerprint = _sha1(*[cfields.cpath.abs_path for cfields in result])
+        elif kind == graph.LISTING:
+            site = self.__get_site(node[1])
+            if site is None:
+                fingerprint = None
+            else:
+                cpaths = sorted(
+                    (cfields.cpath for cfields in site.object_manager.get_all_cached_marked_cfields()),
+                    key=lambda cp: cp.abs_path
+                )
+                fingerprint = _sha1(*[
+                    cpath.abs_path + ':' + str(self.fingerprint(graph.fields_node(cpath))) for cpath in cpaths
+                ])
+        elif kind == graph.GENERATED:
+            fingerprint = ''
+        else:
+            fingerprint = None
+        self.__fingerprints[node] = fingerprint
+        return fingerprint
+
+    # plan
+    def plan_site(self, site, c_iter):
+        """Returns a tuple of (idx, output path, site key) for the elements of c_iter that must be built. The
+        records of the up to date outputs are carried to the new manifest. Contents are not built for planning."""
+        pre_processed_contents = set(site.object_manager.get_all_pre_processed_contents())
+
+        site_key = _sha1(
+            str(MANIFEST_VERSION),
+            str(site.settings.origin_syd),
+            self.__dir_key(site.cpaths.metas_cdir),
+        )
+        pre_processed_key = None
+
+        to_build = []
+        for idx, elem in enumerate(c_iter.clist):
+            out_path = output_path_of(c_iter.get_curl(elem))
+            key = site_key
+            # the templates of the other contents are recorded in their dependencies
+            if elem in pre_processed_contents:
+                if pre_processed_key is None:
+                    pre_processed_key = _sha1(
+                        site_key, self.__get_templates_key(), self.__dir_key(site.cpaths.pre_process_cdir)
+                    )
+                key = pre_processed_key
+
+            if self.__is_up_to_date(out_path, key):
+                self.__outputs[out_path] = self.__old_outputs[out_path]
+                self.__n_skipped += 1
+            else:
+                to_build.append((idx, out_path, key))
+        return tuple(to_build)
+
+    def __is_up_to_date(self, out_path, key):
+        old = self.__old_outputs.get(out_path, None)
+        if old is None or old['key'] != key:
+            return False
+        for node_str, fingerprint in old['deps'].items():
+            if self.fingerprint(self.__decode_node(node_str)) != fingerprint:
+                return False
+        output_cdir = self.__get_output_cdir()
+        out_abs_path = output_cdir.join(out_path, is_file=True).abs_path
+        try:
+            st = os.stat(out_abs_path)
+        except OSError:
+            return False
+        return st.st_size == old['size'] and st.st_mtime_ns == old['mtime']
+
+    def record_output(self, site, out_path, key, output_hash):
+        """Must be called after the dependencies of the output are set in the dependency graph"""
+        dependency_graph = self.__dependency_graph
+        deps = {}
+        for node in dependency_graph.dependencies_of(dependency_graph.output_node(out_path)):
+            if node[0] != dependency_graph.OUTPUT:
+                deps[self.__encode_node(node)] = self.fingerprint(node)
+
+        output_cdir = self.__get_output_cdir()
+        st = os.stat(output_cdir.join(out_path, is_file=True).abs_path)
+        self.__outputs[out_path] = {
+            'site': site.id.as_string,
+            'key': key,
+            'deps': deps,
+            'hash': output_hash,
+            'size': st.st_size,
+            'mtime': st.st_mtime_ns,
+        }
+        self.__n_built += 1
+
+    def remove_stale_outputs(self):
+        """Removes outputs of the last build that are not produced by this build (and the dirs left empty)"""
+        output_cdir = self.__get_output_cdir()
+        file_index = self.__synamic.path_tree.file_index
+        dependency_graph = self.__dependency_graph
+        for out_path in sorted(set(self.__old_outputs) - set(self.__outputs)):
+            dependency_graph.remove(dependency_graph.output_node(out_path))
+            out_cfile = output_cdir.join(out_path, is_file=True)
+            if out_cfile.exists():
+                print(f'Removing stale output {out_cfile.abs_path}')
+                out_cfile.remove()
+            out_dir = os.path.dirname(out_cfile.abs_path)
+            while out_dir.startswith(output_cdir.abs_path) and out_dir != output_cdir.abs_path:
+                if os.path.isdir(out_dir) and not os.listdir(out_dir):
+                    os.rmdir(out_dir)
+                    file_index.invalidate(out_dir)
+                    out_dir = os.path.dirname(out_dir)
+                else:
+                    break
+
+    def __get_output_cdir(self):
+        output_dir = self.__synamic.system_settings['dirs.outputs.outputs']
+        return self.__synamic.path_tree.create_dir_cpath(output_dir)
+
+
+def output_path_of(curl):
+    """Path of the output file of a curl, relative to the outputs dir"""
+    c_out_dir, fn = curl.to_dirfn_pair_w_site
+    return '/'.join(comp for comp in (*c_out_dir, fn) if comp != '')
@@ -0,0 +1,67 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import hashlib
+from synamic.core.parsing_systems.compiled_syd import (
+    SYDC_EXT,
+    COMPILED_SYD_DIR_NAME,
+    text_hash,
+    dumps_sydc,
+    syd_of_record,
+    read_sydc_file,
+    write_sydc_file
+)
+
+
+class CompiledSydCache:
+    """Compiled (.sydc) forms of the .syd files of the sites (settings, metas, users, menus, markers, data) kept in
+    the cache dir between runs, one .sydc for every .syd file, named after the hash of its abs path.
+
+    A file whose size and mtime did not change since it was compiled is not read at all; a file whose text did not
+    change (e.g. touched by a checkout) is read and hashed but not parsed. Every get() unpickles a new syd. The cache
+    files are written as in load_syd_file(): failing to write one never fails the load.
+    """
+    def __init__(self, synamic):
+        self.__synamic = synamic
+        self.__n_hits = 0
+        self.__n_misses = 0
+
+    @property
+    def cdir(self):
+        cache_dir = self.__synamic.system_settings['dirs.cache.cache']
+        return self.__synamic.path_tree.create_dir_cpath(cache_dir + '/' + COMPILED_SYD_DIR_NAME)
+
+    def cfile_of(self, cpath):
+        name = hashlib.sha1(cpath.abs_path.encode('utf-8')).hexdigest() + SYDC_EXT
+        return self.cdir.join_as_cfile(name)
+
+    @property
+    def stats(self):
+        return {'hits': self.__n_hits, 'misses': self.__n_misses}
+
+    def get(self, cpath, read_text, parse):
+        """Returns the syd of the .syd file at cpath. read_text(cpath) and parse(text) are called to compile it when
+        it is new or was changed."""
+        size, mtime, _ = self.__synamic.path_tree.file_index.stat(cpath.abs_path)
+        sydc_cfile = self.cfile_of(cpath)
+        record = read_sydc_file(sydc_cfile.abs_path)
+        if record is not None and record['size'] == size and record['mtime'] == mtime:
+            self.__n_hits += 1
+            return syd_of_record(record)
+
+        text = read_text(cpath)
+        source_hash = text_hash(text)
+        if record is not None and record['hash'] == source_hash:
+            self.__n_hits += 1
+            syd = syd_of_record(record)
+        else:
+            self.__n_misses += 1
+            syd = parse(text)
+        write_sydc_file(sydc_cfile.abs_path, dumps_sydc(syd, size, mtime, source_hash))
+        return syd
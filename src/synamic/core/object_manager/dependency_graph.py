@@ -0,0 +1,158 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import contextlib
+from collections import defaultdict, deque
+
+
+class DependencyGraph:
+    """Directed graph of what depends on what.
+
+    Nodes are tuples:
+        ('file', abs_path): whole content of a file - templates, bodies of marked contents, included files, .meta.syd,
+            static files.
+        ('fields', abs_path): front matter (and so the fields) of a marked content. It depends on the .meta.syd files
+            merged into it and on the query of its pagination.
+        ('query', site_id, query_str): result of query_cfields(). It depends on the fields of the resulted cfields, the
+            result itself is validated by running the query again.
+        ('listing', site_id): the list of all marked cfields of a site.
+        ('generated', url): a content generated during load (e.g. sitemap), it depends on what was used to generate it.
+        ('output', output_path): a built output, path relative to the outputs dir.
+
+    An edge node -> dependency means that the node must be rebuilt when the dependency changes.
+
+    Dependencies are recorded in two ways: directly with add() or set_dependencies() (e.g. during load), or at render
+    time with record() - that adds the dependencies to every active frame opened by recording(node).
+    """
+    FILE = 'file'
+    FIELDS = 'fields'
+    QUERY = 'query'
+    LISTING = 'listing'
+    GENERATED = 'generated'
+    OUTPUT = 'output'
+
+    def __init__(self):
+        self.__deps = defaultdict(set)
+        self.__rdeps = defaultdict(set)
+        self.__frames = []
+
+    # nodes
+    @classmethod
+    def file_node(cls, path):
+        return cls.FILE, path if isinstance(path, str) else path.abs_path
+
+    @classmethod
+    def fields_node(cls, path):
+        return cls.FIELDS, path if isinstance(path, str) else path.abs_path
+
+    @classmethod
+    def query_node(cls, site, query_str):
+        return cls.QUERY, site.id.as_string, query_str
+
+    @classmethod
+    def listing_node(cls, site):
+        return cls.LISTING, site.id.as_string
+
+    @classmethod
+    def generated_node(cls, curl):
+        return cls.GENERATED, curl.url
+
+    @classmethod
+    def output_node(cls, output_path):
+        return cls.OUTPUT, output_path
+
+    # edges
+    def add(self, node, *dependencies):
+        for dep in dependencies:
+            if dep == node:
+                continue
+            self.__deps[node].add(dep)
+            self.__rdeps[dep].add(node)
+
+    def set_dependencies(self, node, *dependencies):
+        """Replaces the dependencies of the node"""
+        self.remove(node)
+        self.add(node, *dependencies)
+
+    def remove(self, node):
+        """Removes the dependencies of the node (not the dependants)"""
+        for dep in self.__deps.pop(node, ()):
+            dependants = self.__rdeps.get(dep, None)
+            if dependants is not None:
+                dependants.discard(node)
+                if not dependants:
+                    del self.__rdeps[dep]
+
+    def clear(self):
+        self.__deps.clear()
+        self.__rdeps.clear()
+
+    # render time recording
+    @property
+    def is_recording(self):
+        return bool(self.__frames)
+
+    def record(self, *dependencies):
+        for frame in self.__frames:
+            frame.update(dependencies)
+
+    @contextlib.contextmanager
+    def recording(self, node=None):
+        """Collects everything record()ed inside the with block. The collected set is yielded and at the end it
+        becomes the dependencies of the node (when a node is provided)"""
+        frame = set()
+        self.__frames.append(frame)
+        try:
+            yield frame
+        finally:
+            self.__frames.pop()
+        if node is not None:
+            self.set_dependencies(node, *frame)
+
+    # queries
+    def dependencies_of(self, node, transitive=True):
+        if not transitive:
+            return frozenset(self.__deps.get(node, ()))
+        return frozenset(self.__walk((node,), self.__deps))
+
+    def dependants_of(self, *nodes, transitive=True):
+        if not transitive:
+            res = set()
+            for node in nodes:
+                res.update(self.__rdeps.get(node, ()))
+            return frozenset(res)
+        return frozenset(self.__walk(nodes, self.__rdeps))
+
+    def outputs_affected_by_paths(self, *abs_paths):
+        """Output paths that must be rebuilt if the files at the paths change (front matter or anything else)"""
+        nodes = []
+        for abs_path in abs_paths:
+            nodes.append(self.file_node(abs_path))
+            nodes.append(self.fields_node(abs_path))
+        return tuple(sorted(
+            node[1] for node in self.dependants_of(*nodes) if node[0] == self.OUTPUT
+        ))
+
+    @staticmethod
+    def __walk(start_nodes, edges):
+        seen = set()
+        queue = deque(start_nodes)
+        while queue:
+            node = queue.popleft()
+            for next_node in edges.get(node, ()):
+                if next_node not in seen:
+                    seen.add(next_node)
+                    queue.append(next_node)
+        return seen
+
+    def __contains__(self, node):
+        return node in self.__deps or node in self.__rdeps
+
+    def __len__(self):
+        return len(set(self.__deps).union(self.__rdeps))
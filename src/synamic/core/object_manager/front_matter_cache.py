@@ -0,0 +1,156 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import pickle
+from synamic.exceptions import SynamicFSError
+from .parallel_build import can_fork
+from .parallel_load import read_front_matter, read_front_matters_in_parallel, PARALLEL_LOAD_MIN_FILES
+
+
+FRONT_MATTER_CACHE_VERSION = 4
+FRONT_MATTER_CACHE_FILE_NAME = 'front_matter.pickle'
+
+
+class FrontMatterCache:
+    """Parsed front matters of the marked contents kept in the cache dir between runs.
+
+    Every record is keyed by the abs path of the file and holds its size, mtime, the hash of the front matter part of
+    the file, the pickled syd of its front matter and the byte offset of the body. A file whose size and mtime did not
+    change is not read at all; a file whose front matter part did not change (e.g. touched by a checkout or only the
+    body was edited) is read till the end of the front matter but not parsed. Files are never read past the front
+    matter here, body_offset() lets the body be read without reading the front matter again. The syd is unpickled for every
+    get(), so that the cfields never share (and mutate) a cached syd.
+
+    The store is read on first use and written by save() when something changed. Records of files that were not asked
+    for since the store was read are dropped on save.
+    """
+    def __init__(self, synamic):
+        self.__synamic = synamic
+        self.__records = None
+        self.__used_paths = set()
+        self.__is_dirty = False
+        # abs path -> (size, mtime, body offset) of the files read or validated by this process
+        self.__body_offsets = {}
+
+        self.__n_hits = 0
+        self.__n_misses = 0
+
+    @property
+    def cfile(self):
+        cache_dir = self.__synamic.system_settings['dirs.cache.cache']
+        return self.__synamic.path_tree.create_file_cpath(cache_dir + '/' + FRONT_MATTER_CACHE_FILE_NAME)
+
+    @property
+    def stats(self):
+        return {'hits': self.__n_hits, 'misses': self.__n_misses}
+
+    def __load(self):
+        self.__records = {}
+        cfile = self.cfile
+        if not cfile.exists():
+            return
+        try:
+            with cfile.open('rb') as f:
+                data = pickle.load(f)
+        except (SynamicFSError, OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('version') != FRONT_MATTER_CACHE_VERSION:
+            return
+        self.__records = data.get('records', {})
+
+    def get(self, cpath, make_syd):
+        """Returns the syd of the front matter of the marked file at cpath.
+        make_syd(cpath, text) is called to parse it when the file is new or was changed."""
+        return self.get_many((cpath,), make_syd)[0]
+
+    def get_many(self, cpaths, make_syd, jobs=1):
+        """Returns the syds of the front matters of the marked files at cpaths in the same order. New and changed
+        files are read and parsed by `jobs` forked worker processes when there are enough of them."""
+        if self.__records is None:
+            self.__load()
+        file_index = self.__synamic.path_tree.file_index
+        syd_datas = [None] * len(cpaths)
+        # idx, size, mtime and the old record of the files that must be read
+        to_read = []
+        for idx, cpath in enumerate(cpaths):
+            abs_path = cpath.abs_path
+            self.__used_paths.add(abs_path)
+            size, mtime, _ = file_index.stat(abs_path)
+            record = self.__records.get(abs_path, None)
+            if record is not None and record[0] == size and record[1] == mtime:
+                self.__n_hits += 1
+                syd_datas[idx] = record[3]
+                self.__body_offsets[abs_path] = size, mtime, record[4]
+            else:
+                to_read.append((idx, size, mtime, record))
+
+        if to_read:
+            read_cpaths = tuple(cpaths[idx] for idx, _, _, _ in to_read)
+            known_hashes = tuple(None if record is None else record[2] for _, _, _, record in to_read)
+            if jobs > 1 and can_fork() and len(to_read) >= PARALLEL_LOAD_MIN_FILES:
+                results = read_front_matters_in_parallel(read_cpaths, make_syd, min(jobs, len(to_read)), known_hashes)
+            else:
+                results = (
+                    read_front_matter(cpath, make_syd, known_hash)
+                    for cpath, known_hash in zip(read_cpaths, known_hashes)
+                )
+            for (idx, size, mtime, record), (head_hash, syd_data, body_offset) in zip(to_read, results):
+                if syd_data is None:
+                    # front matter did not change
+                    self.__n_hits += 1
+                    syd_data = record[3]
+                else:
+                    self.__n_misses += 1
+                abs_path = cpaths[idx].abs_path
+                self.__records[abs_path] = (size, mtime, head_hash, syd_data, body_offset)
+                self.__body_offsets[abs_path] = size, mtime, body_offset
+                syd_datas[idx] = syd_data
+            self.__is_dirty = True
+        return [pickle.loads(syd_data) for syd_data in syd_datas]
+
+    def body_offset(self, cpath):
+        """Byte offset of the body of the marked file, None when it is not known or the file changed since its front
+        matter was got"""
+        abs_path = cpath.abs_path
+        known = self.__body_offsets.get(abs_path, None)
+        if known is None:
+            return None
+        size, mtime, _ = self.__synamic.path_tree.file_index.stat(abs_path)
+        if known[0] != size or known[1] != mtime:
+            return None
+        return known[2]
+
+    def save(self):
+        if self.__records is None:
+            return
+        if set(self.__records) != self.__used_paths:
+            self.__records = {
+                abs_path: record for abs_path, record in self.__records.items() if abs_path in self.__used_paths
+            }
+            self.__is_dirty = True
+        if not self.__is_dirty:
+            return
+        cfile = self.cfile
+        cfile.parent_cpath.makedirs(exist_ok=True)
+        data = {
+            'version': FRONT_MATTER_CACHE_VERSION,
+            'records': self.__records,
+        }
+        with cfile.open('wb') as f:
+            pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+        self.__is_dirty = False
+
+    def delete(self):
+        self.__records = None
+        self.__used_paths.clear()
+        self.__body_offsets.clear()
+        self.__is_dirty = False
+        cfile = self.cfile
+        if cfile.exists():
+            cfile.remove()
@@ -15,6 +15,7 @@ class InitManager:
             write_text(
             f'settings.private.syd\n'
             f'{system_settings["dirs.outputs.outputs"]}\n'
+            f'{system_settings["dirs.cache.cache"]}\n'
             f''
         )
 
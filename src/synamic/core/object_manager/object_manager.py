@@ -1,12 +1,16 @@
+import os
 import types
+import heapq
+import itertools
 from collections import defaultdict, OrderedDict
-from synamic.core.services.content.content_splitter import content_splitter
+from synamic.core.services.content.content_splitter import content_splitter, body_reader
 from synamic.core.parsing_systems.model_parser import ModelParser
 from synamic.core.standalones import SydContainer
 from synamic.core.parsing_systems.curlybrace_parser import SydParser
 from synamic.core.standalones.functions.decorators import loaded, not_loaded
 from synamic.core.contracts import CDocType
-from .query import QueryNode, SimpleQueryParser
+from .query import SimpleQueryParser, FieldIndex, ColumnarStore
+from .query import QueryEvaluator, BitsetCandidates, MaskCandidates
 from synamic.core.parsing_systems.getc_parser import parse_getc
 from synamic.core.standalones.functions.sequence_ops import Sequence
 from synamic.exceptions import (
@@ -19,8 +23,11 @@ from synamic.exceptions import (
     SynamicSiteNotFound,
     SynamicUserNotFound
 )
-from synamic import Nil
 from .init_manager import InitManager
+from .dependency_graph import DependencyGraph
+from .front_matter_cache import FrontMatterCache
+from .compiled_syd_cache import CompiledSydCache
+from .parallel_build import build_content, build_in_parallel, normalize_jobs, can_fork
 
 
 class ObjectManager:
@@ -31,6 +38,9 @@ class ObjectManager:
         self.__site_settings = defaultdict(dict)
 
         self.__cache = self.__Cache(self.__synamic)
+        self.__dependency_graph = DependencyGraph()
+        self.__front_matter_cache = FrontMatterCache(synamic)
+        self.__compiled_syd_cache = CompiledSydCache(synamic)
 
         self.__is_loaded = False
 
@@ -46,13 +56,32 @@ class ObjectManager:
     def is_loaded(self):
         return self.__is_loaded
 
+    @property
+    def dependency_graph(self):
+        return self.__dependency_graph
+
+    @property
+    def front_matter_cache(self):
+        return self.__front_matter_cache
+
+    @property
+    def compiled_syd_cache(self):
+        return self.__compiled_syd_cache
+
     @not_loaded
     def load(self):
         self.__is_loaded = True
 
     def __reload_for__(self, site):
-        self.__cache.clear_cache(site)
-        self.__load_for__(site)
+        # merged dir metas are kept, but for the dirs (and the dirs under them) whose .meta.syd changed
+        self.__cache.clear_cache(site, dir_metas=False)
+        site.path_tree.rescan()
+        with site.path_tree.fs.stat_epoch('reload'):
+            for dir_cpath, meta_stamp in self.__cache.get_dir_meta_stamps(site):
+                if self.__dir_meta_stamp(site, dir_cpath) != meta_stamp:
+                    self.invalidate_dir_meta(site, dir_cpath)
+            self.__load_for__(site)
+        self.__front_matter_cache.save()
 
     def __load_for__(self, site):
         self.__cache_markers(site)
@@ -62,6 +91,17 @@ class ObjectManager:
         self.__cache_data(site)
         self.__cache_pre_processed_contents(site)
 
+    def __make_front_matter_syd(self, file_cpath, front_matter):
+        try:
+            return self.make_syd(front_matter)
+        except SynamicSydParseError as e:
+            raise SynamicErrors(
+                f'Synamic Syd parsing error during parsing front matter of file: '
+                f'{file_cpath.relative_path}\n'
+                f'<This error occurred during caching the cfileds of marked contents>',
+                e
+            )
+
     def __cache_marked_cfields(self, site):
         marked_extensions = site.system_settings['configs.marked_extensions']
         if site.synamic.env['backend'] == 'file':  # TODO: fix it.
@@ -72,30 +112,30 @@ class ObjectManager:
                 file_cpaths = content_cdir.list_files()
                 all_cfields = []
 
+                # No need to cache anything about static file.
+                marked_cpaths = tuple(
+                    file_cpath for file_cpath in file_cpaths if file_cpath.extension.lower() in marked_extensions
+                )
+                # front matters are read and parsed in worker processes when load jobs are set, cfields are made here
+                load_jobs = normalize_jobs(site.synamic.env['load_jobs'])
+                fields_syds = self.__front_matter_cache.get_many(
+                    marked_cpaths, self.__make_front_matter_syd, jobs=load_jobs
+                )
+
                 # make the cfields
-                for file_cpath in file_cpaths:
-                    if file_cpath.extension.lower() in marked_extensions:
-                        text = self.get_raw_text_data(site, file_cpath)
-                        front_matter, body = content_splitter(file_cpath, text)
-                        del body
-                        try:
-                            fields_syd = self.make_syd(front_matter)
-                        except SynamicSydParseError as e:
-                            raise SynamicErrors(
-                                f'Synamic Syd parsing error during parsing front matter of file: '
-                                f'{file_cpath.relative_path}\n'
-                                f'<This error occurred during caching the cfileds of marked contents>',
-                                e
-                            )
-                        cfields = content_service.build_cfields(fields_syd, file_cpath)
-                        all_cfields.append(cfields)
-                    else:
-                        # No need to cache anything about static file.
-                        pass
+                for file_cpath, fields_syd in zip(marked_cpaths, fields_syds):
+                    cfields = content_service.build_cfields(fields_syd, file_cpath)
+                    all_cfields.append(cfields)
 
                 # add the cfields to cache
                 for cfields in all_cfields:
                     self.__cache.add_marked_cfields(site, cfields)
+                all_cached_cfields = self.__cache.get_all_marked_cfields(site)
+                content_model = self.get_model(site, 'content')
+                field_index = FieldIndex(all_cached_cfields, content_model)
+                self.__cache.set_field_index(site, field_index)
+                if ColumnarStore.is_available():
+                    self.__cache.set_columnar_store(site, ColumnarStore(all_cached_cfields, field_index, content_model))
 
                 # cache book toc
                 book_tocs = []
@@ -127,6 +167,7 @@ class ObjectManager:
             # self.__marker_by_id_cachemap[site.id][marker_id] = marker
 
     def __cache_pre_processed_contents(self, site):
+        dependency_graph = self.__dependency_graph
         pre_processor_service = site.get_service('pre_processor')
         pre_processors = pre_processor_service.pre_processors
         for pre_processor in pre_processors:
@@ -139,7 +180,11 @@ class ObjectManager:
         # TODO: also, provide some mechanism to add content to sitemap dynamically.
         # TODO: so this is not the place for sitemap.
         sitemap_service = site.get_service('sitemap')
-        sitemap_content = sitemap_service.make_sitemap(self.query_cfields(site, 'type != error :sortby updated_on desc'))
+        with dependency_graph.recording() as sitemap_dependencies:
+            sitemap_content = sitemap_service.make_sitemap(
+                self.query_cfields(site, 'type != error :sortby updated_on desc')
+            )
+        dependency_graph.set_dependencies(dependency_graph.generated_node(sitemap_content.curl), *sitemap_dependencies)
         self.__cache.add_pre_processed_content(site, sitemap_content)
 
     def __cache_menus(self, site):
@@ -315,7 +360,9 @@ class ObjectManager:
         syd = self.__cache.get_syd(site, cpath, default=None)
         if syd is None and cpath.exists():
             try:
-                syd = SydParser(self.get_raw_text_data(site, cpath)).parse()
+                syd = self.__compiled_syd_cache.get(
+                    cpath, lambda text_cpath: self.get_raw_text_data(site, text_cpath), self.make_syd
+                )
             except (SynamicSydParseError, SynamicFSError) as e:
                 raise SynamicErrors(
                     f'Synamic error during parsing syd file: '
@@ -325,6 +372,40 @@ class ObjectManager:
             self.__cache.add_syd(site, cpath, syd)
         return syd
 
+    def get_dir_meta(self, site, dir_cpath):
+        """Returns the metas of the .meta.syd files of the dir and all of its parent dirs merged (the closest one wins)
+        and the file nodes of those .meta.syd files. It is computed once for a dir on top of the one of its parent dir.
+        The returned syd is shared and must not be mutated, merge on top of it with merged_new()."""
+        dir_meta = self.__cache.get_dir_meta(site, dir_cpath)
+        if dir_meta is None:
+            parent_cpath = dir_cpath.parent_cpath
+            if parent_cpath is None:
+                meta_syd, meta_nodes = self.empty_syd(), ()
+            else:
+                meta_syd, meta_nodes = self.get_dir_meta(site, parent_cpath)
+            meta_cfile = dir_cpath.join(site.system_settings['configs.dir_meta_file_name'], is_file=True)
+            if meta_cfile.exists():
+                meta_syd = meta_syd.merged_new(self.get_syd(site, meta_cfile))
+                meta_nodes = (*meta_nodes, self.__dependency_graph.file_node(meta_cfile))
+            dir_meta = meta_syd, meta_nodes
+            self.__cache.add_dir_meta(site, dir_cpath, dir_meta, self.__dir_meta_stamp(site, dir_cpath))
+        return dir_meta
+
+    def invalidate_dir_meta(self, site, dir_cpath):
+        """Forgets the .meta.syd of the dir and the merged metas of the dir and the dirs under it - e.g. after the
+        .meta.syd of the dir changed or was created or removed. Metas of other dirs are kept."""
+        meta_cfile = dir_cpath.join(site.system_settings['configs.dir_meta_file_name'], is_file=True)
+        self.__cache.remove_syd(site, meta_cfile)
+        self.__cache.remove_dir_metas(site, dir_cpath)
+
+    @staticmethod
+    def __dir_meta_stamp(site, dir_cpath):
+        """Size and mtime of the .meta.syd of the dir, None when there is none"""
+        meta_cfile = dir_cpath.join(site.system_settings['configs.dir_meta_file_name'], is_file=True)
+        if not meta_cfile.exists():
+            return None
+        return site.path_tree.fs.stat(meta_cfile.abs_path)[:2]
+
     @staticmethod
     def make_syd(raw_data):
         syd = SydParser(raw_data).parse()
@@ -362,6 +443,52 @@ class ObjectManager:
         else:
             return processed_model
 
+    def get_fragment(self, site, key, render, check_files=False):
+        """Text of a {% cache %} fragment of the site: the one rendered with the key before in this build (or since the
+        last reload) or render()'s. Dependencies recorded while rendering it are recorded again every time it is used,
+        so that everything using the fragment depends on them as if it had rendered it.
+
+        With check_files (templates are checked for changes, i.e. outside of a build) the fragment is rendered again
+        when one of the files it depends on - the templates it used, including the ones included in it - changed,
+        was created or was removed since."""
+        dependency_graph = self.__dependency_graph
+        fragment = self.__cache.get_fragment(site, key)
+        if fragment is not None and check_files and self.__file_stamps(fragment[1]) != fragment[2]:
+            fragment = None
+        if fragment is None:
+            with dependency_graph.recording() as dependencies:
+                text = render()
+            dependencies = tuple(dependencies)
+            fragment = text, dependencies, self.__file_stamps(dependencies)
+            self.__cache.add_fragment(site, key, fragment)
+        else:
+            text, dependencies, _ = fragment
+            dependency_graph.record(*dependencies)
+        return text
+
+    @staticmethod
+    def __file_stamps(dependencies):
+        stamps = []
+        for node in dependencies:
+            if node[0] == DependencyGraph.FILE:
+                try:
+                    st = os.stat(node[1])
+                except OSError:
+                    stamps.append(None)
+                else:
+                    stamps.append((st.st_size, st.st_mtime_ns))
+        return tuple(stamps)
+
+    def clear_fragments(self, site):
+        """Forgets the {% cache %} fragments of the site, they are rendered again when used next"""
+        self.__cache.clear_fragments(site)
+
+    def get_content_body(self, site, content_path):
+        """Body of the marked content, read from the byte offset known from loading its front matter"""
+        body_offset = self.__front_matter_cache.body_offset(content_path)
+        with content_path.open('rb') as f:
+            return body_reader(content_path, f, body_offset=body_offset)
+
     def get_content_parts(self, site, content_path):
         text = self.get_raw_text_data(site, content_path)
         front_matter, body = content_splitter(content_path, text)
@@ -385,8 +512,10 @@ class ObjectManager:
         if content is None:
             pre_content = self.__cache.get_pre_processed_content_by_cpath(site, cpath, default=None)
         else:
+            self.__dependency_graph.record(self.__dependency_graph.fields_node(cpath))
             return content.curl
         if pre_content is None:
+            self.__dependency_graph.record(self.__dependency_graph.file_node(cpath))
             static_content = site.get_service('contents').build_static_content(cpath)
             return static_content.curl
 
@@ -430,6 +559,13 @@ class ObjectManager:
                         break
 
             if c_res is not None:
+                if 'marked_cfields' in c_res:
+                    self.__dependency_graph.record(self.__dependency_graph.fields_node(c_res['marked_cfields'].cpath))
+                elif 'static_content' in c_res:
+                    self.__dependency_graph.record(
+                        self.__dependency_graph.file_node(c_res['static_content'].cfields.cpath)
+                    )
+
                 if url_struct.scheme == 'cfields':
                     result = c_res['cfields']
                 elif url_struct.scheme == 'curl':
@@ -570,6 +706,7 @@ class ObjectManager:
     def get_all_cached_marked_cfields(self, site):
         # TODO: logic for cached content metas
         # - when to use it when not (when not cached)
+        self.__dependency_graph.record(self.__dependency_graph.listing_node(site))
         return self.__cache.get_all_marked_cfields(site)
 
     def get_all_pre_processed_contents(self, site):
@@ -600,82 +737,112 @@ class ObjectManager:
         return self.__cache.get_book_tocs(site)
 
     @staticmethod
-    def __convert_section_value(section, content_model):
+    def __convert_section_value(section, content_model, converted_sections=None):
+        """converted_sections: dict of already converted sections of the site to reuse"""
+        # type is a part of the key as equal values of different types (1, 1.0, True) may convert differently
+        section_key = section, type(section.value)
+        if converted_sections is not None:
+            try:
+                converted_section = converted_sections.get(section_key, None)
+            except TypeError:
+                # unhashable value
+                converted_sections = None
+            else:
+                if converted_section is not None:
+                    return converted_section
         # TODO: for converter that returns single value implement mechanism that will help use in !in for them.
         converted_value = content_model[section.key].converter(section.value)
-        return SimpleQueryParser.QuerySection(key=section.key, comp_op=section.comp_op, value=converted_value)
+        converted_section = SimpleQueryParser.QuerySection(
+            key=section.key, comp_op=section.comp_op, value=converted_value
+        )
+        if converted_sections is not None:
+            converted_sections[section_key] = converted_section
+        return converted_section
 
-    def __query_cfields_left_right(self, section, result_set, content_model):
-        matched_result = set()
-        for cfields in result_set:
+    @staticmethod
+    def __query_cfields_left_right(section, cfields_s, content_model):
+        converter = content_model[section.key].converter
+        matched_result = []
+        for cfields in cfields_s:
             field_value = cfields.get(section.key, None)
-            converter = content_model[section.key].converter
             if field_value is not None:
                 if converter.compare(section.comp_op, field_value, section.value):
-                    matched_result.add(cfields)
+                    matched_result.append(cfields)
             else:
                 if section.comp_op in ('!=', '!in'):
-                    matched_result.add(cfields)
+                    matched_result.append(cfields)
         return matched_result
 
-    def __query_cfields_by_node(self, node, result_set, content_model):
-        if isinstance(node, SimpleQueryParser.QuerySection):
-            # only one section here.
-            left_section = node
-            right_section = None
-            logic_op = None
-        else:
-            assert isinstance(node, QueryNode)
-            logic_op = node.logic_op
-            if isinstance(node.left, QueryNode):
-                return self.__query_cfields_by_node(node.left, result_set, content_model)
-            else:
-                left_section = node.left
-                right_section = None
-
-            if isinstance(node.right, QueryNode):
-                return self.__query_cfields_by_node(node.left, result_set, content_model)
-            else:
-                right_section = node.right
-
-        left_section = self.__convert_section_value(left_section, content_model)
-        left_result = self.__query_cfields_left_right(left_section, result_set, content_model)
-        if right_section is not None:
-            right_section = self.__convert_section_value(right_section, content_model)
-            right_result = self.__query_cfields_left_right(right_section, result_set, content_model)
-        else:
-            right_result = None
-
-        if logic_op == '|':
-            left_result.update(right_result)
-        elif logic_op == '&':
-            left_result.intersection_update(right_result)
-        else:
-            # keep as is
-            pass
-        result_set.clear()
-        result_set.update(left_result)
-        return result_set
-
     def query_cfields(self, site, query_str):
+        """Results are cached by site and query string until the contents of the site change or it is reloaded"""
+        result = self.__cache.get_query_result(site, query_str)
+        if result is None:
+            result = self.__query_cfields(site, query_str)
+            self.__cache.add_query_result(site, query_str, result)
+
+        if self.__dependency_graph.is_recording:
+            dependency_graph = self.__dependency_graph
+            dependency_graph.record(
+                dependency_graph.query_node(site, query_str),
+                *(dependency_graph.fields_node(cfields.cpath) for cfields in result)
+            )
+        return result
+
+    def __query_cfields(self, site, query_str):
         content_model = site.object_manager.get_model('content')
-        node, sort = SimpleQueryParser(query_str).parse()
-        all_cfields_s = self.__cache.get_all_marked_cfields(site)
-        result = set(all_cfields_s)
+        node, sort, limit, offset = SimpleQueryParser.parse_cached(query_str)
+        offset = 0 if offset is None else offset
+        field_index = self.__cache.get_field_index(site)
+        if field_index is None:
+            field_index = FieldIndex(self.__cache.get_all_marked_cfields(site), content_model)
+            self.__cache.set_field_index(site, field_index)
+        columnar_store = self.__cache.get_columnar_store(site)
+        if columnar_store is None and ColumnarStore.is_available():
+            columnar_store = ColumnarStore(self.__cache.get_all_marked_cfields(site), field_index, content_model)
+            self.__cache.set_columnar_store(site, columnar_store)
+
+        if columnar_store is not None:
+            candidates = MaskCandidates(columnar_store)
+        else:
+            candidates = BitsetCandidates(field_index)
         if node is not None:
-            self.__query_cfields_by_node(node, result, content_model)
-        if sort is not None:
-            def sorting_key_func(f):
-                value = f[sort.by_key]
-                if value is None:
-                    value = Nil
-                return value
-            result = sorted(
-                result,
-                key=sorting_key_func,
-                reverse=True if sort.order == 'desc' else False
+            converted_sections = self.__cache.get_converted_query_sections(site)
+            evaluator = QueryEvaluator(
+                candidates,
+                lambda section: self.__convert_section_value(section, content_model, converted_sections),
+                lambda section, cfields_s: self.__query_cfields_left_right(section, cfields_s, content_model)
             )
+            matched = evaluator.evaluate(node)
+        else:
+            matched = candidates.full()
 
+        result = None
+        is_sorted = False
+        if sort is not None and columnar_store is not None:
+            result = columnar_store.sorted_cfields(matched, sort.by_key, reverse=sort.order == 'desc')
+            is_sorted = result is not None
+        if result is None:
+            # in the order of the numbering of the cfields
+            result = candidates.cfields_of(matched)
+
+        if sort is not None and not is_sorted:
+            sorting_key_func = field_index.total_sort_keys(sort.by_key).__getitem__
+            if limit is not None:
+                # top k: only offset + limit cfields are kept in order, same as slicing the sorted result
+                if sort.order == 'desc':
+                    result = heapq.nlargest(offset + limit, result, key=sorting_key_func)
+                else:
+                    result = heapq.nsmallest(offset + limit, result, key=sorting_key_func)
+            else:
+                result = sorted(
+                    result,
+                    key=sorting_key_func,
+                    reverse=True if sort.order == 'desc' else False
+                )
+        if limit is not None:
+            result = itertools.islice(result, offset, offset + limit)
+        elif offset:
+            result = itertools.islice(result, offset, None)
         return tuple(result)
 
     def query_contents(self, site, query_str):
@@ -767,6 +934,8 @@ class ObjectManager:
             self.__marker_by_id_cachemap = defaultdict(dict)
             # syd cachemap
             self.__cpath_to_syd_cachemap = defaultdict(dict)
+            # dir cpath -> (metas merged down to the dir, file nodes of the meta files merged)
+            self.__dir_metas_cachemap = defaultdict(dict)
 
             # menus
             self.__menus_cachemap = defaultdict(dict)
@@ -780,6 +949,10 @@ class ObjectManager:
             # data
             self.__data = defaultdict(dict)
 
+            # fragments of {% cache %}: key -> (rendered text, dependencies recorded while rendering, stamps of the files
+            # among them)
+            self.__fragments_cachemap = defaultdict(dict)
+
             # >>>>>>>>
             # CONTENTS
             self.__pre_processed_cachemap = defaultdict(dict)  # curl to content
@@ -790,6 +963,10 @@ class ObjectManager:
             self.__cpath_to_pre_processed_contents = defaultdict(dict)
             self.__cpath_to_marked_content = defaultdict(dict)
             self.__cpath_to_marked_cfields = defaultdict(dict)
+            self.__field_indexes = {}
+            self.__columnar_stores = {}
+            self.__query_results_cachemap = defaultdict(dict)  # query string to result
+            self.__converted_query_sections_cachemap = defaultdict(dict)  # parsed section to converted one
             # <<<<<<<<
 
         def add_pre_processed_content(self, site, pre_processed_content, cpath=None):
@@ -824,6 +1001,10 @@ class ObjectManager:
         def add_marked_cfields(self, site, cfields):
             self.__marked_cfields_cachemap[site.id][cfields.curl] = cfields
             self.__cpath_to_marked_cfields[site.id][cfields.cpath] = cfields
+            # contents changed: the field index and the columnar store are stale till they are set again
+            self.__field_indexes.pop(site.id, None)
+            self.__columnar_stores.pop(site.id, None)
+            self.__query_results_cachemap[site.id].clear()
 
         def get_marked_cfields_by_curl(self, site, curl, default=None):
             return self.__marked_cfields_cachemap[site.id].get(curl, default)
@@ -841,6 +1022,29 @@ class ObjectManager:
         def get_all_marked_cfields(self, site):
             return tuple(self.__marked_cfields_cachemap[site.id].values())
 
+        def set_field_index(self, site, field_index):
+            self.__field_indexes[site.id] = field_index
+            self.__query_results_cachemap[site.id].clear()
+
+        def get_field_index(self, site, default=None):
+            return self.__field_indexes.get(site.id, default)
+
+        def set_columnar_store(self, site, columnar_store):
+            self.__columnar_stores[site.id] = columnar_store
+            self.__query_results_cachemap[site.id].clear()
+
+        def get_columnar_store(self, site, default=None):
+            return self.__columnar_stores.get(site.id, default)
+
+        def add_query_result(self, site, query_str, result):
+            self.__query_results_cachemap[site.id][query_str] = result
+
+        def get_query_result(self, site, query_str, default=None):
+            return self.__query_results_cachemap[site.id].get(query_str, default)
+
+        def get_converted_query_sections(self, site):
+            return self.__converted_query_sections_cachemap[site.id]
+
         def add_marker(self, site, marker_id, marker):
             self.__marker_by_id_cachemap[site.id][marker_id] = marker
 
@@ -856,6 +1060,27 @@ class ObjectManager:
         def get_syd(self, site, cpath, default=None):
             return self.__cpath_to_syd_cachemap[site.id].get(cpath, default)
 
+        def remove_syd(self, site, cpath):
+            self.__cpath_to_syd_cachemap[site.id].pop(cpath, None)
+
+        def add_dir_meta(self, site, dir_cpath, dir_meta, meta_stamp):
+            self.__dir_metas_cachemap[site.id][dir_cpath] = dir_meta, meta_stamp
+
+        def get_dir_meta(self, site, dir_cpath, default=None):
+            dir_meta_n_stamp = self.__dir_metas_cachemap[site.id].get(dir_cpath, None)
+            return default if dir_meta_n_stamp is None else dir_meta_n_stamp[0]
+
+        def get_dir_meta_stamps(self, site):
+            """Tuple of (dir cpath, stamp of its .meta.syd when the merged metas of the dir were made)"""
+            return tuple((dir_cpath, stamp) for dir_cpath, (_, stamp) in self.__dir_metas_cachemap[site.id].items())
+
+        def remove_dir_metas(self, site, dir_cpath):
+            """Removes the dir metas of the dir and of all the dirs under it"""
+            dir_metas = self.__dir_metas_cachemap[site.id]
+            comps = dir_cpath.path_comps
+            for cached_cpath in [cpath for cpath in dir_metas if cpath.path_comps[:len(comps)] == comps]:
+                del dir_metas[cached_cpath]
+
         def add_menu(self, site, menu_name, menu):
             self.__menus_cachemap[site.id][menu_name] = menu
 
@@ -890,6 +1115,15 @@ class ObjectManager:
         def get_data(self, site, data_name, default=None):
             return self.__data[site.id].get(data_name, default)
 
+        def add_fragment(self, site, key, fragment):
+            self.__fragments_cachemap[site.id][key] = fragment
+
+        def get_fragment(self, site, key, default=None):
+            return self.__fragments_cachemap[site.id].get(key, default)
+
+        def clear_fragments(self, site):
+            self.__fragments_cachemap[site.id].clear()
+
         def add_book_toc(self, site, book_toc):
             book_content_cpath = book_toc.book_cpath
             self.__book_tocs_cachemap[site.id][book_content_cpath] = book_toc
@@ -904,13 +1138,19 @@ class ObjectManager:
             self.__cpath_to_pre_processed_contents[site.id].clear()
             self.__cpath_to_marked_content[site.id].clear()
             self.__cpath_to_marked_cfields[site.id].clear()
+            self.__field_indexes.pop(site.id, None)
+            self.__columnar_stores.pop(site.id, None)
+            self.__query_results_cachemap[site.id].clear()
+            self.__converted_query_sections_cachemap[site.id].clear()
             self.__book_tocs_cachemap[site.id].clear()
 
         def clear_marker_cache(self, site):
             self.__marker_by_id_cachemap[site.id].clear()
 
-        def clear_syd_cache(self, site):
+        def clear_syd_cache(self, site, dir_metas=True):
             self.__cpath_to_syd_cachemap[site.id].clear()
+            if dir_metas:
+                self.__dir_metas_cachemap[site.id].clear()
 
         def clear_menus_cache(self, site):
             self.__menus_cachemap[site.id].clear()
@@ -924,35 +1164,48 @@ class ObjectManager:
         def clear_data(self, site):
             self.__data[site.id].clear()
 
-        def clear_cache(self, site):
-            """Clear all"""
+        def clear_cache(self, site, dir_metas=True):
+            """Clear all, but the merged dir metas when dir_metas is False"""
             self.clear_content_cache(site)
             self.clear_marker_cache(site)
-            self.clear_syd_cache(site)
+            self.clear_syd_cache(site, dir_metas=dir_metas)
             self.clear_menus_cache(site)
             self.clear_model(site)
             self.clear_users(site)
             self.clear_data(site)
+            self.clear_fragments(site)
 
-    def build(self, site):
+    def build(self, site, jobs=None, manifest=None):
+        """When a build manifest is passed only the contents whose inputs changed since the last build are written and
+        the manifest is updated with the written ones.
+        Dependencies of every written output are recorded in the dependency graph."""
         output_dir = self.__synamic.system_settings['dirs.outputs.outputs']
         output_cdir = self.__synamic.path_tree.create_dir_cpath(output_dir)
+        dependency_graph = self.__dependency_graph
 
         c_iter = CIter(site)
-        for content in c_iter:
-            curl = content.curl
-            print(f'Writing {curl.url}')
-            with content.get_stream() as fr:
-                c_out_dir, fn = curl.to_dirfn_pair_w_site
-                c_out_cdir = output_cdir.join(c_out_dir, is_file=False)
-                if not c_out_cdir.exists():
-                    c_out_cdir.makedirs()
-                c_out_cfile = c_out_cdir.join(fn, is_file=True)
-                with c_out_cfile.open('wb') as fw:
-                    data = fr.read(1024)
-                    while data:
-                        fw.write(data)
-                        data = fr.read(1024)
+        if manifest is not None:
+            build_plan = {idx: key for idx, _, key in manifest.plan_site(site, c_iter)}
+            indexes = sorted(build_plan)
+        else:
+            build_plan = None
+            indexes = range(len(c_iter.clist))
+
+        def on_written(idx, out_path, output_hash, dependencies):
+            dependency_graph.set_dependencies(dependency_graph.output_node(out_path), *dependencies)
+            if manifest is not None:
+                manifest.record_output(site, out_path, build_plan[idx], output_hash)
+
+        jobs = normalize_jobs(jobs)
+        if jobs > 1:
+            if can_fork():
+                return build_in_parallel(site, c_iter, output_cdir, jobs, indexes=indexes, on_written=on_written)
+            print('Parallel build needs fork start method that is not available on this platform, building serially')
+
+        for idx in indexes:
+            content = c_iter.get_content(c_iter.clist[idx])
+            print(f'Writing {content.curl.url}')
+            on_written(idx, *build_content(content, output_cdir, dependency_graph))
         return True
 
     def init_site(self, site=None):
@@ -966,6 +1219,14 @@ class ObjectManager:
 class CIter:
     def __init__(self, site):
         self.__site = site
+        self.__clist = None
+
+    @property
+    def clist(self):
+        """List of cfields, contents, cpaths, users, ... that will be mapped to contents with get_content()"""
+        if self.__clist is None:
+            self.__clist = self.__make_clist()
+        return self.__clist
 
     def __make_clist(self):
         content_service = self.__site.get_service('contents')
@@ -1003,62 +1264,73 @@ class CIter:
         clist.extend(pagination_pages)
         return clist
 
+    def get_content(self, elem):
+        content_service = self.__site.get_service('contents')
+        markers_service = self.__site.get_service('markers')
+        users_service = self.__site.get_service('users')
+        path_tree = self.__site.path_tree
+
+        # marked content
+        if content_service.is_type_cfields(elem):
+            cfields = elem
+            content = self.__site.object_manager.get_marked_content(cfields.cpath)
+
+        elif content_service.is_type_generated_content(elem):
+            content = elem
+
+        # static content
+        elif path_tree.is_type_cpath(elem):
+            cpath = elem
+            content = content_service.build_static_content(cpath)
+
+        # user
+        elif users_service.is_type_user(elem):
+            user = elem
+            content = user.content
+
+        # mark
+        elif markers_service.is_type_mark(elem):
+            mark = elem
+            content = mark.content
+
+        # pagination pages
+        elif content_service.is_type_pagination_page(elem):
+            pagination_page = elem
+            content = pagination_page.host_content
+
+        else:
+            raise Exception(f'Something impossible happened or you introduced a bug.')
+
+        return content
+
+    def get_curl(self, elem):
+        """Curl of the content get_content() maps elem to, without building the content"""
+        content_service = self.__site.get_service('contents')
+        path_tree = self.__site.path_tree
+
+        if path_tree.is_type_cpath(elem):
+            return self.__site.object_manager.static_content_cpath_to_url(elem, CDocType.BINARY_DOCUMENT)
+        elif content_service.is_type_pagination_page(elem):
+            return elem.host_content.curl
+        else:
+            # cfields, generated contents, users and marks
+            return elem.curl
+
     def __iter__(self):
-        return self.__CListIterator(self.__make_clist(), self.__site)
+        return self.__CListIterator(self.clist, self)
 
     class __CListIterator:
-        def __init__(self, clist, site):
+        def __init__(self, clist, c_iter):
             self.__clist = clist
             self.__idx = 0
-            self.__site = site
-
-            self.__content_service = self.__site.get_service('contents')
-            self.__markers_service = self.__site.get_service('markers')
-            self.__users_service = self.__site.get_service('users')
-            self.__path_tree = self.__site.path_tree
+            self.__c_iter = c_iter
 
         def __next__(self):
             if self.__idx >= len(self.__clist):
                 del self.__clist
-                del self.__site
-                del self.__content_service
-                del self.__markers_service
-                del self.__users_service
-                del self.__path_tree
+                del self.__c_iter
                 raise StopIteration
 
             elem = self.__clist[self.__idx]
             self.__idx += 1
-
-            # marked content
-            if self.__content_service.is_type_cfields(elem):
-                cfields = elem
-                content = self.__site.object_manager.get_marked_content(cfields.cpath)
-
-            elif self.__content_service.is_type_generated_content(elem):
-                content = elem
-
-            # static content
-            elif self.__path_tree.is_type_cpath(elem):
-                cpath = elem
-                content = self.__content_service.build_static_content(cpath)
-
-            # user
-            elif self.__users_service.is_type_user(elem):
-                user = elem
-                content = user.content
-
-            # mark
-            elif self.__markers_service.is_type_mark(elem):
-                mark = elem
-                content = mark.content
-
-            # pagination pages
-            elif self.__content_service.is_type_pagination_page(elem):
-                pagination_page = elem
-                content = pagination_page.host_content
-
-            else:
-                raise Exception(f'Something impossible happened or you introduced a bug.')
-
-            return content
+            return self.__c_iter.get_content(elem)
@@ -0,0 +1,115 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import os
+import hashlib
+import multiprocessing
+import traceback
+from synamic.exceptions import SynamicError, SynamicErrors, SynamicBuildWorkerError, SynamicFSError
+from .build_manifest import output_path_of
+
+
+# State of the build in progress. It is set in the parent right before the pool is created so that forked workers
+# inherit the loaded site (contents, templates, caches) instead of pickling it.
+_build_state = {}
+
+
+def write_content(content, output_cdir):
+    """Writes the content to its output file and returns the sha1 hex digest of what was written. Rendered contents
+    are written while they are being rendered."""
+    curl = content.curl
+    output_hash = hashlib.sha1()
+    c_out_dir, fn = curl.to_dirfn_pair_w_site
+    c_out_cdir = output_cdir.join(c_out_dir, is_file=False)
+    if not c_out_cdir.exists():
+        # other workers may create the same directory in the mean time.
+        c_out_cdir.makedirs(exist_ok=True)
+    c_out_cfile = c_out_cdir.join(fn, is_file=True)
+    try:
+        with c_out_cfile.open('wb') as fw:
+            for data in content.iter_chunks():
+                fw.write(data)
+                output_hash.update(data)
+    except BaseException:
+        # rendering failed half way, a half written output must not be taken for a built one.
+        try:
+            c_out_cfile.remove()
+        except SynamicFSError:
+            pass
+        raise
+    return output_hash.hexdigest()
+
+
+def build_content(content, output_cdir, dependency_graph):
+    """Writes the content and returns (output path, output hash, dependencies recorded during rendering)"""
+    with dependency_graph.recording() as dependencies:
+        output_hash = write_content(content, output_cdir)
+    return output_path_of(content.curl), output_hash, tuple(dependencies)
+
+
+def _build_element(idx):
+    """Runs inside a worker: renders and writes one element of the content list"""
+    c_iter = _build_state['c_iter']
+    output_cdir = _build_state['output_cdir']
+    dependency_graph = _build_state['dependency_graph']
+    url = None
+    try:
+        content = c_iter.get_content(c_iter.clist[idx])
+        url = content.curl.url
+        result = build_content(content, output_cdir, dependency_graph)
+    except SynamicError as e:
+        return idx, url, None, f'{e.__class__.__name__}:\n{e.message}'
+    except Exception:
+        return idx, url, None, traceback.format_exc()
+    return idx, url, result, None
+
+
+def can_fork():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def normalize_jobs(jobs):
+    """None or 1 means serial build, 0 means one job per cpu"""
+    if jobs is None:
+        return 1
+    jobs = int(jobs)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+
+def build_in_parallel(site, c_iter, output_cdir, jobs, indexes=None, on_written=None):
+    """Shares out the content list of c_iter (or the elements at `indexes` of it) among `jobs` forked worker
+    processes. Results are consumed in the order of the content list, so the log is the same as the serial build.
+    on_written(idx, output_path, output_hash, dependencies) is called in the parent for every written content."""
+    if indexes is None:
+        indexes = range(len(c_iter.clist))
+    chunk_size = max(1, len(indexes) // (jobs * 8))
+
+    _build_state['c_iter'] = c_iter
+    _build_state['output_cdir'] = output_cdir
+    _build_state['dependency_graph'] = site.object_manager.dependency_graph
+    pool = multiprocessing.get_context('fork').Pool(processes=jobs)
+    try:
+        for idx, url, result, error_text in pool.imap(_build_element, indexes, chunk_size):
+            if error_text is not None:
+                raise SynamicErrors(
+                    f'Error building content {url if url is not None else "#" + str(idx)} of site {site.id} in a '
+                    f'build worker:',
+                    SynamicBuildWorkerError(error_text)
+                )
+            print(f'Writing {url}')
+            if on_written is not None:
+                on_written(idx, *result)
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        _build_state.clear()
+    return True
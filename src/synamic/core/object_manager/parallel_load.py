@@ -0,0 +1,73 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import pickle
+import hashlib
+import multiprocessing
+import traceback
+from synamic.core.services.content.content_splitter import front_matter_reader
+from synamic.exceptions import SynamicError, SynamicErrors, SynamicLoadWorkerError
+
+
+# Below this many files the pool costs more than it saves.
+PARALLEL_LOAD_MIN_FILES = 64
+
+# State of the parsing in progress. It is set in the parent right before the pool is created so that forked workers
+# inherit the cpaths and the parser instead of pickling them.
+_load_state = {}
+
+
+def read_front_matter(cpath, make_syd, known_hash=None):
+    """Reads the file till the end of its front matter and parses the front matter with make_syd(cpath, front_matter).
+    Returns (hash of the front matter part, pickled syd, byte offset of the body) - pickled syd is None when the hash
+    is known_hash."""
+    with cpath.open('rb') as f:
+        front_matter, head = front_matter_reader(cpath, f)
+    head_hash = hashlib.sha1(head).hexdigest()
+    if head_hash == known_hash:
+        return head_hash, None, len(head)
+    syd = make_syd(cpath, front_matter)
+    return head_hash, pickle.dumps(syd, pickle.HIGHEST_PROTOCOL), len(head)
+
+
+def _read_front_matter_of(idx):
+    """Runs inside a worker: reads and parses the front matter of one file"""
+    cpath = _load_state['cpaths'][idx]
+    known_hash = _load_state['known_hashes'][idx]
+    try:
+        result = read_front_matter(cpath, _load_state['make_syd'], known_hash)
+    except SynamicError as e:
+        return idx, None, f'{e.__class__.__name__}:\n{e.message}'
+    except Exception:
+        return idx, None, traceback.format_exc()
+    return idx, result, None
+
+
+def read_front_matters_in_parallel(cpaths, make_syd, jobs, known_hashes):
+    """Shares out reading and parsing of the front matters of the files at cpaths among `jobs` forked worker
+    processes. Yields (hash, pickled syd, body offset) in the order of cpaths, as read_front_matter() does."""
+    chunk_size = max(1, len(cpaths) // (jobs * 8))
+
+    _load_state['cpaths'] = cpaths
+    _load_state['make_syd'] = make_syd
+    _load_state['known_hashes'] = known_hashes
+    pool = multiprocessing.get_context('fork').Pool(processes=jobs)
+    try:
+        for idx, result, error_text in pool.imap(_read_front_matter_of, range(len(cpaths)), chunk_size):
+            if error_text is not None:
+                raise SynamicErrors(
+                    f'Error reading front matter of file {cpaths[idx].relative_path} in a load worker:',
+                    SynamicLoadWorkerError(error_text)
+                )
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        _load_state.clear()
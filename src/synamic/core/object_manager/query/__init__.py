@@ -1,3 +1,6 @@
 from .parser import SimpleQueryParser
 from .parser import QueryNode
 from .parser import generate_error_message
+from .field_index import FieldIndex
+from .columnar_store import ColumnarStore
+from .evaluator import QueryEvaluator, BitsetCandidates, MaskCandidates
@@ -0,0 +1,189 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import bisect
+from synamic import Nil
+
+try:
+    import numpy
+except ImportError:
+    # numpy is optional (pip install synamic[columnar]), without it queries run on the field index and sets.
+    numpy = None
+
+
+class _OrderedColumn:
+    """Rank of the value of every row among the distinct values of the field, -1 for rows without a value"""
+    def __init__(self, values):
+        present = [value for value in values if value is not Nil]
+        try:
+            self.uniques = sorted(set(present))
+        except TypeError:
+            # unhashable values
+            self.uniques = []
+            for value in sorted(present):
+                if not self.uniques or self.uniques[-1] != value:
+                    self.uniques.append(value)
+        ranks = numpy.full(len(values), -1, dtype=numpy.int64)
+        for row, value in enumerate(values):
+            if value is not Nil:
+                ranks[row] = bisect.bisect_left(self.uniques, value)
+        self.ranks = ranks
+
+
+class _CodesColumn:
+    """Dictionary encoded values of a single value field, -1 for rows without a value"""
+    def __init__(self, values):
+        self.codes_by_value = {}
+        codes = numpy.full(len(values), -1, dtype=numpy.int64)
+        for row, value in enumerate(values):
+            if value is not Nil:
+                codes[row] = self.codes_by_value.setdefault(value, len(self.codes_by_value))
+        self.codes = codes
+
+
+class _ListColumn:
+    """Rows of every item of a list field"""
+    def __init__(self, values):
+        rows_by_item = {}
+        present = numpy.zeros(len(values), dtype=bool)
+        for row, value in enumerate(values):
+            if value is Nil:
+                continue
+            if not isinstance(value, (list, tuple)):
+                raise TypeError
+            present[row] = True
+            for item in value:
+                rows_by_item.setdefault(item, []).append(row)
+        self.rows_by_item = {item: numpy.array(rows, dtype=numpy.int64) for item, rows in rows_by_item.items()}
+        self.present = present
+
+
+class ColumnarStore:
+    """Columns of the fields of the marked cfields of a site for vectorised filtering and sorting with numpy.
+
+    Cfields are numbered in the order they are given and a set of cfields is a boolean mask over that numbering.
+    Columns are made from the sort key columns of the field index when a field is first used: ranks of ordered values
+    for >, >=, <, <= and sorting, dictionary encoded codes for == and !=, and rows of items for contains and
+    !contains. Methods return None when something cannot be answered with the columns (the caller falls back then).
+    """
+    def __init__(self, cfields_s, field_index, content_model):
+        self.__cfields = tuple(cfields_s)
+        self.__rows = {cfields: row for row, cfields in enumerate(self.__cfields)}
+        self.__field_index = field_index
+        self.__content_model = content_model
+        self.__columns = {}
+
+    @staticmethod
+    def is_available():
+        return numpy is not None
+
+    @property
+    def size(self):
+        return len(self.__cfields)
+
+    # masks
+    def all_mask(self):
+        return numpy.ones(len(self.__cfields), dtype=bool)
+
+    def mask_of(self, cfields_s):
+        mask = numpy.zeros(len(self.__cfields), dtype=bool)
+        rows = self.__rows
+        mask[[rows[cfields] for cfields in cfields_s]] = True
+        return mask
+
+    def cfields_of(self, mask):
+        cfields = self.__cfields
+        return tuple(cfields[row] for row in numpy.flatnonzero(mask))
+
+    # columns
+    def __get_column(self, column_class, key):
+        column_key = column_class, key
+        column = self.__columns.get(column_key, False)
+        if column is False:
+            sort_keys = self.__field_index.sort_keys(key)
+            values = [sort_keys[cfields] for cfields in self.__cfields]
+            try:
+                column = column_class(values)
+            except TypeError:
+                column = None
+            self.__columns[column_key] = column
+        return column
+
+    def section_mask(self, section):
+        """Mask of the cfields matching the query section whose value is already converted"""
+        key, op, value = section.key, section.comp_op, section.value
+        model_field = self.__content_model.get(key, None)
+        if model_field is None or not model_field.converter.supports_compare_op(op):
+            return None
+
+        if op in ('==', '!='):
+            if isinstance(value, (list, tuple)):
+                return None
+            column = self.__get_column(_CodesColumn, key)
+            if column is None:
+                return None
+            try:
+                code = column.codes_by_value.get(value, -2)
+            except TypeError:
+                return None
+            if op == '==':
+                return column.codes == code
+            return column.codes != code
+
+        elif op in ('contains', '!contains'):
+            if not isinstance(value, (list, tuple)) or len(value) == 0:
+                return None
+            column = self.__get_column(_ListColumn, key)
+            if column is None:
+                return None
+            mask = numpy.zeros(len(self.__cfields), dtype=bool)
+            try:
+                rows = column.rows_by_item.get(value[0], None)
+            except TypeError:
+                return None
+            if rows is not None:
+                mask[rows] = True
+            if op == 'contains':
+                return mask
+            return column.present & ~mask
+
+        elif op in ('>', '>=', '<', '<='):
+            if isinstance(value, (list, tuple)):
+                return None
+            column = self.__get_column(_OrderedColumn, key)
+            if column is None:
+                return None
+            ranks = column.ranks
+            try:
+                if op == '>':
+                    return ranks >= bisect.bisect_right(column.uniques, value)
+                elif op == '>=':
+                    return ranks >= bisect.bisect_left(column.uniques, value)
+                elif op == '<':
+                    return (ranks >= 0) & (ranks < bisect.bisect_left(column.uniques, value))
+                else:
+                    return (ranks >= 0) & (ranks < bisect.bisect_right(column.uniques, value))
+            except TypeError:
+                return None
+        return None
+
+    def sorted_cfields(self, mask, key, reverse=False):
+        """Cfields of the mask sorted by the field with a stable argsort. None when some of them have no value for the
+        field (Nil does not order with anything) or the values cannot be ordered."""
+        column = self.__get_column(_OrderedColumn, key)
+        if column is None:
+            return None
+        rows = numpy.flatnonzero(mask)
+        ranks = column.ranks[rows]
+        if (ranks < 0).any():
+            return None
+        if reverse:
+            ranks = -ranks
+        cfields = self.__cfields
+        return tuple(cfields[row] for row in rows[numpy.argsort(ranks, kind='stable')])
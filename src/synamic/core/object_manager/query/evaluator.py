@@ -0,0 +1,183 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+from .parser import SimpleQueryParser, QueryNode
+
+
+class BitsetCandidates:
+    """Sets of cfields as bitsets (ints) over the numbering of the field index"""
+    def __init__(self, field_index):
+        self.__field_index = field_index
+
+    def full(self):
+        return self.__field_index.all_bits
+
+    @staticmethod
+    def empty():
+        return 0
+
+    @staticmethod
+    def and_(a, b):
+        return a & b
+
+    @staticmethod
+    def or_(a, b):
+        return a | b
+
+    @staticmethod
+    def and_not(a, b):
+        return a & ~b
+
+    @staticmethod
+    def is_empty(a):
+        return a == 0
+
+    @staticmethod
+    def count(a):
+        return bin(a).count('1')
+
+    def lookup(self, section):
+        return self.__field_index.lookup_bits(section)
+
+    def cfields_of(self, a):
+        return self.__field_index.cfields_of(a)
+
+    def of_cfields(self, cfields_s):
+        return self.__field_index.bits_of(cfields_s)
+
+
+class MaskCandidates:
+    """Sets of cfields as boolean masks over the numbering of the columnar store"""
+    def __init__(self, columnar_store):
+        self.__columnar_store = columnar_store
+
+    def full(self):
+        return self.__columnar_store.all_mask()
+
+    def empty(self):
+        return self.__columnar_store.mask_of(())
+
+    @staticmethod
+    def and_(a, b):
+        return a & b
+
+    @staticmethod
+    def or_(a, b):
+        return a | b
+
+    @staticmethod
+    def and_not(a, b):
+        return a & ~b
+
+    @staticmethod
+    def is_empty(a):
+        return not a.any()
+
+    @staticmethod
+    def count(a):
+        return int(a.sum())
+
+    def lookup(self, section):
+        return self.__columnar_store.section_mask(section)
+
+    def cfields_of(self, a):
+        return self.__columnar_store.cfields_of(a)
+
+    def of_cfields(self, cfields_s):
+        return self.__columnar_store.mask_of(cfields_s)
+
+
+class QueryEvaluator:
+    """Evaluates the & and | tree of a query on candidate sets of cfields.
+
+    candidates: BitsetCandidates or MaskCandidates.
+    convert_section: converts the value of a query section with the converter of its field.
+    scan_section: (converted section, cfields) -> the matching cfields, for sections that the indexes cannot answer.
+
+    Chains of the same logical operator are evaluated together. For & the indexed sections are intersected first,
+    the most selective one first, and the rest is evaluated only on what is left - stopping as soon as nothing is left.
+    For | everything after the indexed sections is evaluated only on the candidates that have not matched yet.
+    """
+    def __init__(self, candidates, convert_section, scan_section):
+        self.__candidates = candidates
+        self.__convert_section = convert_section
+        self.__scan_section = scan_section
+
+    def evaluate(self, node, candidates=None):
+        if candidates is None:
+            candidates = self.__candidates.full()
+        return self.__evaluate(node, candidates)
+
+    @staticmethod
+    def __operands(node, logic_op, operands):
+        if isinstance(node, QueryNode) and node.logic_op == logic_op:
+            QueryEvaluator.__operands(node.left, logic_op, operands)
+            QueryEvaluator.__operands(node.right, logic_op, operands)
+        else:
+            operands.append(node)
+        return operands
+
+    def __split_operands(self, node):
+        """Returns the found sets of indexed sections and the other operands (converted sections and nodes)"""
+        indexed = []
+        others = []
+        for operand in self.__operands(node, node.logic_op, []):
+            if isinstance(operand, SimpleQueryParser.QuerySection):
+                operand = self.__convert_section(operand)
+                found = self.__candidates.lookup(operand)
+                if found is not None:
+                    indexed.append(found)
+                    continue
+            others.append(operand)
+        # sections are cheaper to scan than sub queries are to evaluate
+        others.sort(key=lambda operand: isinstance(operand, QueryNode))
+        return indexed, others
+
+    def __evaluate_operand(self, operand, candidates):
+        if isinstance(operand, QueryNode):
+            return self.__evaluate(operand, candidates)
+        c = self.__candidates
+        return c.of_cfields(self.__scan_section(operand, c.cfields_of(candidates)))
+
+    def __evaluate(self, node, candidates):
+        c = self.__candidates
+        if isinstance(node, SimpleQueryParser.QuerySection):
+            section = self.__convert_section(node)
+            found = c.lookup(section)
+            if found is not None:
+                return c.and_(candidates, found)
+            return self.__evaluate_operand(section, candidates)
+
+        assert isinstance(node, QueryNode)
+        indexed, others = self.__split_operands(node)
+        if node.logic_op == '&':
+            result = candidates
+            for found in sorted(indexed, key=c.count):
+                if c.is_empty(result):
+                    return result
+                result = c.and_(result, found)
+            for operand in others:
+                if c.is_empty(result):
+                    return result
+                result = self.__evaluate_operand(operand, result)
+            return result
+        else:
+            assert node.logic_op == '|'
+            result = c.empty()
+            for found in indexed:
+                result = c.or_(result, found)
+            result = c.and_(result, candidates)
+            remaining = c.and_not(candidates, result)
+            for operand in others:
+                if c.is_empty(remaining):
+                    break
+                matched = self.__evaluate_operand(operand, remaining)
+                result = c.or_(result, matched)
+                remaining = c.and_not(remaining, matched)
+            return result
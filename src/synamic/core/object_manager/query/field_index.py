@@ -0,0 +1,201 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+import bisect
+from collections import defaultdict
+from synamic import Nil
+
+
+# positions of the set bits of every byte value
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256))
+
+
+class _FieldValues:
+    """Indexes of one field over all the cfields of a site, sets of cfields are bitsets over their rows"""
+    def __init__(self, key, cfields_s, converter):
+        self.none_bits = 0
+        # value -> cfields with the value: for single value fields supporting ==
+        self.equals = None
+        # item -> cfields whose value contains the item: for list fields supporting contains
+        self.contains = None
+        # values in ascending order and the rows at the same position: for fields supporting > and <
+        self.sorted_values = None
+        self.sorted_rows = None
+
+        values = []
+        for row, cfields in enumerate(cfields_s):
+            value = cfields.get(key, None)
+            if value is None:
+                self.none_bits |= 1 << row
+            else:
+                values.append((value, row))
+
+        if converter.supports_compare_op('=='):
+            try:
+                equals = defaultdict(int)
+                for value, row in values:
+                    equals[value] |= 1 << row
+            except TypeError:
+                # unhashable values
+                pass
+            else:
+                self.equals = equals
+
+        if converter.supports_compare_op('contains'):
+            contains = defaultdict(int)
+            try:
+                for value, row in values:
+                    if not isinstance(value, (list, tuple)):
+                        raise TypeError
+                    for item in value:
+                        contains[item] |= 1 << row
+            except TypeError:
+                pass
+            else:
+                self.contains = contains
+
+        if converter.supports_compare_op('>'):
+            try:
+                values = sorted(values, key=lambda value_row: value_row[0])
+            except TypeError:
+                # values that cannot be ordered with each other
+                pass
+            else:
+                self.sorted_values = [value for value, _ in values]
+                self.sorted_rows = [row for _, row in values]
+
+
+class FieldIndex:
+    """Inverted and sorted indexes of the fields of the marked contents of a site, built at load for the query engine.
+
+    Cfields are numbered in the order they are given and a set of cfields is a bitset (an int) over that numbering.
+    The index of a field is made when the field is first queried: value -> cfields for == and !=, item -> cfields for
+    contains and !contains on list fields, and values in order for >, >=, < and <=. Sort keys for :sortby are kept in
+    a column per field. lookup_bits() returns None when a section cannot be answered from the indexes and the cfields
+    must be scanned instead. Cfields without a value for the field match only != (and !in) as in the scan.
+    """
+    def __init__(self, cfields_s, content_model):
+        self.__cfields = tuple(cfields_s)
+        self.__rows = {cfields: row for row, cfields in enumerate(self.__cfields)}
+        self.__all_bits = (1 << len(self.__cfields)) - 1
+        self.__content_model = content_model
+        self.__fields = {}
+        self.__sort_keys = {}
+        self.__total_sort_keys = {}
+
+    # bitsets
+    @property
+    def all_bits(self):
+        return self.__all_bits
+
+    def __bits_of_rows(self, rows):
+        data = bytearray((len(self.__cfields) + 7) // 8)
+        for row in rows:
+            data[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(data, 'little')
+
+    def bits_of(self, cfields_s):
+        rows = self.__rows
+        return self.__bits_of_rows(rows[cfields] for cfields in cfields_s)
+
+    def cfields_of(self, bits):
+        """Cfields of the bitset in the order of their numbering"""
+        cfields = self.__cfields
+        res = []
+        for byte_idx, byte in enumerate(bits.to_bytes((len(cfields) + 7) // 8, 'little')):
+            if byte:
+                base = byte_idx << 3
+                for bit in _BYTE_BITS[byte]:
+                    res.append(cfields[base + bit])
+        return tuple(res)
+
+    def sort_keys(self, key):
+        """Column of sort keys of the field: cfields -> value, Nil when there is no value. It is computed once, so
+        that sorting does not call back into the cfields (and its converters and file times) for every comparison."""
+        column = self.__sort_keys.get(key, None)
+        if column is None:
+            column = {}
+            for cfields in self.__cfields:
+                value = cfields.get(key, None)
+                column[cfields] = Nil if value is None else value
+            self.__sort_keys[key] = column
+        return column
+
+    def total_sort_keys(self, key):
+        """Column of sort keys of the field that order totally: cfields -> (has value, value). Nil does not order with
+        anything, so the cfields without a value would end up anywhere (and differently in sorted() and in heapq);
+        here they come before all the others."""
+        column = self.__total_sort_keys.get(key, None)
+        if column is None:
+            column = {
+                cfields: (False, 0) if value is Nil else (True, value)
+                for cfields, value in self.sort_keys(key).items()
+            }
+            self.__total_sort_keys[key] = column
+        return column
+
+    def __get_field_values(self, key):
+        field_values = self.__fields.get(key, None)
+        if field_values is None:
+            model_field = self.__content_model.get(key, None)
+            if model_field is None:
+                return None
+            field_values = _FieldValues(key, self.__cfields, model_field.converter)
+            self.__fields[key] = field_values
+        return field_values
+
+    def lookup_bits(self, section):
+        """Bitset of the cfields matching the query section whose value is already converted, None when it is not
+        indexed"""
+        key, op, value = section.key, section.comp_op, section.value
+        model_field = self.__content_model.get(key, None)
+        if model_field is None or not model_field.converter.supports_compare_op(op):
+            return None
+        field_values = self.__get_field_values(key)
+
+        if op in ('==', '!='):
+            if field_values.equals is None or isinstance(value, (list, tuple)):
+                return None
+            try:
+                matched = field_values.equals.get(value, 0)
+            except TypeError:
+                return None
+            if op == '==':
+                return matched
+            return self.__all_bits & ~matched
+
+        elif op in ('contains', '!contains'):
+            if field_values.contains is None or not isinstance(value, (list, tuple)) or len(value) == 0:
+                return None
+            try:
+                matched = field_values.contains.get(value[0], 0)
+            except TypeError:
+                return None
+            if op == 'contains':
+                return matched
+            return self.__all_bits & ~(matched | field_values.none_bits)
+
+        elif op in ('>', '>=', '<', '<='):
+            if field_values.sorted_values is None or isinstance(value, (list, tuple)):
+                return None
+            sorted_values = field_values.sorted_values
+            sorted_rows = field_values.sorted_rows
+            try:
+                if op == '>':
+                    rows = sorted_rows[bisect.bisect_right(sorted_values, value):]
+                elif op == '>=':
+                    rows = sorted_rows[bisect.bisect_left(sorted_values, value):]
+                elif op == '<':
+                    rows = sorted_rows[:bisect.bisect_left(sorted_values, value)]
+                else:
+                    rows = sorted_rows[:bisect.bisect_right(sorted_values, value)]
+            except TypeError:
+                return None
+            return self.__bits_of_rows(rows)
+        return None
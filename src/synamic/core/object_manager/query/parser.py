@@ -1,4 +1,5 @@
 import operator
+import functools
 import sly
 from sly import Lexer, Parser
 from synamic.exceptions import SynamicQueryParsingError
@@ -42,34 +43,32 @@ class SimpleQueryParser:
         '<': operator.lt
     }
 
-    Query = namedtuple('Query', ('node', 'sort'))
+    Query = namedtuple('Query', ('node', 'sort', 'limit', 'offset'))
     QuerySection = namedtuple('QuerySection', ('key', 'comp_op', 'value'))
     QuerySortBy = namedtuple('QuerySortBy', ('by_key', 'order'))
 
     def __init__(self, txt):
         self.__txt = txt
 
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def parse_cached(txt):
+        """Parsed queries are kept by query string, so that a query string used over and over again (e.g. in a
+        template) is lexed and parsed only once. The parsed query must not be mutated."""
+        return SimpleQueryParser(txt).parse()
+
     def parse(self):
         """
-        title == something | type in go, yes & age > 6
+        title == something | type in go, yes & age > 6 :sortby created_on desc :limit 5 :offset 10
         """
         text = self.__txt.strip()
         lexer = QueryLexer()
         parser = QueryParser(text)
         try:
             if text == '':
-                res = self.Query(None, None)
-            else:
-                res = parser.parse(lexer.tokenize(text))
-
-            if len(res) == 1:
-                if isinstance(res[0], self.QuerySortBy):
-                    query = self.Query(node=None, sort=res[0])
-                else:
-                    query = self.Query(node=res[0], sort=None)
+                query = self.Query(node=None, sort=None, limit=None, offset=None)
             else:
-                assert len(res) > 1
-                query = self.Query(node=res[0], sort=res[1])
+                query = parser.parse(lexer.tokenize(text))
         except sly.lex.LexError as e:
             err_txt = generate_error_message(text, e.text)
             raise SynamicQueryParsingError(
@@ -127,11 +126,18 @@ class QueryValueLexer(Lexer):
 
 
 class QueryLexer(Lexer):
-    tokens = {'KEY', 'COMP_OP', 'AND', 'OR', 'SORT_BY'}
+    tokens = {'KEY', 'COMP_OP', 'AND', 'OR', 'SORT_BY', 'LIMIT', 'OFFSET', 'NUMBER'}
     ignore_ws = r'\s'
     SORT_BY = r':sortby\s+'
+    LIMIT = r':limit\s+'
+    OFFSET = r':offset\s+'
 
-    @_(r'>|<|==|!=|>=|<=|\s+in|!in|\s+contains|!contains')
+    @_(r'[0-9]+')
+    def NUMBER(self, t):
+        t.value = int(t.value)
+        return t
+
+    @_(r'>=|<=|>|<|==|!=|\s+in|!in|\s+contains|!contains')
     def COMP_OP(self, t):
         self.begin(QueryValueLexer)
         t.value = t.value.strip()
@@ -164,13 +170,51 @@ class QueryParser(Parser):
 
     # Grammar rules and actions
     @_('expr',
-       'sort',
-       'expr sort')
+       'expr modifiers',
+       'modifiers')
     def query(self, p):
-        if len(p) == 1:
-            return p[0],
+        node = None
+        modifiers = {}
+        if len(p) == 2:
+            node, modifiers = p[0], p[1]
+        elif isinstance(p[0], dict):
+            modifiers = p[0]
         else:
-            return p[0], p[1]
+            node = p[0]
+        return SimpleQueryParser.Query(
+            node=node,
+            sort=modifiers.get('sort', None),
+            limit=modifiers.get('limit', None),
+            offset=modifiers.get('offset', None)
+        )
+
+    @_('modifier',
+       'modifiers modifier')
+    def modifiers(self, p):
+        if len(p) == 1:
+            name, value = p[0]
+            return {name: value}
+        modifiers = p[0]
+        name, value = p[1]
+        if name in modifiers:
+            raise SynamicQueryParsingError(
+                f'Query modifier :{"sortby" if name == "sort" else name} is specified more than once.'
+                f'\nDetails:{generate_error_message(self.__text, "")}'
+            )
+        modifiers[name] = value
+        return modifiers
+
+    @_('sort')
+    def modifier(self, p):
+        return 'sort', p[0]
+
+    @_('LIMIT NUMBER')
+    def modifier(self, p):
+        return 'limit', p[1]
+
+    @_('OFFSET NUMBER')
+    def modifier(self, p):
+        return 'offset', p[1]
 
     @_('SORT_BY KEY',
        'SORT_BY KEY KEY')
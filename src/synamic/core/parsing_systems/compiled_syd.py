@@ -0,0 +1,106 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+
+Compiled syd (.sydc): the parsed syd tree of a .syd file stored in binary form, so that it is deserialized on the next
+run instead of parsed again.
+
+A .sydc file is the magic bytes followed by a pickled record: the format version, the size, mtime and hash of the text
+of the source it was compiled from and the pickled syd. The syd is pickled on its own so that a record can be checked
+against the source without unpickling the syd.
+"""
+import os
+import pickle
+import hashlib
+
+
+# Must be changed when the pickled layout of SydData or SydContainer changes.
+SYDC_VERSION = 1
+SYDC_MAGIC = b'SYDC'
+SYDC_EXT = '.sydc'
+# dir under the cache dir of the project
+COMPILED_SYD_DIR_NAME = 'sydc'
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def dumps_sydc(syd, size, mtime, source_hash):
+    record = {
+        'version': SYDC_VERSION,
+        'size': size,
+        'mtime': mtime,
+        'hash': source_hash,
+        'syd': pickle.dumps(syd, pickle.HIGHEST_PROTOCOL),
+    }
+    return SYDC_MAGIC + pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+
+
+def loads_sydc_record(data):
+    """Returns the record of the .sydc data, None when it is not a .sydc of this version"""
+    if not data.startswith(SYDC_MAGIC):
+        return None
+    try:
+        record = pickle.loads(data[len(SYDC_MAGIC):])
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, IndexError):
+        return None
+    if not isinstance(record, dict) or record.get('version') != SYDC_VERSION:
+        return None
+    return record
+
+
+def syd_of_record(record):
+    return pickle.loads(record['syd'])
+
+
+def read_sydc_file(sydc_path):
+    """Returns the record of the .sydc file at the os path sydc_path, None when there is none or it is not usable"""
+    try:
+        with open(sydc_path, 'rb') as f:
+            return loads_sydc_record(f.read())
+    except OSError:
+        return None
+
+
+def write_sydc_file(sydc_path, data):
+    """Writes the .sydc data to a temporary file first, so that another process never reads one that is half written.
+    Not being able to write it (e.g. a read only cache dir or a full disk) only costs the parsing on the next run."""
+    tmp_path = f'{sydc_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(sydc_path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, sydc_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_syd_file(file_path, sydc_path, parse):
+    """Returns the syd of the .syd file at the os path file_path from the .sydc at sydc_path, it is compiled with
+    parse(text) when there is none or the source changed."""
+    stat = os.stat(file_path)
+    size, mtime = stat.st_size, stat.st_mtime
+
+    record = read_sydc_file(sydc_path)
+    if record is not None and record['size'] == size and record['mtime'] == mtime:
+        return syd_of_record(record)
+
+    with open(file_path, encoding='utf-8') as f:
+        text = f.read()
+    source_hash = text_hash(text)
+    if record is not None and record['hash'] == source_hash:
+        # only touched
+        syd = syd_of_record(record)
+    else:
+        syd = parse(text)
+    write_sydc_file(sydc_path, dumps_sydc(syd, size, mtime, source_hash))
+    return syd
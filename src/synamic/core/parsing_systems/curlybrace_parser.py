@@ -210,9 +210,11 @@ class _ParseState(enum.Enum):
 
 
 class SydParser:
-    def __init__(self, text, debug=False):
+    def __init__(self, text, debug=False, fast=True):
+        """fast: parse flat documents (see __parse_flat()) without the state machine"""
         self.__text = text
         self.__debug = debug
+        self.__fast = fast
         self.__tree = SydContainer('__root__')
         self.__error = None
         self.__lines = self.__text.splitlines()
@@ -253,6 +255,8 @@ class SydParser:
         return len(self.__parse_states)
 
     def parse(self):  # (-1)
+        if self.__fast and len(self.__lines) != 0 and self.__parse_flat():
+            return self.__tree
         if len(self.__lines) != 0:
             assert self.__current_line_no == 0
             self.__enter_state(_ParseState.processing_block)
@@ -260,6 +264,54 @@ class SydParser:
             self.__leave_state(_ParseState.processing_block)
         return self.__tree
 
+    def __parse_flat(self):
+        """Fast path for flat documents - most front matters are: only `key: value` lines and inline lists, comments
+        and empty lines. The tree is built as the state machine would build it. Returns False without touching the
+        tree when the document has anything else (a block, a list, a multiline string, an include, an invalid line or
+        value) - it is parsed by the state machine then, which also reports the errors."""
+        datas = []
+        for line in self.__lines:
+            key_match = _Patterns.key_pattern.match(line)
+            if key_match is None:
+                stripped_line = line.strip()
+                if stripped_line == '' or self.__is_comment(stripped_line):
+                    continue
+                return False
+            if key_match.group('is_multiline'):
+                return False
+            key = key_match.group('key')
+            line_end = line[key_match.end():].lstrip()
+            if line_end.startswith(('{', '[')):
+                return False
+            try:
+                inline_list_match = _Patterns.inline_list.match(line_end)
+                if inline_list_match:
+                    data = SydContainer(key, is_list=True)
+                    for part in self.convert_to_scalar_values(inline_list_match.group('content'), None, True):
+                        data.add(part)
+                else:
+                    data = self.__flat_scalar(line_end, key)
+            except ValueError:
+                return False
+            datas.append(data)
+        for data in datas:
+            self.__tree.add(data)
+        return True
+
+    @classmethod
+    def __flat_scalar(cls, text, key):
+        """convert_to_scalar_values() of a single value, without trying the number and date/time patterns on a bare
+        string that cannot be one of them"""
+        data_part = text.strip()
+        if data_part == '' or data_part[0] in '\'"+-' or data_part[0].isdigit():
+            return cls.convert_to_scalar_values(text, key)
+        bare_string = data_part
+        if len(bare_string) > 1:
+            if bare_string[0:2] in (r'\(', r'\{', r'\['):
+                bare_string = bare_string[2:]
+        bare_string = bare_string.strip()
+        return SydData(key, bare_string, SydDataType.string)
+
     def __process_block(self, key, block_type=None):  # (0)
         """This loop is used at the root and at any nested level (root from that perspective)"""
         assert self.__current_state in (_ParseState.processing_block, _ParseState.processing_list)
@@ -10,7 +10,6 @@
 
 import re
 import datetime
-from collections import OrderedDict
 import mimetypes
 from synamic.core.contracts.content import CDocType
 from synamic.core.standalones.functions.decorators import not_loaded
@@ -65,16 +64,15 @@ class ContentService:
         # get dir meta syd
         # """It should not live here as it is compile time dependency"""
         # each field from meta syd will be converted with individual content model and site type system.
-        dir_meta_file_name = self.__site.system_settings['configs.dir_meta_file_name']
-        _syd = self.__site.object_manager.empty_syd()
-        parent_cpaths = file_cpath.parent_cpaths
-        for dir_cpath in parent_cpaths:
-            dir_meta_cfile = dir_cpath.join(dir_meta_file_name, is_file=True)
-            if dir_meta_cfile.exists():
-                dir_meta_syd = self.__site.object_manager.get_syd(dir_meta_cfile)
-                _syd = _syd.merged_new(dir_meta_syd)
-        else:  # for else when loop ended normally without using break.
-            fields_syd = _syd.merged_new(fields_syd)
+        # metas of the parent dirs are merged once per dir, only the front matter is merged on top of them here.
+        dependency_graph = self.__site.object_manager.dependency_graph
+        parent_cpath = file_cpath.parent_cpath
+        if parent_cpath is None:
+            dir_meta_syd, dir_meta_nodes = self.__site.object_manager.empty_syd(), ()
+        else:
+            dir_meta_syd, dir_meta_nodes = self.__site.object_manager.get_dir_meta(parent_cpath)
+        fields_syd = dir_meta_syd.merged_new(fields_syd)
+        dependency_graph.set_dependencies(dependency_graph.fields_node(file_cpath), *dir_meta_nodes)
 
         # TODO: what is the document type???
         cdoctype = CDocType.HTML_DOCUMENT
@@ -104,7 +102,7 @@ class ContentService:
     #     return _SyntheticContentFields(self.__site, curl, cdoctype, fields_map)
 
     def build_md_content(self, file_cpath, cached_cfields):
-        _, body_text = self.__site.object_manager.get_content_parts(file_cpath)
+        body_text = self.__site.object_manager.get_content_body(file_cpath)
         # mime type guess
         content = MarkedContent(self.__site,
                                 body_text,
@@ -152,6 +150,9 @@ class ContentService:
 
 
 class _ContentFields(CFieldsContract):
+    __slots__ = ('__site', '__content_file_cpath', '__curl', '__cmodel', '__cdoctype', '__mimetype', '__raw_cfields',
+                 '__converted_values')
+
     def __init__(self, site, content_file_cpath, curl, cmodel, cdoctype, mimetype, raw_cfields):
         self.__site = site
         self.__content_file_cpath = content_file_cpath
@@ -160,7 +161,8 @@ class _ContentFields(CFieldsContract):
         self.__cdoctype = cdoctype
         self.__mimetype = mimetype
         self.__raw_cfields = raw_cfields
-        self.__converted_values = OrderedDict()
+        # allocated on the first conversion, most of the cfields of a big site never get a field converted.
+        self.__converted_values = None
 
     def as_generated(self, curl, cdoctype=CDocType.GENERATED_HTML_DOCUMENT):
         """With cfields will use .set() and thus it will only affect converted values."""
@@ -181,7 +183,11 @@ class _ContentFields(CFieldsContract):
         else:
             per_page = per_page_4m_settings
 
-        fields = object_manager.query_cfields(query_str)
+        # pagination is a part of the fields, so the fields depend on the query.
+        dependency_graph = object_manager.dependency_graph
+        with dependency_graph.recording() as query_deps:
+            fields = object_manager.query_cfields(query_str)
+        dependency_graph.add(dependency_graph.fields_node(self.cpath), *query_deps)
         origin_content = object_manager.get_marked_content(self.cpath)
         assert self is origin_content.cfields
         paginations, paginated_contents = PaginationPage.paginate_cfields(
@@ -221,7 +227,7 @@ class _ContentFields(CFieldsContract):
             else:
                 return default
         else:
-            value = self.__converted_values.get(key, None)
+            value = None if self.__converted_values is None else self.__converted_values.get(key, None)
             # convert value
             if value is None:
                 # special conversions
@@ -247,12 +253,14 @@ class _ContentFields(CFieldsContract):
                         value = model_field.converter(raw_value)
                     else:
                         value = raw_value
-        self.__converted_values[key] = value
+        self.set(key, value)
         return value
 
     def set(self, key, value):
         """Converted cfields will be affected only.
         Raw cfields will stay intact."""
+        if self.__converted_values is None:
+            self.__converted_values = {}
         self.__converted_values[key] = value
 
     @property
@@ -261,7 +269,8 @@ class _ContentFields(CFieldsContract):
 
     @property
     def keys(self):
-        return tuple(set(self.__converted_values.keys()).union(set(self.__raw_cfields.keys())))
+        converted_keys = () if self.__converted_values is None else self.__converted_values.keys()
+        return tuple(set(converted_keys).union(set(self.__raw_cfields.keys())))
 
     @property
     def cdoctype(self):
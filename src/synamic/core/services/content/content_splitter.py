@@ -1,19 +1,18 @@
 import re
 
 
-def content_splitter(file_path, content_text):
-    front_matter_sep = re.compile(r'^(?P<sep>-{3,})[ \t]*$')
-    lines = content_text.splitlines()
-    front_matter_lines = []
-    body_lines = []
+_front_matter_sep = re.compile(r'^(?P<sep>-{3,})[ \t]*$')
 
-    fm_start_idx = None
-    fm_end_idx = None
+
+def _front_matter_lines(file_path, lines):
+    """Consumes the lines till the closing separator of the front matter and returns the lines of the front matter.
+    What is left in the lines iterator after that is the body."""
+    front_matter_lines = []
     sep = None
     idx = 0
     for line in lines:
-        if fm_start_idx is None and fm_end_idx is None:
-            front_matter_match = front_matter_sep.match(line)
+        if sep is None:
+            front_matter_match = _front_matter_sep.match(line)
             if line.strip() == '':
                 # skip
                 # before front matter
@@ -21,24 +20,51 @@ def content_splitter(file_path, content_text):
                 continue
             elif front_matter_match:
                 sep = front_matter_match.group('sep')
-                fm_start_idx = idx
             else:
                 raise Exception('Invalid text before front matter section started. '
                                 'Parsing error at line %d. File name: %s' % (idx + 1, file_path.relative_path))
-        elif fm_start_idx is not None and fm_end_idx is None:
+        else:
             # inside front matter.
             sep_end_text = line.strip()
             if sep_end_text == sep:
-                fm_end_idx = idx
+                return front_matter_lines
             else:
                 front_matter_lines.append(line)
-        elif fm_start_idx is not None and fm_end_idx is not None:
-            # inside body
-            body_lines.append(line)
-        else:
-            raise Exception('Parsing error at line %d. File name: %s' % (idx + 1, file_path.relative_path))
         idx += 1
-    if fm_start_idx is None or fm_end_idx is None:
-        raise Exception('Front matter section was not found. File name: %s' % file_path.relative_path)
+    raise Exception('Front matter section was not found. File name: %s' % file_path.relative_path)
+
 
+def content_splitter(file_path, content_text):
+    lines = iter(content_text.splitlines())
+    front_matter_lines = _front_matter_lines(file_path, lines)
+    body_lines = list(lines)
     return '\n'.join(front_matter_lines), '\n'.join(body_lines)
+
+
+def _stream_lines(f, head):
+    """Lines of the binary file object f as content_splitter() would get them. The bytes of every line (with its line
+    ending) are appended to head as it is yielded."""
+    for raw_line in f:
+        # utf-8 bytes of other characters never contain b'\n', so every raw line can be decoded on its own.
+        for line in raw_line.decode('utf-8').splitlines(keepends=True):
+            head.append(line.encode('utf-8'))
+            yield line.splitlines()[0]
+
+
+def front_matter_reader(file_path, f):
+    """Reads only the front matter from the binary file object f, line by line, and stops after the closing separator.
+    Returns the front matter (as content_splitter() does) and the bytes that were read for it: the body starts at the
+    byte offset len(head) of the file."""
+    head = []
+    front_matter_lines = _front_matter_lines(file_path, _stream_lines(f, head))
+    return '\n'.join(front_matter_lines), b''.join(head)
+
+
+def body_reader(file_path, f, body_offset=None):
+    """Reads the body (as content_splitter() does) from the binary file object f. body_offset is where the body
+    starts, as known from front_matter_reader(): the front matter is not read again then."""
+    if body_offset is None:
+        _, head = front_matter_reader(file_path, f)
+        body_offset = len(head)
+    f.seek(body_offset)
+    return '\n'.join(f.read().decode('utf-8').splitlines())
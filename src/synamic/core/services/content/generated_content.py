@@ -18,7 +18,9 @@ class GeneratedContent(ContentContract):
         self.__synthetic_cfields = synthetic_cfields
         self.__file_content = file_content
         self.__source_cpath = source_cpath
-        self.__render_callable = render_callable  # render callable will accept 2 params: site, this content object
+        # render callable will accept 2 params: site, this content object. It returns the text or an iterator of pieces
+        # of it.
+        self.__render_callable = render_callable
 
         # validation
         assert CDocType.is_generated(self.__synthetic_cfields.cdoctype)
@@ -45,10 +47,21 @@ class GeneratedContent(ContentContract):
                 content = f.read()
         return content
 
+    def __record_dependencies(self):
+        dependency_graph = self.__site.object_manager.dependency_graph
+        if self.__source_cpath is not None:
+            dependency_graph.record(dependency_graph.file_node(self.__source_cpath))
+        generated_node = dependency_graph.generated_node(self.cfields.curl)
+        if generated_node in dependency_graph:
+            dependency_graph.record(generated_node)
+
     def get_stream(self):
+        self.__record_dependencies()
         if callable(self.__render_callable):
             # so this content is renderable.
             text_content = self.__render_callable(self.__site, self)
+            if not isinstance(text_content, str):
+                text_content = ''.join(text_content)
             stream = io.BytesIO(text_content.encode('utf-8'))
         else:
             if self.__file_content is not None:
@@ -60,6 +73,17 @@ class GeneratedContent(ContentContract):
                 stream = self.__source_cpath.open('rb')
         return stream
 
+    def iter_chunks(self):
+        if not callable(self.__render_callable):
+            yield from super().iter_chunks()
+            return
+        self.__record_dependencies()
+        text_content = self.__render_callable(self.__site, self)
+        if isinstance(text_content, str):
+            text_content = (text_content, )
+        for text in text_content:
+            yield text.encode('utf-8')
+
     @property
     def body(self):
         if self.__file_content is not None:
@@ -15,59 +15,83 @@ class MarkedContent(ContentContract):
 
         self.__toc = None
         self.__body = None
+        self.__body_dependencies = ()
 
     @property
     def site(self):
         return self.__site
 
-    def get_stream(self):
+    def __template_context(self):
+        dependency_graph = self.__site.object_manager.dependency_graph
+        dependency_graph.record(dependency_graph.fields_node(self.cpath))
         template_name = self.__cfields.get('template', self.site.synamic.system_settings['templates.default'])
-        templates = self.__site.get_service('templates')
-        res = templates.render(template_name, context={
+        return template_name, {
             'site': self.__site,
             'content': self
-        })
+        }
+
+    def get_stream(self):
+        template_name, context = self.__template_context()
+        templates = self.__site.get_service('templates')
+        res = templates.render(template_name, context=context)
         f = io.BytesIO(res.encode('utf-8'))
         return f
 
+    def iter_chunks(self):
+        template_name, context = self.__template_context()
+        templates = self.__site.get_service('templates')
+        for text in templates.generate(template_name, context=context):
+            yield text.encode('utf-8')
+
     def __render_body(self):
         body = self.__body
         if body is None:
-            toc = Toc()
-            # try with model converter
-            body_field_key = self.__cmodel.body_field
-            if body_field_key is None:
-                body_field_key = '__body__'
-
-            model_field = self.__cmodel.get(body_field_key)
-            if model_field is not None:
-                body = model_field.converter(
-                    self.__body_text,
-                    value_pack={
-                        'toc': toc
-                    },
-                    md_cpath=self.cpath,
-                    cfields=self.__cfields
-                )
-
-            # try with markdown renderer
-            else:
-                markdown_renderer = self.__site.get_service('types').get_converter('markdown')
-
-                body = markdown_renderer(
-                    self.__body_text,
-                    value_pack={
-                        'toc': toc
-                    },
-                    md_cpath=self.cpath,
-                    cfields=self.__cfields
-                )
-            self.__toc = toc
-            self.__body = body
+            with self.__site.object_manager.dependency_graph.recording() as body_dependencies:
+                self.__render_body_text()
+            self.__body_dependencies = tuple(body_dependencies)
+
+    def __render_body_text(self):
+        toc = Toc()
+        # try with model converter
+        body_field_key = self.__cmodel.body_field
+        if body_field_key is None:
+            body_field_key = '__body__'
+
+        model_field = self.__cmodel.get(body_field_key)
+        if model_field is not None:
+            body = model_field.converter(
+                self.__body_text,
+                value_pack={
+                    'toc': toc
+                },
+                md_cpath=self.cpath,
+                cfields=self.__cfields
+            )
+
+        # try with markdown renderer
+        else:
+            markdown_renderer = self.__site.get_service('types').get_converter('markdown')
+
+            body = markdown_renderer(
+                self.__body_text,
+                value_pack={
+                    'toc': toc
+                },
+                md_cpath=self.cpath,
+                cfields=self.__cfields
+            )
+        self.__toc = toc
+        self.__body = body
+
+    def __record_body_dependencies(self):
+        # every reader of the body depends on the file and on what was included in the body.
+        dependency_graph = self.__site.object_manager.dependency_graph
+        dependency_graph.record(dependency_graph.file_node(self.cpath), *self.__body_dependencies)
 
     @property
     def body(self):
         self.__render_body()
+        self.__record_body_dependencies()
         return self.__body
 
     @property
@@ -85,6 +109,7 @@ class MarkedContent(ContentContract):
     @property
     def toc(self):
         self.__render_body()
+        self.__record_body_dependencies()
         return self.__toc
 
     def __getitem__(self, key):
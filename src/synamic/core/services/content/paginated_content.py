@@ -16,13 +16,19 @@ class PaginatedContent(ContentContract):
     def site(self):
         return self.__site
 
-    def __rendered(self):
+    def __template_context(self):
+        dependency_graph = self.__site.object_manager.dependency_graph
+        dependency_graph.record(dependency_graph.fields_node(self.__origin_cfields.cpath))
         template_name = self.__cfields.get('template', 'default.html')
-        templates = self.__site.get_service('templates')
-        res = templates.render(template_name, context={
+        return template_name, {
             'site': self.__site,
             'content': self
-        })
+        }
+
+    def __rendered(self):
+        template_name, context = self.__template_context()
+        templates = self.__site.get_service('templates')
+        res = templates.render(template_name, context=context)
         return res
 
     def get_stream(self):
@@ -30,6 +36,12 @@ class PaginatedContent(ContentContract):
         f = io.BytesIO(res.encode('utf-8'))
         return f
 
+    def iter_chunks(self):
+        template_name, context = self.__template_context()
+        templates = self.__site.get_service('templates')
+        for text in templates.generate(template_name, context=context):
+            yield text.encode('utf-8')
+
     @property
     def body(self):
         content = self.__site.object_manager.get_marked_content(self.__origin_cfields.cpath)
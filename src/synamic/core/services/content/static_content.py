@@ -24,6 +24,8 @@ class StaticContent(ContentContract):
         return self.__site
 
     def get_stream(self):
+        dependency_graph = self.__site.object_manager.dependency_graph
+        dependency_graph.record(dependency_graph.file_node(self.__cfields.cpath))
         file = self.__cfields.cpath.open('rb')
         return file
 
@@ -1,10 +1,52 @@
 import os
 import os.path
+import contextlib
 from synamic.core.contracts import BaseFsBackendContract
 from synamic.exceptions import SynamicFSError
 
 
 class FileSystemBackend(BaseFsBackendContract):
+    """Inside a stat epoch (load, build, reload) stat() results are cached, so that a path is stat'ed at most once per
+    epoch. Outside an epoch every call goes to the file system."""
+    def __init__(self):
+        self.__epoch = None
+        self.__stat_cache = {}
+        self.__stat_hits = 0
+        self.__stat_misses = 0
+
+    @property
+    def epoch(self):
+        return self.__epoch
+
+    @contextlib.contextmanager
+    def stat_epoch(self, name):
+        """Caches stat results inside the with block. A nested epoch continues the one in progress."""
+        if self.__epoch is not None:
+            yield self
+            return
+        self.__epoch = name
+        self.__stat_cache.clear()
+        try:
+            yield self
+        finally:
+            self.__epoch = None
+            self.__stat_cache.clear()
+
+    @property
+    def stat_cache_info(self):
+        return {
+            'epoch': self.__epoch,
+            'hits': self.__stat_hits,
+            'misses': self.__stat_misses,
+            'size': len(self.__stat_cache),
+        }
+
+    def invalidate(self, path):
+        self.__stat_cache.pop(path, None)
+
+    def invalidate_all(self):
+        self.__stat_cache.clear()
+
     def open(self, path, *args, **kwargs):
         try:
             fo = open(path, *args, **kwargs)
@@ -55,9 +97,21 @@ class FileSystemBackend(BaseFsBackendContract):
             )
         return res
 
-    def makedirs(self, path):
+    def scandir(self, path):
+        try:
+            with os.scandir(path) as it:
+                res = [(entry.name, entry.is_file(), entry.is_dir()) for entry in it]
+        except (OSError, IOError) as e:
+            raise SynamicFSError(
+                f'Synamic File System Error (occurred during scanning path: {path}):\n'
+                f'{str(e)}'
+            )
+        return res
+
+    def makedirs(self, path, exist_ok=False):
+        self.invalidate(path)
         try:
-            res = os.makedirs(path)
+            res = os.makedirs(path, exist_ok=exist_ok)
         except (OSError, IOError) as e:
             raise SynamicFSError(
                 f'Synamic File System Error (occurred during making directory with path: {path}):\n'
@@ -65,7 +119,28 @@ class FileSystemBackend(BaseFsBackendContract):
             )
         return res
 
+    def stat(self, path):
+        if self.__epoch is not None:
+            st = self.__stat_cache.get(path, None)
+            if st is not None:
+                self.__stat_hits += 1
+                return st
+            self.__stat_misses += 1
+        try:
+            st = os.stat(path)
+        except (OSError, IOError) as e:
+            raise SynamicFSError(
+                f'Synamic File System Error (occurred during stat on path: {path}):\n'
+                f'{str(e)}'
+            )
+        st = st.st_size, st.st_mtime, st.st_ctime
+        if self.__epoch is not None:
+            self.__stat_cache[path] = st
+        return st
+
     def getmtime(self, path):
+        if self.__epoch is not None:
+            return self.stat(path)[1]
         try:
             res = os.path.getmtime(path)
         except (OSError, IOError) as e:
@@ -76,6 +151,8 @@ class FileSystemBackend(BaseFsBackendContract):
         return res
 
     def getctime(self, path):
+        if self.__epoch is not None:
+            return self.stat(path)[2]
         try:
             res = os.path.getctime(path)
         except (OSError, IOError) as e:
@@ -86,6 +163,7 @@ class FileSystemBackend(BaseFsBackendContract):
         return res
 
     def remove(self, path):
+        self.invalidate(path)
         try:
             res = os.remove(path)
         except (OSError, IOError) as e:
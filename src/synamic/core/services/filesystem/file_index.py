@@ -0,0 +1,164 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+from synamic.exceptions import SynamicFSError
+
+
+class FileIndex:
+    """In memory index of the file system shared by the path trees of a synamic project.
+
+    Directories are scanned once, when something under them is first asked for, and the entries are kept with their
+    types: listing, exists(), is_file() and is_dir() are answered from the index after that. size, mtime and ctime of
+    a path come from stat() of the backend, that caches them inside a load or build epoch.
+
+    Writes done through the path tree invalidate the affected entries. Anything that changes the file system behind the
+    back of the path tree (other processes, cleaning of outputs) must call rescan(), or refresh_dir() for the dirs whose
+    listings it is about to use when it cannot know what changed (e.g. the dev server between requests). Every
+    invalidation increases the generation, so that holders of data derived from the index can know that it changed.
+    """
+    def __init__(self, fs):
+        self.__fs = fs
+        # abs dir path -> {name: (is_file, is_dir)} in the order of the scan, None when the dir does not exist.
+        self.__listings = {}
+        # abs dir path -> mtime of the dir when it was scanned, None when it did not exist.
+        self.__scan_mtimes = {}
+        self.__generation = 0
+
+    @property
+    def generation(self):
+        return self.__generation
+
+    @staticmethod
+    def __key(abs_path):
+        if len(abs_path) > 1:
+            abs_path = abs_path.rstrip('/\\')
+        return abs_path
+
+    @staticmethod
+    def __split(abs_path):
+        parent, sep, name = abs_path.rpartition('/')
+        if sep == '' or name == '':
+            return None, abs_path
+        if parent == '':
+            parent = '/'
+        return parent, name
+
+    def __dir_mtime(self, abs_dir):
+        try:
+            return self.__fs.stat(abs_dir)[1]
+        except SynamicFSError:
+            return None
+
+    def __listing(self, abs_dir):
+        listing = self.__listings.get(abs_dir, False)
+        if listing is False:
+            # before the scan, so that a change during the scan is seen by refresh_dir()
+            self.__scan_mtimes[abs_dir] = self.__dir_mtime(abs_dir)
+            try:
+                listing = {name: (is_file, is_dir) for name, is_file, is_dir in self.__fs.scandir(abs_dir)}
+            except SynamicFSError:
+                # does not exist or is not a directory
+                listing = None
+            self.__listings[abs_dir] = listing
+        return listing
+
+    def __entry(self, abs_path):
+        """Returns (is_file, is_dir) or None when the path does not exist"""
+        parent, name = self.__split(abs_path)
+        if parent is None:
+            # fs root or a path without any parent in it.
+            fs = self.__fs
+            if not fs.exists(abs_path):
+                return None
+            return fs.is_file(abs_path), fs.is_dir(abs_path)
+        listing = self.__listing(parent)
+        if listing is None:
+            return None
+        return listing.get(name, None)
+
+    def entries(self, abs_dir):
+        """Tuple of (name, is_file, is_dir) of the entries of the directory"""
+        abs_dir = self.__key(abs_dir)
+        listing = self.__listing(abs_dir)
+        if listing is None:
+            raise SynamicFSError(
+                f'Synamic File System Error (occurred during listing path: {abs_dir}):\n'
+                f'The path does not exist or is not a directory'
+            )
+        return tuple((name, is_file, is_dir) for name, (is_file, is_dir) in listing.items())
+
+    def listing_token(self, abs_dir):
+        """An object that stays the same (compare it with `is`) as long as the entries of the directory are not
+        invalidated, so that holders of data derived from what is in a directory can check it without touching the
+        file system. The directory is scanned if needed."""
+        return self.__listing(self.__key(abs_dir))
+
+    def exists(self, abs_path):
+        return self.__entry(self.__key(abs_path)) is not None
+
+    def is_file(self, abs_path):
+        entry = self.__entry(self.__key(abs_path))
+        return entry is not None and entry[0]
+
+    def is_dir(self, abs_path):
+        entry = self.__entry(self.__key(abs_path))
+        return entry is not None and entry[1]
+
+    def stat(self, abs_path):
+        """(size, mtime, ctime) of the path"""
+        return self.__fs.stat(self.__key(abs_path))
+
+    def getsize(self, abs_path):
+        return self.stat(abs_path)[0]
+
+    def getmtime(self, abs_path):
+        return self.stat(abs_path)[1]
+
+    def getctime(self, abs_path):
+        return self.stat(abs_path)[2]
+
+    def invalidate(self, abs_path):
+        """Forgets what is known about the path, its listing if it is a directory and the listing of its parent.
+        Parents that did not exist or were not scanned are forgotten too, up to the first scanned existing one, as the
+        path may have been created with them."""
+        fs = self.__fs
+        abs_path = self.__key(abs_path)
+        fs.invalidate(abs_path)
+        self.__listings.pop(abs_path, None)
+        self.__scan_mtimes.pop(abs_path, None)
+        parent, _ = self.__split(abs_path)
+        while parent is not None:
+            fs.invalidate(parent)
+            self.__scan_mtimes.pop(parent, None)
+            listing = self.__listings.pop(parent, False)
+            if isinstance(listing, dict):
+                break
+            parent, _ = self.__split(parent)
+        self.__generation += 1
+
+    def refresh_dir(self, abs_dir):
+        """Invalidates the directory when its mtime is not the one it had when it was scanned, i.e. entries were added
+        to or removed from it (or it was created or removed) since. Costs one stat, a directory that was not scanned is
+        left alone. Returns whether it was invalidated."""
+        abs_dir = self.__key(abs_dir)
+        scan_mtime = self.__scan_mtimes.get(abs_dir, False)
+        if scan_mtime is False:
+            return False
+        self.__fs.invalidate(abs_dir)
+        if self.__dir_mtime(abs_dir) == scan_mtime:
+            return False
+        self.invalidate(abs_dir)
+        return True
+
+    def rescan(self):
+        """Forgets everything, directories will be scanned again when needed"""
+        self.__listings.clear()
+        self.__scan_mtimes.clear()
+        self.__fs.invalidate_all()
+        self.__generation += 1
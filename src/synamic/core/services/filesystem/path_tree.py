@@ -8,9 +8,11 @@
     status: "Development"
 """
 import re
+import sys
 from collections import deque
 from synamic.core.contracts import BaseFsBackendContract
 from .backends import FileSystemBackend
+from .file_index import FileIndex
 from synamic.core.contracts import HostContract, SiteContract, SynamicContract
 from synamic.exceptions import SynamicInvalidCPathComponentError
 from synamic.core.standalones.functions.sequence_ops import Sequence
@@ -31,8 +33,15 @@ class PathTree(object):
         # TODO: assert os.path.isdir(host.site_root), "FileTree.__init__: _root must be a directory, `%s`"
         #  % host.site_root
 
-        # default backend system
-        self.__fs = FileSystemBackend()
+        # path trees of the sites share the backend and the file index of the synamic path tree as the sites are nested
+        # in the same directory tree
+        if isinstance(host, SiteContract):
+            self.__fs = host.synamic.path_tree.fs
+            self.__file_index = host.synamic.path_tree.file_index
+        else:
+            # default backend system
+            self.__fs = FileSystemBackend()
+            self.__file_index = FileIndex(self.__fs)
         self.__is_loaded = False
 
     @classmethod
@@ -56,6 +65,14 @@ class PathTree(object):
     def fs(self):
         return self.__fs
 
+    @property
+    def file_index(self):
+        return self.__file_index
+
+    def rescan(self):
+        """Must be called when the file system was changed by something other than this path tree"""
+        self.__file_index.rescan()
+
     @property
     def is_loaded(self):
         return self.__is_loaded
@@ -184,31 +201,48 @@ class PathTree(object):
     def exists(self, *path) -> bool:
         comps = self.to_cpath_ccomps(*path)
         """Checks existence relative to the root"""
-        return True if self.__fs.exists(self.__full_path__(comps)) else False
+        return True if self.__file_index.exists(self.__full_path__(comps)) else False
 
     def is_file(self, *path) -> bool:
         comps = self.to_cpath_ccomps(*path)
         fn = self.__full_path__(comps)
-        return True if self.__fs.is_file(fn) else False
+        return True if self.__file_index.is_file(fn) else False
 
     def is_dir(self, *path) -> bool:
         comps = self.to_cpath_ccomps(*path)
         fn = self.__full_path__(comps)
-        return True if self.__fs.is_dir(fn) else False
+        return True if self.__file_index.is_dir(fn) else False
 
     def join(self, *content_paths, is_file=False, forgiving=False):
         comps = self.to_cpath_ccomps(*content_paths)
         return self.create_cpath(comps, is_file=is_file, forgiving=forgiving)
 
-    def open(self, file_path, *args, **kwargs):
+    def open(self, file_path, mode='r', *args, **kwargs):
         comps = self.to_cpath_ccomps(file_path)
         fn = self.__full_path__(comps)
-        return open(fn, *args, **kwargs)
+        if any(c in mode for c in 'wax+'):
+            self.__file_index.invalidate(fn)
+        return open(fn, mode, *args, **kwargs)
 
-    def makedirs(self, *dir_path):
+    def makedirs(self, *dir_path, exist_ok=False):
         comps = self.to_cpath_ccomps(*dir_path)
         full_p = self.__full_path__(comps)
-        self.__fs.makedirs(full_p)
+        self.__file_index.invalidate(full_p)
+        self.__fs.makedirs(full_p, exist_ok=exist_ok)
+
+    def remove(self, *file_path):
+        comps = self.to_cpath_ccomps(*file_path)
+        full_p = self.__full_path__(comps)
+        self.__file_index.invalidate(full_p)
+        self.__fs.remove(full_p)
+
+    def getmtime(self, *path):
+        comps = self.to_cpath_ccomps(*path)
+        return self.__file_index.getmtime(self.__full_path__(comps))
+
+    def getctime(self, *path):
+        comps = self.to_cpath_ccomps(*path)
+        return self.__file_index.getctime(self.__full_path__(comps))
 
     @staticmethod
     def join_comps(*comps):
@@ -295,6 +329,8 @@ class PathTree(object):
             else:
                 self.starting_comps = self.path_tree.to_path_comps(starting_comps)
 
+            if exclude_cpaths is None:
+                exclude_cpaths = ()
             for exclude_comps in exclude_cpaths:
                 assert type(exclude_comps) is tuple, f"exclude_cpaths must contain tuple of strings as path." \
                                                      f" {exclude_comps} found"
@@ -311,15 +347,8 @@ class PathTree(object):
             if depth is None:
                 self.depth = 2147483647
 
-            # exclude cpaths validation
-            _ = set()
-            if exclude_cpaths is None:
-                exclude_cpaths = set()
-            for exclude_cpath in exclude_cpaths:
-                assert self.path_tree.is_type_cpath(exclude_cpath)
-                _.add(exclude_cpath)
-            else:
-                self.exclude_cpaths = _
+            # exclude cpaths: kept as path comps so that they can be checked before a cpath is created
+            self.exclude_cpaths = frozenset(exclude_cpaths)
 
             # default configs
             _dc = self.path_tree.host.system_settings['configs']
@@ -336,58 +365,51 @@ class PathTree(object):
                     exclude_comps_tuples: *components* list that are excluded from listing
                     checker: callables that accepts parameters: __ContentPath2 instance.
                     """
+            file_index = self.path_tree.file_index
             absolute_root = self.path_tree.__full_path__(self.starting_comps)
-            assert self.path_tree.fs.exists(absolute_root), f"Absolute root must exist: {absolute_root}"
+            assert file_index.exists(absolute_root), f"Absolute root must exist: {absolute_root}"
 
-            # new
-            to_travel = deque([((*self.starting_comps, comp), 1) for comp in self.path_tree.fs.listdir(absolute_root)])
+            include_files = self.files_only in (True, None)
+            include_dirs = self.directories_only in (True, None)
+            ignore_files_sw = self.__ignore_files_sw if self.respect_settings else ()
+            ignore_dirs_sw = self.__ignore_dirs_sw if self.respect_settings else ()
+
+            # breadth first, one listing per directory: the type of every entry comes with the listing, ignored
+            # directories are never entered and cpaths are created only for the entries that pass the name filters.
+            to_travel = deque([(self.starting_comps, absolute_root, 1)])
             directories = []
             files = []
 
             while len(to_travel) != 0:
-                path_comps_n_depth = to_travel.popleft()
-                path_comps = path_comps_n_depth[0]
-                path_depth = path_comps_n_depth[1]
+                dir_comps, dir_abs, path_depth = to_travel.popleft()
                 if path_depth > self.depth:
                     break
-                path_base = path_comps[-1]
-                path_abs = self.path_tree.__full_path__(path_comps)
-
-                if self.path_tree.fs.is_file(path_abs) and (self.files_only in (True, None)):
-                    move_in = True
-                    path_obj = self.path_tree.create_cpath(path_comps, is_file=True)
-                    if self.checker is not None and not self.checker(path_obj):
-                        move_in = False
-
-                    elif self.respect_settings and path_base.startswith(self.__ignore_files_sw):
-                        move_in = False
-
-                    elif path_obj in self.exclude_cpaths:
-                        move_in = False
-
-                    if move_in:
+                for path_base, is_file, is_dir in file_index.entries(dir_abs):
+                    path_comps = (*dir_comps, path_base)
+                    if is_file and include_files:
+                        if ignore_files_sw and path_base.startswith(ignore_files_sw):
+                            continue
+                        if path_comps in self.exclude_cpaths:
+                            continue
+                        path_obj = self.path_tree.create_cpath(path_comps, is_file=True)
+                        if self.checker is not None and not self.checker(path_obj):
+                            continue
                         files.append(path_obj)
 
-                elif self.path_tree.fs.is_dir(path_abs) and (self.directories_only in (True, None)):
-                    path_obj = self.path_tree.create_cpath(path_comps, is_file=False)
-                    move_in = True
-                    if self.checker is not None and not self.checker(path_obj):
-                        move_in = False
-
-                    elif self.respect_settings and path_base.startswith(self.__ignore_dirs_sw):
-                        move_in = False
-
-                    elif path_obj in self.exclude_cpaths:
-                        move_in = False
-
-                    if move_in:
+                    elif is_dir and include_dirs:
+                        if ignore_dirs_sw and path_base.startswith(ignore_dirs_sw):
+                            continue
+                        if path_comps in self.exclude_cpaths:
+                            continue
+                        path_obj = self.path_tree.create_cpath(path_comps, is_file=False)
+                        if self.checker is not None and not self.checker(path_obj):
+                            continue
                         directories.append(path_obj)
                         # Recurse
-                        to_travel.extend(
-                            tuple([((*path_comps, comp), path_depth + 1) for comp in self.path_tree.fs.listdir(path_abs)]))
-                else:
-                    raise Exception(f"ContentPath is neither dir, nor file: {path_abs}. Files only: {self.files_only} "
-                                    f"Dirs only: {self.directories_only}. ")
+                        to_travel.append((path_comps, dir_abs + '/' + path_base, path_depth + 1))
+                    else:
+                        raise Exception(f"ContentPath is neither dir, nor file: {dir_abs + '/' + path_base}. "
+                                        f"Files only: {self.files_only} Dirs only: {self.directories_only}. ")
             return directories, files
 
     class __CPath:
@@ -397,9 +419,12 @@ class PathTree(object):
         1. Content Path will be indicated as cpath
         2. String Path will be indicated as path
         """
+        __slots__ = ('__path_tree', '__cpath_special_comps', '__site', '__is_file', '__path_comps')
+
         def __init__(self, path_tree, site, cpath_special_comps, is_file=True):
             self.__path_tree = path_tree
-            self.__cpath_special_comps = cpath_special_comps
+            # the same dir names come up in the cpaths of all the files under them
+            self.__cpath_special_comps = tuple(sys.intern(comp) for comp in cpath_special_comps)
             self.__site = site
             self.__is_file = is_file
             if is_file:
@@ -533,16 +558,20 @@ class PathTree(object):
             return dirs
 
         def exists(self):
-            """Real time checking"""
+            """Checked against the file index of the path tree"""
             return self.__path_tree.exists(self.__cpath_special_comps)
 
         def open(self, mode, *args, **kwargs):
             assert self.is_file, 'Cannot call open() on a directory: %s' % self.relative_path
             return self.__path_tree.open(self.__cpath_special_comps, mode, *args, **kwargs)
 
-        def makedirs(self):
+        def makedirs(self, exist_ok=False):
             assert self.is_dir
-            return self.__path_tree.fs.makedirs(self.abs_path)
+            return self.__path_tree.makedirs(self.__cpath_special_comps, exist_ok=exist_ok)
+
+        def remove(self):
+            assert self.is_file
+            return self.__path_tree.remove(self.__cpath_special_comps)
 
         def write_text(self, text):
             assert isinstance(text, str)
@@ -641,10 +670,10 @@ class PathTree(object):
             return False
 
         def getmtime(self):
-            return self.__path_tree.fs.getmtime(self.abs_path)
+            return self.__path_tree.getmtime(self.__cpath_special_comps)
 
         def getctime(self):
-            return self.__path_tree.fs.getctime(self.abs_path)
+            return self.__path_tree.getctime(self.__cpath_special_comps)
 
         @property
         def id(self):
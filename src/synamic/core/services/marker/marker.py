@@ -8,6 +8,8 @@ separator_comma_pat = re.compile(r',[^,]?')
 
 
 class _Mark:
+    __slots__ = ('__parent', '__site', '__mark_map', '__marker', '__content', '__synthetic_cfields')
+
     def __init__(self, parent, site, mark_map, marker):
         if mark_map.get('title', None) is None:
             root, path = self._root_path
@@ -119,14 +121,14 @@ class _Mark:
         template_service = site.get_service('templates')
         user_template_name = site_settings['templates.mark']
 
-        html_text_content = template_service.render(
+        html_text_chunks = template_service.generate(
             user_template_name,
             site=site,
             content=gen_content,
             mark=self,
             marker=self.__marker
         )
-        return html_text_content
+        return html_text_chunks
 
     @property
     def content(self):
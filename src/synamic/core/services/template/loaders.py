@@ -1,4 +1,5 @@
 import re
+import hashlib
 from jinja2 import BaseLoader, TemplateNotFound
 from synamic.exceptions import SynamicSiteNotFound
 
@@ -12,17 +13,80 @@ template_name_pat = re.compile(
 # sync ~ in pattern system_settings['configs.site_id_sep']
 
 
+class CompiledTemplateStore:
+    """Compiled code of the templates shared by the template environments of all the sites of the process, so that a
+    parent site template that child sites inherit is compiled once and not once per site. The environments of the
+    sites are made alike (see SynamicTemplateService.load()), so the code is the same for all of them; a Template
+    object is still made from it for every environment with its own globals.
+
+    Code is kept by the abs path of the template file and the name it was asked with (the name is compiled into the
+    code) along with the hash of the source it was compiled from - a changed source replaces it.
+    """
+    def __init__(self):
+        self.__codes = {}
+
+    def get(self, filename, name, source_hash):
+        entry = self.__codes.get((filename, name), None)
+        if entry is None or entry[0] != source_hash:
+            return None
+        return entry[1]
+
+    def set(self, filename, name, source_hash, code):
+        self.__codes[(filename, name)] = source_hash, code
+
+    def clear(self):
+        self.__codes.clear()
+
+
+compiled_templates = CompiledTemplateStore()
+
+
 class SynamicJinjaFileSystemLoader(BaseLoader):
     def __init__(self, site):
         self.__site = site
+        # (template name, default theme id) ->
+        #     (template cfile, abs paths looked at before it, ((abs path of a dir looked in, its listing token), ...))
+        self.__template_cfiles = {}
 
     def get_template_cfile(self, template_name):
+        return self.__resolve(template_name)[0]
+
+    def get_shadowing_paths(self, template_name):
+        """Abs paths that were looked at for the template before the file it resolved to and did not exist: a template
+        created at one of them (e.g. in the theme of a child site) would be used instead."""
+        return self.__resolve(template_name)[1]
+
+    def __resolve(self, template_name, refresh_dirs=False):
+        """The resolved cfile is remembered with the dirs that were looked in for it. It is resolved again only when
+        the entries of one of those dirs were invalidated in the file index, i.e. a template may have been added or
+        removed there. refresh_dirs: check the mtimes of those dirs first (see FileIndex.refresh_dir()), for when
+        templates are checked for changes made behind the back of the path tree."""
+        default_theme_id = self.__site.settings.get('themes.default', None)
+        memo_key = template_name, default_theme_id
+        file_index = self.__site.path_tree.file_index
+        memo = self.__template_cfiles.get(memo_key, None)
+        if memo is not None:
+            if refresh_dirs:
+                for abs_dir, _ in memo[2]:
+                    file_index.refresh_dir(abs_dir)
+            if all(file_index.listing_token(abs_dir) is token for abs_dir, token in memo[2]):
+                return memo
+
+        looked_in_cfiles = []
+        template_cfile = self.__find_template_cfile(template_name, default_theme_id, looked_in_cfiles)
+        listing_tokens = []
+        for abs_dir in {cfile.parent_cpath.abs_path for cfile in looked_in_cfiles}:
+            listing_tokens.append((abs_dir, file_index.listing_token(abs_dir)))
+        shadowing_paths = tuple(cfile.abs_path for cfile in looked_in_cfiles[:-1])
+        memo = template_cfile, shadowing_paths, tuple(listing_tokens)
+        self.__template_cfiles[memo_key] = memo
+        return memo
+
+    def __find_template_cfile(self, template_name, default_theme_id, looked_in_cfiles):
         template = template_name
         system_settings = self.__site.synamic.system_settings
-        site_settings = self.__site.settings
 
         site_id_sep = system_settings['configs.site_id_sep']
-        default_theme_id = site_settings.get('themes.default', None)
 
         site = self.__site
 
@@ -60,10 +124,12 @@ class SynamicJinjaFileSystemLoader(BaseLoader):
             if default_theme_id:
                 default_template_cfile = template_cdir.join(default_theme_id, is_file=False).join(template_name,
                                                                                                   is_file=True)
+                looked_in_cfiles.append(default_template_cfile)
                 if default_template_cfile.exists():
                     template_cfile = default_template_cfile
                     found = True
                     break
+            looked_in_cfiles.append(template_cfile)
             if template_cfile.exists():
                 found = True
                 break
@@ -76,9 +142,38 @@ class SynamicJinjaFileSystemLoader(BaseLoader):
             )
         return template_cfile
 
+    def load(self, environment, name, globals=None):
+        """BaseLoader.load() that gets the code from the process wide compiled_templates first"""
+        if globals is None:
+            globals = {}
+        source, filename, uptodate = self.get_source(environment, name)
+        source_hash = hashlib.sha1(source.encode('utf-8')).hexdigest()
+        code = compiled_templates.get(filename, name, source_hash)
+        if code is None:
+            bcc = environment.bytecode_cache
+            if bcc is not None:
+                bucket = bcc.get_bucket(environment, name, filename, source)
+                code = bucket.code
+                if code is None:
+                    code = bucket.code = environment.compile(source, name, filename)
+                    bcc.set_bucket(bucket)
+            else:
+                code = environment.compile(source, name, filename)
+            compiled_templates.set(filename, name, source_hash, code)
+        return environment.template_class.from_code(environment, code, globals, uptodate)
+
     def get_source(self, environment, template):
-        template_cfile = self.get_template_cfile(template)
+        template_cfile = self.__resolve(template, refresh_dirs=environment.auto_reload)[0]
         with template_cfile.open('r', encoding='utf-8') as f:
             source = f.read()
         last_gmtime = template_cfile.getmtime()
-        return source, template_cfile.abs_path, lambda: template_cfile.getmtime() == last_gmtime
+        return source, template_cfile.abs_path, lambda: self.__is_up_to_date(template, template_cfile, last_gmtime)
+
+    def __is_up_to_date(self, template, template_cfile, last_gmtime):
+        try:
+            # a template added before it in the lookup (e.g. in the theme of a child site) is to be used instead
+            if self.__resolve(template, refresh_dirs=True)[0].abs_path != template_cfile.abs_path:
+                return False
+        except TemplateNotFound:
+            return False
+        return template_cfile.getmtime() == last_gmtime
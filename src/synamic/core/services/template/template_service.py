@@ -7,13 +7,61 @@
     email: "md.sabuj.sarker@gmail.com"
     status: "Development"
 """
+import os
+import hashlib
+import contextlib
 import jinja2
-from synamic.core.services.template.template_tags import GetCExtension, ResizeImageExtension
+from synamic.core.services.template.template_tags import GetCExtension, ResizeImageExtension, FragmentCacheExtension
 from synamic.core.standalones.functions.decorators import loaded, not_loaded
 from .loaders import SynamicJinjaFileSystemLoader
 from synamic.exceptions import SynamicTemplateError
 
 
+TEMPLATE_BYTECODE_DIR_NAME = 'templates'
+# Must be changed when the code that the template tags compile to changes, bytecode of other versions is not used.
+TEMPLATE_BYTECODE_VERSION = 2
+# characters of rendered text joined into one piece by generate()
+RENDER_CHUNK_SIZE = 16 * 1024
+
+
+class SynamicJinjaEnvironment(jinja2.Environment):
+    """Records the file of every template it hands out (including the ones of include, extends, import) in the
+    dependency graph, so that what is being rendered depends on them. The paths looked at before that file are
+    recorded too (as files that do not exist), so that a template added there that would be used instead is a change
+    as well."""
+    site_object = None
+
+    def get_template(self, name, parent=None, globals=None):
+        template = super().get_template(name, parent=parent, globals=globals)
+        self.__record_template(template)
+        return template
+
+    def select_template(self, names, parent=None, globals=None):
+        template = super().select_template(names, parent=parent, globals=globals)
+        self.__record_template(template)
+        return template
+
+    def __record_template(self, template):
+        if template.filename is not None and self.site_object is not None:
+            dependency_graph = self.site_object.object_manager.dependency_graph
+            dependency_graph.record(
+                dependency_graph.file_node(template.filename),
+                *(dependency_graph.file_node(path) for path in self.loader.get_shadowing_paths(template.name))
+            )
+
+
+class SynamicBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """Bytecode of the compiled templates of a site kept in the cache dir between runs. Jinja checks it against the
+    source of the template. It is written to a temporary file first, so that build workers never read one that is
+    half written."""
+    def dump_bytecode(self, bucket):
+        filename = self._get_cache_filename(bucket)
+        tmp_filename = f'{filename}.{os.getpid()}.tmp'
+        with open(tmp_filename, 'wb') as f:
+            bucket.write_bytecode(f)
+        os.replace(tmp_filename, filename)
+
+
 class SynamicTemplateService:
     def __init__(self, site):
         self.__is_loaded = False
@@ -35,14 +83,23 @@ class SynamicTemplateService:
     def get_template_cfile(self, template_name):
         return self.__template_loader.get_template_cfile(template_name)
 
+    def __make_bytecode_cache(self):
+        synamic = self.__site.synamic
+        cache_dir = synamic.system_settings['dirs.cache.cache']
+        site_key = hashlib.sha1(self.__site.abs_root_path.encode('utf-8')).hexdigest()
+        bytecode_cdir = synamic.path_tree.create_dir_cpath(f'{cache_dir}/{TEMPLATE_BYTECODE_DIR_NAME}/{site_key}')
+        bytecode_cdir.makedirs(exist_ok=True)
+        return SynamicBytecodeCache(bytecode_cdir.abs_path, f'%s.{TEMPLATE_BYTECODE_VERSION}.cache')
+
     @not_loaded
     def load(self):
         self.__template_loader = SynamicJinjaFileSystemLoader(self.__site)
 
-        self.__template_env = jinja2.Environment(
+        self.__template_env = SynamicJinjaEnvironment(
             loader=self.__template_loader,
             autoescape=jinja2.select_autoescape(['html', 'xml']),
-            extensions=[GetCExtension, ResizeImageExtension]
+            extensions=[GetCExtension, ResizeImageExtension, FragmentCacheExtension],
+            bytecode_cache=self.__make_bytecode_cache()
         )
         # setting config object to global of environment
         self.__template_env.site_object = self.__site
@@ -65,6 +122,23 @@ class SynamicTemplateService:
     def is_loaded(self):
         return self.__is_loaded
 
+    @contextlib.contextmanager
+    @loaded
+    def build_mode(self):
+        """Templates are not checked for changes inside the with block, so every template is compiled (or loaded from
+        the bytecode cache) once in a build and its file is not stat'ed again. The templates compiled before (e.g. by an
+        earlier build of the shell) are checked once here."""
+        template_env = self.__template_env
+        for cache_key, template in template_env.cache.items():
+            if not template.is_up_to_date:
+                del template_env.cache[cache_key]
+        auto_reload = template_env.auto_reload
+        template_env.auto_reload = False
+        try:
+            yield self
+        finally:
+            template_env.auto_reload = auto_reload
+
     # def exists(self, template_name):
     #     return True if os.path.exists(os.path.join(self.__site.template_dir, template_name)) else False
 
@@ -83,6 +157,47 @@ class SynamicTemplateService:
 
         return result
 
+    @loaded
+    def generate(self, template_name, context=None, **kwargs):
+        """Renders the template as it is iterated: returns an iterator of pieces of the rendered text of about
+        RENDER_CHUNK_SIZE characters, so that a big page can be written out without being held in memory as a whole.
+        A missing template raises here, errors in rendering are raised from the iteration."""
+        context = {} if context is None else context
+        context.update(kwargs)
+
+        try:
+            template = self.__template_env.get_template(template_name)
+        except jinja2.exceptions.TemplateError as e:
+            raise SynamicTemplateError(e)
+        return self.__generate(template, context)
+
+    @staticmethod
+    def __generate(template, context):
+        # jinja yields every bit of markup between two tags on its own
+        pieces = []
+        size = 0
+        try:
+            for text in template.generate(context):
+                if len(text) >= RENDER_CHUNK_SIZE:
+                    # e.g. the body of a content, sliced so that it is not encoded as a whole
+                    if pieces:
+                        yield ''.join(pieces)
+                        pieces.clear()
+                        size = 0
+                    for start in range(0, len(text), RENDER_CHUNK_SIZE):
+                        yield text[start:start + RENDER_CHUNK_SIZE]
+                    continue
+                pieces.append(text)
+                size += len(text)
+                if size >= RENDER_CHUNK_SIZE:
+                    yield ''.join(pieces)
+                    pieces.clear()
+                    size = 0
+        except jinja2.exceptions.TemplateError as e:
+            raise SynamicTemplateError(e)
+        if pieces:
+            yield ''.join(pieces)
+
 
 class Theme:
     def __init__(self, site, theme_id, theme_cdir, theme_info_syd):
@@ -62,3 +62,40 @@ class ResizeImageExtension(Extension):
     def _resize(self, path, width, height):
         cnt = self.environment.site_object.object_manager.resize_image(path, width, height)
         return cnt.curl.path_as_str
+
+
+class FragmentCacheExtension(Extension):
+    """{% cache "key", vary_on... %}...{% endcache %}
+
+    The body is rendered once for the key and the vary_on values in a build (or since the last reload of the dev
+    server) and the same text is used everywhere else it is asked for in the site, e.g. for menus, sidebars and footers
+    that are the same on every page. Values that make the body render differently (e.g. the current content) must be
+    in vary_on. Outside of a build, where templates are checked for changes, it is rendered again when a template it
+    used changed."""
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(
+            site_object=None
+        )
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        call = self.call_method('_cache', [nodes.Const(parser.filename), nodes.List(args)], lineno=lineno)
+        return nodes.CallBlock(call, [], [], body, lineno=lineno)
+
+    def _cache(self, filename, key, caller):
+        object_manager = self.environment.site_object.object_manager
+
+        def render():
+            if filename is not None:
+                # the body is in this template: the fragment depends on it as much as on the templates it includes
+                dependency_graph = object_manager.dependency_graph
+                dependency_graph.record(dependency_graph.file_node(filename))
+            return caller()
+        return object_manager.get_fragment(tuple(key), render, check_files=self.environment.auto_reload)
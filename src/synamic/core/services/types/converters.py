@@ -134,10 +134,12 @@ class ConverterCallableListCompareMixin(ConverterCallable):
             assert op in ('in', '!in')
             assert isinstance(left_value, (list, tuple)), '%s : %s' % (str(type(left_value)), str(left_value))
             assert isinstance(right_value, (list, tuple)), '%s : %s' % (str(type(right_value)), str(right_value))
+            all_in = True
             for single_value in left_value:
                 if single_value not in right_value:
-                    return False
-            return True
+                    all_in = False
+                    break
+            return all_in if op == 'in' else not all_in
 
 
 @_add_converter_type('number')
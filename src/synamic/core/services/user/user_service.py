@@ -115,13 +115,13 @@ class UserService:
             template_service = site.get_service('templates')
             user_template_name = site_settings['templates.user']
 
-            html_text_content = template_service.render(
+            html_text_chunks = template_service.generate(
                 user_template_name,
                 site=site,
                 content=gen_content,
                 author=self,
             )
-            return html_text_content
+            return html_text_chunks
 
         @property
         def content(self):
@@ -106,6 +106,8 @@ class SynamicBaseRenderer(mistune.Renderer):
         if not include_cfile.exists():
             return original_text
 
+        dependency_graph = self._site.object_manager.dependency_graph
+        dependency_graph.record(dependency_graph.file_node(include_cfile))
         if include_cfile.extension.lower() in self._site.synamic.system_settings['configs.marked_extensions']:
             assert include_cfile.basename.startswith(
                 self._site.synamic.system_settings['configs.ignore_files_sw'].as_tuple
@@ -2,6 +2,7 @@
 Synamic Data Classes
 """
 import re
+import sys
 import enum
 import collections
 import datetime
@@ -41,7 +42,16 @@ for syd_type, py_types in syd_to_py_types.items():
         py_to_syd_types[py_type] = syd_type
 
 
+def _intern_key(key):
+    """The same keys come up in the front matter of every content, one string is kept for all of them"""
+    if type(key) is str:
+        return sys.intern(key)
+    return key
+
+
 class _SydData:
+    __slots__ = ()
+
     @property
     def key(self):
         raise NotImplemented
@@ -67,8 +77,18 @@ class _SydData:
     def converter(self):
         raise NotImplemented
 
+    @property
+    def is_shared(self):
+        raise NotImplementedError
+
+    def syd_mark_shared(self):
+        raise NotImplementedError
+
 
 class SydData(_SydData):  # Previously SydScalar.
+    __slots__ = ('__key', '__value', '__datatype', '__converter', '__converted_value', '__parent_container',
+                 '__is_shared', '__cached_interpolated_str')
+
     def __init__(self, key, value, datatype=None, parent_container=None, converter=None, converted_value=None):
         if key is not None:
             assert '.' not in key, f'Key {key} is invalid where value is {value}'
@@ -78,12 +98,14 @@ class SydData(_SydData):  # Previously SydScalar.
         assert value is not None, 'None is not allowed'
         assert not isinstance(value, (list, tuple, dict)), \
             'Scalar value cannot be of instance of list, tuple or dict. Use SydContainer for them.'
-        self.__key = key
+        self.__key = _intern_key(key)
         self.__value = value
         self.__datatype = datatype
         self.__converter = converter
         self.__converted_value = converted_value
         self.__parent_container = None
+        # referenced by more than one container, see SydContainer
+        self.__is_shared = False
 
         self.__cached_interpolated_str = None
         self.syd_set_parent(parent_container)
@@ -116,6 +138,13 @@ class SydData(_SydData):  # Previously SydScalar.
     def value_origin(self):
         return self.__value
 
+    @property
+    def is_shared(self):
+        return self.__is_shared
+
+    def syd_mark_shared(self):
+        self.__is_shared = True
+
     def set_converted(self, value):
         assert value is not None
         self.__converted_value = value
@@ -173,10 +202,18 @@ class SydData(_SydData):  # Previously SydScalar.
 
 
 class SydContainer(_SydData):
+    """Containers are copy on write: clone(), new() and merged_new() share the children (and the lists of them) with
+    the containers they are made from instead of copying the whole tree. Adding, setting, updating or deleting through
+    a container copies only the lists of that container and the children on the path to the changed one. Children
+    handed out (get_child(), get(), values() etc.) are copied the same way first where they are shared, so changing
+    them in place never shows through in another container."""
+    __slots__ = ('__key', '__is_list', '__data_list', '__data_list_index_map', '__parent_container', '__converter',
+                 '__converted_value', '__read_only', '__is_data_shared', '__owned_children', '__is_shared')
+
     def __init__(self, key=None, initial_data=(), is_list=False, parent_container=None, converter=None, converted_value=None, read_only=False):
         if key is not None:
             assert '.' not in key
-        self.__key = key
+        self.__key = _intern_key(key)
         self.__is_list = is_list
         self.__data_list = []
         self.__data_list_index_map = {}
@@ -184,6 +221,12 @@ class SydContainer(_SydData):
         self.__converter = converter
         self.__converted_value = converted_value
         self.__read_only = read_only
+        # data list and index map are shared with clones of this container till one of them changes them
+        self.__is_data_shared = False
+        # children created for this container only - the others may be referenced by other containers too
+        self.__owned_children = set()
+        # referenced by more than one container
+        self.__is_shared = False
 
         self.syd_set_parent(parent_container)
 
@@ -207,8 +250,11 @@ class SydContainer(_SydData):
             converted_value=converted_value,
             read_only=read_only
         )
-        for data in self.__data_list:
-            cln.add(data.clone())
+        # children are shared, the first change to either of the containers copies the lists
+        cln.__data_list = self.__data_list
+        cln.__data_list_index_map = self.__data_list_index_map
+        cln.__is_data_shared = True
+        self.__is_data_shared = True
         return cln
     copy = clone
 
@@ -217,16 +263,16 @@ class SydContainer(_SydData):
         self_clone = self.clone()
         for other in others:
             assert not other.is_list, 'Cannot create new with list, need block'
-            for idx, o_c in enumerate(other.clone_children()):
+            for idx, o_c in enumerate(tuple(other.__data_list)):
                 if self_clone.is_list:
                     key = idx
-                    self_clone.add(o_c)
+                    self_clone.__add_shared(o_c)
                 else:
                     key = o_c.key
                     if key in self_clone:
-                        self_clone.update(key, o_c)
+                        self_clone.__update_shared(key, o_c)
                     else:
-                        self_clone.add(o_c)
+                        self_clone.__add_shared(o_c)
         return self_clone
 
     def merged_new(self, *other_containers):
@@ -238,28 +284,124 @@ class SydContainer(_SydData):
                 old_data = new_container.get_child(key, error_out=False)
 
                 if old_data is None:
-                    new_container.add(other_data.clone())
+                    new_container.__add_shared(other_data)
                 else:
                     if isinstance(old_data, SydData):
                         assert isinstance(other_data, SydData)
-                        new_container.update(key, other_data.clone())
+                        new_container.__update_shared(key, other_data)
                     else:
                         assert isinstance(other_data, SydContainer) and isinstance(old_data, SydContainer)
                         merged_children = old_data.merged_new(other_data)
                         new_container.add(merged_children)
         return new_container
 
+    # copy on write
+    @property
+    def is_shared(self):
+        return self.__is_shared
+
+    def syd_mark_shared(self):
+        self.__is_shared = True
+
+    def __own_data(self):
+        """Copies the data list and the index map if they are shared with a clone"""
+        if self.__is_data_shared:
+            self.__data_list = list(self.__data_list)
+            self.__data_list_index_map = {key: list(idxs) for key, idxs in self.__data_list_index_map.items()}
+            # the clone references the children too
+            self.__owned_children = set()
+            self.__is_data_shared = False
+
+    def __own_child(self, idx):
+        """Returns the child at idx that can be changed in place, it is copied first if it may be referenced by other
+        containers"""
+        self.__own_data()
+        child = self.__data_list[idx]
+        if child not in self.__owned_children or child.is_shared:
+            self.__owned_children.discard(child)
+            if child.is_container:
+                # the children of a locked container stay locked
+                child = child.clone(parent_container=self, read_only=self.__read_only)
+            else:
+                child = child.clone(parent_container=self)
+            self.__data_list[idx] = child
+            self.__owned_children.add(child)
+        return child
+
+    def __indices_of(self, key):
+        key = int(key) if type(key) is str and key.isdigit() else key
+        if type(key) is int:
+            return [key]
+        return self.__data_list_index_map[key]
+
+    def __owned_container_at(self, keys):
+        """Container that get_child(keys) finds, the containers on the path to it are copied where they are shared"""
+        cont = self
+        for key in keys:
+            cont = cont.__own_child(cont.__indices_of(key)[-1])
+        return cont
+
+    def __owned_children_at(self, key):
+        """Children that get_child(key, multi=True) finds, copied first (with the path to them) where they are
+        shared"""
+        # errors out for missing keys as get_child() does
+        self.__find_child(key, multi=True)
+        key = int(key) if type(key) is str and key.isdigit() else key
+        if type(key) is int:
+            return [self.__own_child(key)]
+        keys = key if isinstance(key, (list, tuple)) else key.split('.')
+        cont = self.__owned_container_at(keys[:-1])
+        return [cont.__own_child(idx) for idx in tuple(cont.__indices_of(keys[-1]))]
+
+    def __add_shared(self, syd):
+        """Adds a child of another container without copying it"""
+        assert not self.__read_only
+        self.__own_data()
+        syd.syd_mark_shared()
+        self.__data_list.append(syd)
+        if not self.is_list:
+            self.__data_list_index_map.setdefault(syd.key, []).append(len(self.__data_list) - 1)
+
+    def __update_shared(self, key, syd):
+        """Replaces the last child with the key with a child of another container without copying it"""
+        self.__own_data()
+        syd.syd_mark_shared()
+        idx = self.__indices_of(key)[-1]
+        self.__owned_children.discard(self.__data_list[idx])
+        self.__data_list[idx] = syd
+
     @property
     def is_root(self):
         return self.__parent_container is None or self.__key in ('__root__', None)
 
+    def __handed_out(self, idx):
+        """Child at idx to give out of the container, containers are copied first where they are shared - scalars are
+        only read from"""
+        child = self.__data_list[idx]
+        if child.is_container:
+            child = self.__own_child(idx)
+        return child
+
     def get_children(self):
-        return tuple(self.__data_list)
+        return tuple(self.__own_child(idx) for idx in range(len(self.__data_list)))
 
     def clone_children(self):
-        return tuple(e.clone() for e in self.get_children())
+        return tuple(e.clone() for e in self.__data_list)
 
     def get_child(self, key, multi=False, error_out=True):
+        found = self.__find_child(key, multi=multi, error_out=error_out)
+        if found is None:
+            return None
+        # the found children are copied with the path to them where they are shared, they may be changed in place
+        key = int(key) if type(key) is str and key.isdigit() else key
+        if multi:
+            return self.__owned_children_at(key)
+        if type(key) is int:
+            return self.__own_child(key)
+        return self.__owned_container_at(key if isinstance(key, (list, tuple)) else key.split('.'))
+
+    def __find_child(self, key, multi=False, error_out=True):
+        """Finds the child as get_child() does, without copying the shared ones - only to read from"""
         assert isinstance(key, (int, str, list, tuple)), \
             f'Only integer and string keys are accepted, you provided key of type: {type(key)}'
         key = int(key) if type(key) is str and key.isdigit() else key
@@ -294,7 +436,7 @@ class SydContainer(_SydData):
                         if not syds[-1].is_container:
                             # print('Found value is not a block - it is a scalar')
                             raise KeyError('Found value is not a block - it is a scalar')
-                    _ = syds[-1].get_child(_key, multi=multi)
+                    _ = syds[-1].__find_child(_key, multi=multi)
 
                     if multi:
                         syds = _
@@ -314,7 +456,10 @@ class SydContainer(_SydData):
 
     def get(self, key, default=None, multi=False):
         try:
-            value = self.get_child(key, multi=multi)
+            value = self.__find_child(key, multi=multi)
+            # the value of a container is the container itself
+            if any(syd.is_container for syd in (value if multi else (value, ))):
+                value = self.get_child(key, multi=multi)
             if not multi:
                 value = value.value
             else:
@@ -355,15 +500,16 @@ class SydContainer(_SydData):
     def values(self):
         """Values are not converted!!!"""
         l = list()
-        for e in self.__data_list:
-            value = e.value
+        for idx in range(len(self.__data_list)):
+            value = self.__handed_out(idx).value
             l.append(value)
         return tuple(l)
 
     def items(self):
         """Values are not converted!!!"""
         l = []
-        for i, e in enumerate(self.__data_list):
+        for i in range(len(self.__data_list)):
+            e = self.__handed_out(i)
             value = e.value
             if self.is_list:
                 l.append((i, value))
@@ -408,6 +554,7 @@ class SydContainer(_SydData):
 
         # adding the value to the container.
         assert isinstance(syd, _SydData)
+        self.__own_data()
         self.__data_list.append(syd)
         if not self.is_list:
             idx = len(self.__data_list) - 1
@@ -420,6 +567,8 @@ class SydContainer(_SydData):
             # data_l.append((idx, syd)), now only one source of truth against two before - previously: data list, map
             data_l.append(idx)
         syd.syd_set_parent(parent_container)
+        if parent_container is self:
+            self.__owned_children.add(syd)
 
     @staticmethod
     def __create_container_from_vector(key, vector):
@@ -443,7 +592,7 @@ class SydContainer(_SydData):
         assert not self.__read_only
         assert not isinstance(py_value, _SydData)
         try:
-            syds = self.get_child(key, multi=True)
+            syds = self.__owned_children_at(key)
             for syd in syds:
                 syd.set_converted(py_value)
         except KeyError:
@@ -454,6 +603,8 @@ class SydContainer(_SydData):
         assert key_idx is not None
         if isinstance(key_idx, int):
             assert syd_data.key is None
+            self.__own_data()
+            self.__owned_children.discard(self.__data_list[key_idx])
             self.__data_list[key_idx] = syd_data
             return
 
@@ -464,14 +615,18 @@ class SydContainer(_SydData):
 
         if len(keys) == 1:
             key_idx = keys[0]
+            self.__own_data()
             indices = self.__data_list_index_map[key_idx]
             idx = indices[-1]
+            self.__owned_children.discard(self.__data_list[idx])
             self.__data_list[idx] = syd_data
             syd_data.syd_set_parent(self)
+            self.__owned_children.add(syd_data)
         else:
             parent_keys = keys[:-1]
             key_idx = keys[-1]
-            parent_syd = self.get_child(parent_keys)
+            self.get_child(parent_keys)
+            parent_syd = self.__owned_container_at(parent_keys)
             parent_syd.update(key_idx, syd_data)
 
     def __setitem__(self, key, value):
@@ -480,16 +635,18 @@ class SydContainer(_SydData):
 
     def lock(self):
         assert not self.__read_only
-        self.__read_only = True
-        for d in self.__data_list:
+        for idx, d in enumerate(self.__data_list):
             if isinstance(d, self.__class__):
-                d.lock()
+                self.__own_child(idx).lock()
+        self.__read_only = True
 
     # deleting
     def __remove_from_self(self, key):
         key = int(key) if type(key) is str and key.isdigit() else key
+        self.__own_data()
         if self.is_list:
             # list indexes are not cached in the map
+            self.__owned_children.discard(self.__data_list[key])
             del self.__data_list[key]
         else:
             indices = self.__data_list_index_map[key]
@@ -498,6 +655,7 @@ class SydContainer(_SydData):
             del self.__data_list_index_map[key]
             # delete from ordered list
             for idx in indices:
+                self.__owned_children.discard(self.__data_list[idx])
                 del self.__data_list[idx]
 
             # map
@@ -524,11 +682,8 @@ class SydContainer(_SydData):
             if len(keys) == 0:
                 cont = self
             else:
-                k = keys[0]
-                keys = keys[1:]
-                cont = self.get_child(k)
-                for k in keys:
-                    cont = cont._get_original(k)
+                self.get_child(keys)
+                cont = self.__owned_container_at(keys)
             cont.__remove_from_self(key2del)
         except (KeyError, IndexError):
             # raise
@@ -545,8 +700,7 @@ class SydContainer(_SydData):
             return res
         else:
             key = key_value
-            res = self.get(key, None)
-            return False if res is None else True
+            return self.__find_child(key, error_out=False) is not None
 
     def key_exists(self, key):
         return key in self
@@ -597,7 +751,7 @@ class SydContainer(_SydData):
         self.__converted_value = value
 
     def set_converter_for(self, key, converter):
-        syds = self.get_child(key, multi=True)
+        syds = self.__owned_children_at(key)
         for syd in syds:
             syd.set_converter(converter)
 
@@ -613,8 +767,8 @@ class SydContainer(_SydData):
     def as_tuple(self):
         assert self.is_list
         c = []
-        for d in self.__data_list:
-            c.append(d.value)
+        for idx in range(len(self.__data_list)):
+            c.append(self.__handed_out(idx).value)
         c = tuple(c)
         return c
 
@@ -622,7 +776,8 @@ class SydContainer(_SydData):
     def as_dict(self):
         assert not self.is_list
         c = collections.OrderedDict()
-        for d in self.__data_list:
+        for idx in range(len(self.__data_list)):
+            d = self.__handed_out(idx)
             c[d.key] = d.value
         return c
 
@@ -9,6 +9,7 @@
 """
 
 import re
+import sys
 import urllib.parse
 from typing import Union
 from synamic.core.contracts import CDocType
@@ -18,6 +19,8 @@ ext_pattern = re.compile(r'.+(\.[a-zA-Z0-9]{1,8})')
 
 
 class ContentUrl:
+    __slots__ = ('__site', '__for_cdoctype', '__url_path_comps', '__path_str', '__path_components_w_site', '__url_str')
+
     @classmethod
     def __str_path_to_comps(cls, path_str):
         comps = []
@@ -118,7 +121,7 @@ class ContentUrl:
         self.__site = site
         self.__for_cdoctype = for_cdoctype
         # remove space from both end of url (it happens to be only on left.)
-        self.__url_path_comps = self.path_to_ccomponents(url_path_comps)
+        self.__url_path_comps = tuple(sys.intern(comp) for comp in self.path_to_ccomponents(url_path_comps))
 
         self.__path_str = None
         self.__path_components_w_site = None
@@ -6,9 +6,11 @@ import os
 import sys
 import re
 import shutil
+import contextlib
 from collections import OrderedDict
 from synamic.core.synamic.sites._site import _Site
 from synamic.core.default_data._manager import DefaultDataManager
+from synamic.core.object_manager.build_manifest import BuildManifest
 from synamic.core.standalones.functions.decorators import loaded, not_loaded
 from synamic.exceptions import SynamicError, SynamicErrors
 
@@ -143,34 +145,60 @@ class Sites:
                     )
 
     @loaded
-    def build(self):
+    def build(self, jobs=None, full=False):
+        """jobs: number of worker processes to render contents with. None or 1 builds serially, 0 uses all cpus
+        full: ignore the build manifest of the last build and build everything from a clean output directory"""
+        with self.__synamic.path_tree.fs.stat_epoch('build'), contextlib.ExitStack() as template_modes:
+            for site in self.__sites_map.values():
+                template_modes.enter_context(site.get_service('templates').build_mode())
+            return self.__build(jobs, full)
+
+    def __build(self, jobs, full):
         try:
-            # clean output directory
+            manifest = BuildManifest(self.__synamic)
+            incremental = not full and manifest.load()
 
             output_dir = self.__synamic.system_settings['dirs.outputs.outputs']
             output_cdir = self.__synamic.path_tree.create_dir_cpath(output_dir)
             if not output_cdir.exists():
                 output_cdir.makedirs()
             output_abs_path = output_cdir.abs_path
-            except_root_paths = ('.git', '.gitignore', '.gitattributes')
-            print(f'Removing paths from {output_abs_path} with some exceptions to {except_root_paths}')
-            for o_basename in os.listdir(output_abs_path):
-                full_path = os.path.join(output_abs_path, o_basename)
-                if o_basename not in except_root_paths and not o_basename.startswith('.'):
-                    print(f'Removing {full_path}')
-                    if os.path.isfile(full_path):
-                        os.remove(full_path)
-                    else:
-                        shutil.rmtree(full_path)
+            if incremental:
+                print(f'Building incrementally into {output_abs_path} (use full build to rebuild everything)')
+            else:
+                # clean output directory
+                manifest.delete()
+                except_root_paths = ('.git', '.gitignore', '.gitattributes')
+                print(f'Removing paths from {output_abs_path} with some exceptions to {except_root_paths}')
+                for o_basename in os.listdir(output_abs_path):
+                    full_path = os.path.join(output_abs_path, o_basename)
+                    if o_basename not in except_root_paths and not o_basename.startswith('.'):
+                        print(f'Removing {full_path}')
+                        if os.path.isfile(full_path):
+                            os.remove(full_path)
+                        else:
+                            shutil.rmtree(full_path)
+                self.__synamic.path_tree.rescan()
 
             # build sites
             build_succeeded = True
+            for site in self.__sites_map.values():
+                # fragments of {% cache %} are rendered again in every build
+                site.object_manager.clear_fragments()
             for site_id, site in self.__sites_map.items():
                 print(f'>>> Building Site: {site_id}\n\n')
-                build_succeeded = site.object_manager.build()
+                build_succeeded = site.object_manager.build(jobs=jobs, manifest=manifest)
                 if not build_succeeded:
                     build_succeeded = False
                     break
+
+            # outputs may have been written by build workers
+            self.__synamic.path_tree.rescan()
+            if build_succeeded:
+                manifest.remove_stale_outputs()
+                manifest.save()
+                stats = manifest.stats
+                print(f'Written {stats["built"]} outputs, {stats["skipped"]} outputs were up to date')
         except SynamicError as e:
             e = SynamicErrors(
                 f'Error building sites:',
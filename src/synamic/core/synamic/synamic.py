@@ -27,7 +27,7 @@ class Synamic(SynamicContract):
         self.__root_site_root = root_site_root
 
         # Default Config Manager
-        self.__default_data = DefaultDataManager()
+        self.__default_data = DefaultDataManager(os.path.abspath(root_site_root))
 
         # Object Manager
         self.__object_manager = ObjectManager(self)
@@ -41,7 +41,9 @@ class Synamic(SynamicContract):
 
         # env
         self.__env = {
-            'backend': 'file'
+            'backend': 'file',
+            # worker processes for parsing front matters during load, see load()
+            'load_jobs': None,
         }
 
         # dev server param
@@ -58,9 +60,13 @@ class Synamic(SynamicContract):
         return self.__is_loaded
 
     @not_loaded
-    def load(self):
-        self.__sites.load()  # TODO: sites should be loaded individually.
-        self.__upload_manager.load()
+    def load(self, jobs=None):
+        """jobs: number of worker processes to parse front matters with. None or 1 loads serially, 0 uses all cpus"""
+        self.__env['load_jobs'] = jobs
+        with self.__path_tree.fs.stat_epoch('load'):
+            self.__sites.load()  # TODO: sites should be loaded individually.
+            self.__upload_manager.load()
+            self.__object_manager.front_matter_cache.save()
         self.__is_loaded = True
 
     @property
@@ -3,6 +3,32 @@ from aiohttp import web
 from synamic.exceptions import SynamicError
 
 
+def error_text(path_qs, e):
+    return f"Synamic Error occured when requesting url: {path_qs}\n"\
+           f"Error Details:\n{e.message}"
+
+
+async def stream_content(request, path_qs, content, mimetype):
+    """Sends the text content while it is being rendered"""
+    chunks = content.iter_chunks()
+    # the first piece is rendered before the response is started, so that the common errors (e.g. a missing template)
+    # are still answered with an error response.
+    first_chunk = next(chunks, b'')
+    response = web.StreamResponse()
+    response.content_type = mimetype
+    response.charset = 'utf-8'
+    await response.prepare(request)
+    try:
+        await response.write(first_chunk)
+        for chunk in chunks:
+            await response.write(chunk)
+    except SynamicError as e:
+        # the status is sent already
+        await response.write(('\n' + error_text(path_qs, e)).encode('utf-8'))
+    await response.write_eof()
+    return response
+
+
 async def synamic_handler(request):
     synamic = request.app.synamic
     path_qs = f"{request.path}{'?' + request.query_string if request.query_string else ''}"
@@ -29,15 +55,11 @@ async def synamic_handler(request):
                 response = web.Response(body=data, content_type=mimetype)
             else:
                 # text content.
-                with content.get_stream() as s:
-                    data = s.read()
-                text = data.decode('utf-8')
-                response = web.Response(text=text, content_type=mimetype)
+                response = await stream_content(request, path_qs, content, mimetype)
         return response
 
     except SynamicError as e:
-        text = f"Synamic Error occured when requesting url: {path_qs}\n"\
-               f"Error Details:\n{e.message}"
+        text = error_text(path_qs, e)
         mimetype = 'text/plain'
         response = web.Response(text=text, content_type=mimetype)
         return response
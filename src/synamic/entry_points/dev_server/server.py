@@ -75,14 +75,8 @@ class SynamicDevServerRequestHandler(http.server.BaseHTTPRequestHandler):
         if cont is not None:
             self.send_response(200, message="OK")
             self.end_headers()
-            stream = cont.get_stream()
-            while True:
-                byts = stream.read(60*1024)
-                if not byts:
-                    break
-                else:
-                    self.wfile.write(byts)
-            stream.close()
+            for byts in cont.iter_chunks():
+                self.wfile.write(byts)
         else:
             self.send_response(404, message="Not FounD")
             self.end_headers()
@@ -56,11 +56,28 @@ class CommandProcessor(BaseShell):
             s.load()
 
     def on_build(self, *args):
-        'Build Synamic project that will result in static site'
+        'Build Synamic project that will result in static site. Usage: build [--jobs N | -j N] (N=0 for all cpus) [--full]'
+        jobs = None
+        full = False
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg == '--full':
+                full = True
+            elif arg in ('--jobs', '-j'):
+                if not args or not args[0].isdigit():
+                    self.print_error(f'{arg} requires the number of jobs')
+                    return 1
+                jobs = int(args.pop(0))
+            elif arg.startswith('--jobs=') and arg[len('--jobs='):].isdigit():
+                jobs = int(arg[len('--jobs='):])
+            else:
+                self.print_error(f'Unknown build argument {arg}')
+                return 1
         o = self.get_or_create_synamic()
         if not o.is_loaded:
-            o.load()
-        return o.sites.build()
+            o.load(jobs=jobs)
+        return o.sites.build(jobs=jobs, full=full)
 
     def on_reset(self):
         self.__synamic_object = None
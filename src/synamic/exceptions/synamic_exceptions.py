@@ -20,7 +20,7 @@ __all__ = [
     'SynamicInvalidNumberFormat', 'SynamicModelParsingError', 'SynamicInvalidDateTimeFormat',
     'SynamicSettingsError', 'SynamicInvalidCPathComponentError', 'SynamicPathDoesNotExistError',
     'SynamicSydParseError', 'SynamicFSError', 'SynamicDataError', 'SynamicMarkerIsNotPublic', 'SynamicSiteNotFound',
-    'SynamicUserNotFound',
+    'SynamicUserNotFound', 'SynamicBuildWorkerError', 'SynamicLoadWorkerError',
 ]
 
 
@@ -208,6 +208,15 @@ class SynamicUserNotFound(SynamicError):
     """User not found"""
 
 
+class SynamicBuildWorkerError(SynamicError):
+    """Error raised inside a build worker process and carried back to the parent as text"""
+
+
+class SynamicLoadWorkerError(SynamicError):
+    """Error raised inside a load worker process (e.g. parsing a front matter) and carried back to the parent as
+    text"""
+
+
 class LogicalError(SynamicError):
     pass
 
@@ -0,0 +1,288 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+
+A small blog project written into a directory for the tests, and helpers to load and build it.
+
+Only one Synamic can be loaded in a process (the event system and the site ids are process wide), so every load or build
+of a project runs in a forked child process with run_in_process().
+"""
+import io
+import os
+import random
+import datetime
+import traceback
+import contextlib
+import multiprocessing
+
+
+CAN_FORK = 'fork' in multiprocessing.get_all_start_methods()
+
+TAGS = ('Marketing', 'Design', 'Programming', 'Career')
+CATEGORIES = ('Programming', 'Web Design', 'Career')
+
+_SETTINGS_SYD = """templates: {
+    mark: mark.html
+    user: user.html
+}
+pagination: {
+    per_page: 3
+}
+"""
+
+_TYPE_SYD = """title: Type
+type: single
+is_public: 0
+marks: [
+    {
+        title: Post
+        id: post
+    }
+    {
+        title: Page
+        id: page
+    }
+]
+"""
+
+_TAGS_SYD = """title: Tags
+type: multiple
+slug: topic
+marks: [
+    {
+        title: Marketing
+        id: marketing
+    }
+    {
+        title: Design
+        id: design
+    }
+    {
+        title: Programming
+        id: programming
+    }
+    {
+        title: Career
+    }
+]
+"""
+
+_CATEGORIES_SYD = """title: Categories
+type: hierarchical
+marks: [
+    {
+        title: Programming
+        id: programming
+    }
+    {
+        title: Web Design
+        id: web-design
+    }
+    {
+        title: Career
+    }
+]
+"""
+
+_USER_SYD = """name: User One
+title: User One's Profile
+"""
+
+_MENU_SYD = """menus [
+    {
+        title: Welcome Home
+        link: url://id:home
+    }
+    {
+        title: External Link
+        link: https://example.com
+    }
+]
+"""
+
+_DEFAULT_HTML = """<!doctype html>
+<html>
+    <head> <title> {{ content.title }} </title> </head>
+    <body>
+        {% include "sidebar.html" %}
+        {{ content.body.as_markup }}
+        {% if content.pagination %}{% for c in content.pagination.contents %}<li>{{ c.title }}</li>{% endfor %}{% endif %}
+        {% for m in site.menu.primary %}{{ m.title }}{% endfor %}
+    </body>
+</html>
+"""
+
+_SIDEBAR_HTML = """<ul>{% for c in site.object_manager.query_contents('type == post :sortby created_on desc :limit 5') %}\
+<li>{{ c.title }}</li>{% endfor %}</ul>
+"""
+
+_MARK_HTML = """<html><body><h1>{{ mark.title }}</h1>{% for c in mark.contents %}\
+<a href="{{ c.curl.url }}">{{ c.title }}</a>{% endfor %}</body></html>
+"""
+
+_USER_HTML = """<html><body><h1>{{ author.name }}</h1>{% for c in author.contents %}\
+<a href="{{ c.curl.url }}">{{ c.title }}</a>{% endfor %}</body></html>
+"""
+
+_HOME_MD = """---
+title: Welcome
+path: /
+id: home
+created_on: 2017-12-01 10:00:00
+updated_on: 2017-12-01 10:00:00
+---
+# Welcome
+"""
+
+_BLOG_MD = """---
+title: Blog
+type: page
+path: blog
+created_on: 2017-12-02 10:00:00
+updated_on: 2017-12-02 10:00:00
+pagination: {
+    query: type == post :sortby created_on desc
+}
+---
+Blog listing
+"""
+
+
+def make_posts(n_posts, seed=1):
+    """Returns the front matters of n_posts blog posts as dicts, the same ones for the same seed.
+
+    Dates are set and distinct, so that outputs and sort orders do not depend on file times.
+
+    A post without tags, categories or rating does not have that field at all, type is post when it is not set."""
+    rnd = random.Random(seed)
+    days = rnd.sample(range(700), n_posts)
+    posts = []
+    for idx, day in enumerate(days, start=1):
+        post = {
+            'title': f'Post {idx}',
+            'slug': f'post-{idx}',
+            'created_on': datetime.datetime(2018, 1, 1, 10) + datetime.timedelta(days=day),
+        }
+        post['updated_on'] = post['created_on'] + datetime.timedelta(minutes=idx)
+        tags = rnd.sample(TAGS, rnd.randint(0, 3))
+        if tags:
+            post['tags'] = tuple(tags)
+        if rnd.random() < 0.7:
+            post['categories'] = (rnd.choice(CATEGORIES),)
+        if rnd.random() < 0.3:
+            post['type'] = 'page'
+        if rnd.random() < 0.7:
+            post['rating'] = rnd.randint(1, 5)
+        posts.append(post)
+    return posts
+
+
+def post_text(post, body=''):
+    lines = ['---']
+    for key, value in post.items():
+        if isinstance(value, tuple):
+            value = ', '.join(value)
+        elif isinstance(value, datetime.datetime):
+            value = value.strftime('%Y-%m-%d %H:%M:%S')
+        lines.append(f'{key}: {value}')
+    lines.append('author: user1')
+    lines.append('---')
+    lines.append('')
+    lines.append(f'# {post["title"]}')
+    lines.append('')
+    lines.append(body or f'Hello **world** from {post["title"]}. [home](getc://id:home)')
+    return '\n'.join(lines) + '\n'
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _write_site(site_root, posts):
+    write_file(os.path.join(site_root, 'metas', 'markers', 'type.syd'), _TYPE_SYD)
+    write_file(os.path.join(site_root, 'metas', 'markers', 'tags.syd'), _TAGS_SYD)
+    write_file(os.path.join(site_root, 'metas', 'markers', 'categories.syd'), _CATEGORIES_SYD)
+    write_file(os.path.join(site_root, 'metas', 'users', 'user1.syd'), _USER_SYD)
+    write_file(os.path.join(site_root, 'metas', 'menus', 'primary.syd'), _MENU_SYD)
+    write_file(os.path.join(site_root, 'contents', 'home.md'), _HOME_MD)
+    for post in posts:
+        write_file(os.path.join(site_root, 'contents', 'blog', f'{post["slug"]}.md'), post_text(post))
+
+
+def make_project(root, posts, sub_sites=()):
+    """Writes a project with the posts under contents/blog, a paginated blog page and sub sites with one post each"""
+    write_file(os.path.join(root, 'settings.syd'), _SETTINGS_SYD)
+    write_file(os.path.join(root, 'themes', 'default.html'), _DEFAULT_HTML)
+    write_file(os.path.join(root, 'themes', 'sidebar.html'), _SIDEBAR_HTML)
+    write_file(os.path.join(root, 'themes', 'mark.html'), _MARK_HTML)
+    write_file(os.path.join(root, 'themes', 'user.html'), _USER_HTML)
+    _write_site(root, posts)
+    write_file(os.path.join(root, 'contents', 'blog.md'), _BLOG_MD)
+    write_file(os.path.join(root, 'contents', 'blog', '.meta.syd'), 'type: post\n')
+    for name in sub_sites:
+        site_root = os.path.join(root, 'sites', name)
+        _write_site(site_root, [])
+        write_file(
+            os.path.join(site_root, 'contents', 'index.md'),
+            f'---\ntitle: Sub {name}\ntype: post\n'
+            f'created_on: 2018-01-01 10:00:00\nupdated_on: 2018-01-01 10:00:00\n---\nHello {name}\n'
+        )
+
+
+def run_in_process(func, *args):
+    """Returns func(*args) called in a forked child process, its result must be picklable.
+
+    The child is not a daemon, so that a parallel build can fork its own workers."""
+    context = multiprocessing.get_context('fork')
+    reader, writer = context.Pipe(duplex=False)
+
+    def call():
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = True, func(*args)
+        except BaseException:
+            result = False, traceback.format_exc()
+        writer.send(result)
+
+    process = context.Process(target=call)
+    process.start()
+    writer.close()
+    try:
+        succeeded, result = reader.recv()
+    finally:
+        reader.close()
+        process.join()
+    if not succeeded:
+        raise AssertionError(f'Child process failed:\n{result}')
+    return result
+
+
+def _build(root, jobs, full):
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    return synamic.sites.build(jobs=jobs, full=full)
+
+
+def build(root, jobs=None, full=False):
+    """Loads and builds the project at root in a child process, returns whether the build succeeded"""
+    return run_in_process(_build, root, jobs, full)
+
+
+def read_outputs(root):
+    """Returns a dict of the paths relative to the output directory to the content of the files in it"""
+    outputs_root = os.path.join(root, '_outputs')
+    outputs = {}
+    for dir_path, dir_names, file_names in os.walk(outputs_root):
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            with open(path, 'rb') as f:
+                outputs[os.path.relpath(path, outputs_root)] = f.read()
+    return outputs
@@ -0,0 +1,148 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import synamic
+from synamic.core.parsing_systems.curlybrace_parser import SydParser
+from synamic.core.parsing_systems.compiled_syd import SYDC_EXT, load_syd_file
+from synamic.test import sample_project
+
+
+class TestLoadSydFile(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix='synamic_test_')
+        self.syd_path = os.path.join(self.dir, 'settings.syd')
+        self.sydc_path = os.path.join(self.dir, 'cache', 'settings' + SYDC_EXT)
+        self.n_parsed = 0
+        sample_project.write_file(self.syd_path, 'title: A\nsite {\n    url: http://a\n}\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def parse(self, text):
+        self.n_parsed += 1
+        return SydParser(text).parse()
+
+    def load(self):
+        return load_syd_file(self.syd_path, self.sydc_path, self.parse)
+
+    def test_compiled_once(self):
+        self.assertEqual('A', self.load().get('title'))
+        self.assertTrue(os.path.exists(self.sydc_path))
+        self.assertEqual('http://a', self.load().get('site.url'))
+        self.assertEqual(1, self.n_parsed)
+
+    def test_every_load_gets_a_new_syd(self):
+        self.load()
+        first = self.load()
+        first.set('title', 'Changed')
+        self.assertEqual('A', self.load().get('title'))
+
+    def test_changed(self):
+        self.load()
+        sample_project.write_file(self.syd_path, 'title: Changed\n')
+        self.assertEqual('Changed', self.load().get('title'))
+        self.assertIsNone(self.load().get('site', None))
+        self.assertEqual(2, self.n_parsed)
+
+    def test_changed_with_the_same_size(self):
+        self.load()
+        st = os.stat(self.syd_path)
+        sample_project.write_file(self.syd_path, 'title: B\nsite {\n    url: http://b\n}\n')
+        os.utime(self.syd_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertEqual('http://b', self.load().get('site.url'))
+        self.assertEqual(2, self.n_parsed)
+
+    def test_touched(self):
+        self.load()
+        st = os.stat(self.syd_path)
+        os.utime(self.syd_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 10))
+        self.assertEqual('A', self.load().get('title'))
+        self.assertEqual('A', self.load().get('title'))
+        self.assertEqual(1, self.n_parsed)
+
+    def test_corrupt(self):
+        self.load()
+        for data in (b'', b'SYDC', b'SYDCnot a pickle', b'not a sydc'):
+            with open(self.sydc_path, 'wb') as f:
+                f.write(data)
+            self.assertEqual('A', self.load().get('title'))
+        self.assertEqual(5, self.n_parsed)
+        self.load()
+        self.assertEqual(5, self.n_parsed)
+
+    def test_not_writable(self):
+        # a file where the cache dir should be
+        sample_project.write_file(os.path.join(self.dir, 'cache'), '')
+        self.assertEqual('A', self.load().get('title'))
+        self.assertEqual('A', self.load().get('title'))
+        self.assertEqual(2, self.n_parsed)
+        self.assertEqual(['cache', 'settings.syd'], sorted(os.listdir(self.dir)))
+
+    def test_no_temporary_files_left(self):
+        self.load()
+        sample_project.write_file(self.syd_path, 'title: Changed\n')
+        self.load()
+        self.assertEqual(['settings' + SYDC_EXT], os.listdir(os.path.dirname(self.sydc_path)))
+
+
+def _load(root):
+    """Returns the stats of the compiled syd cache, the name of the user and the per page setting"""
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+    user = site.object_manager.get_user('user1')
+    return synamic.object_manager.compiled_syd_cache.stats, user.name, site.settings['pagination.per_page']
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestCompiledSydCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.make_project(self.root, sample_project.make_posts(3))
+        stats, self.user_name, self.per_page = sample_project.run_in_process(_load, self.root)
+        self.n_syds = stats['misses']
+        self.assertEqual(0, stats['hits'])
+        self.assertGreater(self.n_syds, 2)
+        self.assertEqual(('User One', 3), (self.user_name, self.per_page))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def load(self):
+        return sample_project.run_in_process(_load, self.root)
+
+    def test_unchanged(self):
+        self.assertEqual(({'hits': self.n_syds, 'misses': 0}, 'User One', 3), self.load())
+
+    def test_changed(self):
+        sample_project.write_file(os.path.join(self.root, 'metas', 'users', 'user1.syd'), 'name: Renamed User\n')
+        sample_project.write_file(
+            os.path.join(self.root, 'settings.syd'),
+            'templates: {\n    mark: mark.html\n    user: user.html\n}\npagination: {\n    per_page: 5\n}\n'
+        )
+        self.assertEqual(({'hits': self.n_syds - 2, 'misses': 2}, 'Renamed User', 5), self.load())
+        self.assertEqual(({'hits': self.n_syds, 'misses': 0}, 'Renamed User', 5), self.load())
+
+    def test_default_data_in_the_project_cache_dir(self):
+        sydc_dir = os.path.join(self.root, '_cache', 'sydc', 'default_data')
+        self.assertTrue(any(name.endswith(SYDC_EXT) for name in os.listdir(sydc_dir)))
+        package_default_data_dir = os.path.join(os.path.dirname(synamic.__file__), 'core', 'default_data')
+        self.assertFalse(any(name.endswith(SYDC_EXT) for name in os.listdir(package_default_data_dir)))
+
+
+if __name__ == '__main__':
+    unittest.main()
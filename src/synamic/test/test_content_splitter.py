@@ -0,0 +1,74 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import io
+import random
+import unittest
+
+from synamic.core.services.content.content_splitter import content_splitter, front_matter_reader, body_reader
+from synamic.test import sample_project
+
+
+class _FilePath:
+    relative_path = 'contents/test.md'
+
+
+_TEXTS = (
+    '---\na: 1\n---\nbody\nline2\n',
+    '\n\n  \n---\r\na: ü\r\nb: 2\r\n---   \r\nbody ü\r\n\r\nend',
+    '----\nx\n---\nnot end\n----\nbody',
+    '---\ra: 1\r---\rbody\rmore',
+    '---\na: 1\n---',
+    '---\na b\n---\nbo dy\n',
+    '---\n---\n\n\nbody\n\n',
+    '---\na: 1\n---\n---\nsecond separator in the body\n',
+)
+
+_INVALID_TEXTS = (
+    'text\n---\na\n---\n',
+    '---\na: 1\n',
+    '',
+)
+
+
+class TestContentSplitter(unittest.TestCase):
+    """front_matter_reader() and body_reader() must give what content_splitter() gives for the whole text"""
+    def assertSameSplit(self, text):
+        data = text.encode('utf-8')
+        front_matter, body = content_splitter(_FilePath, text)
+        read_front_matter, head = front_matter_reader(_FilePath, io.BytesIO(data))
+        self.assertEqual(front_matter, read_front_matter, repr(text))
+        self.assertTrue(data.startswith(head), repr(text))
+        self.assertEqual(body, body_reader(_FilePath, io.BytesIO(data), len(head)), repr(text))
+        self.assertEqual(body, body_reader(_FilePath, io.BytesIO(data)), repr(text))
+
+    def test_texts(self):
+        for text in _TEXTS:
+            self.assertSameSplit(text)
+
+    def test_posts(self):
+        rnd = random.Random(4)
+        for post in sample_project.make_posts(20):
+            body = '\n'.join('line ' * rnd.randint(0, 20) for _ in range(rnd.randint(0, 30)))
+            text = sample_project.post_text(post, body)
+            for newline in ('\n', '\r\n', '\r'):
+                self.assertSameSplit(text.replace('\n', newline))
+
+    def test_invalid_texts(self):
+        for text in _INVALID_TEXTS:
+            with self.assertRaises(Exception):
+                content_splitter(_FilePath, text)
+            with self.assertRaises(Exception):
+                front_matter_reader(_FilePath, io.BytesIO(text.encode('utf-8')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from synamic.test import sample_project
+
+
+def _reload_after(root, change):
+    """Loads the project, calls change() and reloads the root site. Returns whether the merged dir metas of the
+    contents dir, blog and pages were kept by the reload, and the types of the contents after the reload by title"""
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+    contents_cdir = site.cpaths.contents_cdir
+    cdirs = (contents_cdir, contents_cdir.join_as_cdir('blog'), contents_cdir.join_as_cdir('pages'))
+    dir_metas = [site.object_manager.get_dir_meta(cdir)[0] for cdir in cdirs]
+    change()
+    site.object_manager.reload()
+    kept = tuple(site.object_manager.get_dir_meta(cdir)[0] is dir_meta for cdir, dir_meta in zip(cdirs, dir_metas))
+    types = {}
+    for cfields in site.object_manager.query_cfields(':sortby title'):
+        type_mark = cfields.get('type')
+        types[cfields.get('title')] = None if type_mark is None else type_mark.id
+    return kept, types
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestDirMeta(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        # the type of the posts comes from the .meta.syd of their dir
+        posts = [dict((key, value) for key, value in post.items() if key != 'type') for post in sample_project.make_posts(3)]
+        sample_project.make_project(self.root, posts)
+        about = dict(posts[0], title='About', slug='about')
+        sample_project.write_file(self.path('contents', 'pages', 'about.md'), sample_project.post_text(about))
+        sample_project.write_file(self.path('contents', 'pages', '.meta.syd'), 'type: page\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def path(self, *comps):
+        return os.path.join(self.root, *comps)
+
+    def reload_after(self, change):
+        return sample_project.run_in_process(_reload_after, self.root, change)
+
+    def rewrite(self, text, *comps):
+        """Writes the file with a newer mtime, so that the change is seen even when the size is the same"""
+        path = self.path(*comps)
+        st = os.stat(path)
+        sample_project.write_file(path, text)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    def test_unchanged(self):
+        kept, types = self.reload_after(lambda: None)
+        self.assertEqual((True, True, True), kept)
+        self.assertEqual('post', types['Post 1'])
+        self.assertEqual('page', types['About'])
+
+    def test_changed(self):
+        # the same size as before
+        kept, types = self.reload_after(lambda: self.rewrite('type: page\n', 'contents', 'blog', '.meta.syd'))
+        self.assertEqual((True, False, True), kept)
+        self.assertEqual({'page'}, {types[f'Post {idx}'] for idx in (1, 2, 3)})
+
+    def test_parent_created(self):
+        kept, types = self.reload_after(
+            lambda: sample_project.write_file(self.path('contents', '.meta.syd'), 'type: post\n')
+        )
+        self.assertEqual((False, False, False), kept)
+        self.assertEqual('post', types['Welcome'])
+        self.assertEqual('page', types['About'])
+
+    def test_removed(self):
+        kept, types = self.reload_after(lambda: os.remove(self.path('contents', 'pages', '.meta.syd')))
+        self.assertEqual((True, True, False), kept)
+        self.assertNotEqual('page', types['About'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import random
+import unittest
+
+from synamic.core.parsing_systems.curlybrace_parser import SydParser
+from synamic.core.standalones.syd import SydContainer
+from synamic.test import sample_project
+
+
+_LINES = (
+    'title: Hello ${x}', 'x: 5', 'y: -3.5', 'n: +7', 'd: 2018-04-22', 'dt: 2018-04-22 10:00:00', 't: 10:20 PM',
+    'bd: 2018-13-45', 'q: "a \\"b\\" c"', "s: 'single'", 'l: (a, b, 5)', 'l2: ("x,y", 2018-01-01)', 'z: ((8\\, 7))',
+    'esc: \\(paren', 'e:', 'e2', 'k v', 'k2 : v2', 'bad:value', 'colon: a: b', 'k:\tv  ', 'sp:    spaced   ',
+    'u: \u0663', '  indented: 1', 'x: ${y}', 'y: Y', '# comment', '// comment', '', '   ',
+    'b { ', '}', 'ml~ {', 'k: {', 'lst: [', ']', '!include x',
+)
+
+
+def _dump(syd):
+    if isinstance(syd, SydContainer):
+        return 'container', syd.key, syd.is_list, tuple(_dump(child) for child in syd.get_children())
+    return 'data', syd.key, syd.type, repr(syd.value)
+
+
+def _parse(text, fast):
+    try:
+        return _dump(SydParser(text, fast=fast).parse())
+    except Exception as e:
+        return 'error', type(e).__name__, str(e)
+
+
+class TestFastSydParser(unittest.TestCase):
+    """The fast path must give the same trees and the same errors as the state machine"""
+    def assertSameParse(self, text):
+        self.assertEqual(_parse(text, False), _parse(text, True), repr(text))
+
+    def test_front_matters(self):
+        for post in sample_project.make_posts(20):
+            text = sample_project.post_text(post)
+            self.assertSameParse(text.split('---')[1])
+
+    def test_nested(self):
+        self.assertSameParse('title: A\nsite {\n    url: http://a\n}\n')
+        self.assertSameParse('marks: [\n    {\n        title: Post\n    }\n]\n')
+        self.assertSameParse('description ~ {\n    Multi line\n    text\n}\n')
+
+    def test_random_lines(self):
+        rnd = random.Random(1)
+        for _ in range(3000):
+            self.assertSameParse('\n'.join(rnd.choice(_LINES) for _ in range(rnd.randint(1, 8))))
+
+    def test_line_endings(self):
+        rnd = random.Random(2)
+        for _ in range(300):
+            lines = [rnd.choice(_LINES) for _ in range(rnd.randint(1, 6))]
+            for newline in ('\r\n', '\r'):
+                self.assertSameParse(newline.join(lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from synamic.core.services.filesystem.backends import FileSystemBackend
+from synamic.core.services.filesystem.file_index import FileIndex
+from synamic.exceptions import SynamicFSError
+from synamic.test import sample_project
+
+
+def _bump_mtime(path):
+    """Makes the change seen even on file systems with coarse mtimes"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+class TestFileIndex(unittest.TestCase):
+    """Changes made behind the back of the index are seen only after they are invalidated or rescanned"""
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.write_file(os.path.join(self.dir, 'a.txt'), 'a')
+        sample_project.write_file(os.path.join(self.dir, 'sub', 'b.txt'), 'b')
+        self.index = FileIndex(FileSystemBackend())
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def path(self, *comps):
+        return os.path.join(self.dir, *comps)
+
+    def names(self, *comps):
+        return sorted(name for name, _, _ in self.index.entries(self.path(*comps)))
+
+    def test_entries(self):
+        self.assertEqual(['a.txt', 'sub'], self.names())
+        self.assertEqual([('a.txt', True, False), ('sub', False, True)], sorted(self.index.entries(self.dir)))
+        self.assertTrue(self.index.is_file(self.path('a.txt')))
+        self.assertTrue(self.index.is_dir(self.path('sub')))
+        self.assertTrue(self.index.exists(self.path('sub', 'b.txt')))
+        self.assertFalse(self.index.exists(self.path('c.txt')))
+        self.assertFalse(self.index.exists(self.path('missing', 'c.txt')))
+
+    def test_rescan(self):
+        self.assertEqual(['a.txt', 'sub'], self.names())
+        self.assertEqual(['b.txt'], self.names('sub'))
+        sample_project.write_file(self.path('c.txt'), 'c')
+        os.remove(self.path('sub', 'b.txt'))
+        sample_project.write_file(self.path('sub', 'deeper', 'd.txt'), 'd')
+        # not seen till the rescan
+        self.assertEqual(['a.txt', 'sub'], self.names())
+        self.assertFalse(self.index.exists(self.path('c.txt')))
+        self.assertTrue(self.index.exists(self.path('sub', 'b.txt')))
+
+        generation = self.index.generation
+        self.index.rescan()
+        self.assertGreater(self.index.generation, generation)
+        self.assertEqual(['a.txt', 'c.txt', 'sub'], self.names())
+        self.assertEqual(['deeper'], self.names('sub'))
+        self.assertTrue(self.index.is_file(self.path('sub', 'deeper', 'd.txt')))
+        self.assertFalse(self.index.exists(self.path('sub', 'b.txt')))
+
+    def test_listing_tokens(self):
+        token = self.index.listing_token(self.dir)
+        sub_token = self.index.listing_token(self.path('sub'))
+        self.assertIs(token, self.index.listing_token(self.dir))
+        self.index.is_file(self.path('a.txt'))
+        self.assertIs(token, self.index.listing_token(self.dir))
+
+        # a file added to the dir
+        sample_project.write_file(self.path('c.txt'), 'c')
+        self.index.invalidate(self.path('c.txt'))
+        new_token = self.index.listing_token(self.dir)
+        self.assertIsNot(token, new_token)
+        self.assertIs(sub_token, self.index.listing_token(self.path('sub')))
+        self.assertIn('c.txt', self.names())
+
+        self.index.rescan()
+        self.assertIsNot(new_token, self.index.listing_token(self.dir))
+        self.assertIsNot(sub_token, self.index.listing_token(self.path('sub')))
+
+    def test_refresh_dir(self):
+        token = self.index.listing_token(self.dir)
+        sub_token = self.index.listing_token(self.path('sub'))
+        self.assertFalse(self.index.refresh_dir(self.dir))
+        self.assertIs(token, self.index.listing_token(self.dir))
+
+        os.remove(self.path('a.txt'))
+        _bump_mtime(self.dir)
+        self.assertTrue(self.index.refresh_dir(self.dir))
+        self.assertIsNot(token, self.index.listing_token(self.dir))
+        self.assertEqual(['sub'], self.names())
+        self.assertIs(sub_token, self.index.listing_token(self.path('sub')))
+        self.assertFalse(self.index.refresh_dir(self.dir))
+
+        # never scanned
+        self.assertFalse(self.index.refresh_dir(self.path('missing')))
+
+
+class TestStatCache(unittest.TestCase):
+    """stat() is cached inside a stat epoch"""
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix='synamic_test_')
+        self.file = os.path.join(self.dir, 'a.txt')
+        sample_project.write_file(self.file, 'a')
+        self.fs = FileSystemBackend()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def change_file(self):
+        sample_project.write_file(self.file, 'changed')
+        _bump_mtime(self.file)
+
+    def size(self):
+        return self.fs.stat(self.file)[0]
+
+    def test_outside_of_epoch(self):
+        self.assertEqual(1, self.size())
+        self.change_file()
+        self.assertEqual(7, self.size())
+        self.assertEqual({'epoch': None, 'hits': 0, 'misses': 0, 'size': 0}, self.fs.stat_cache_info)
+
+    def test_in_epoch(self):
+        with self.fs.stat_epoch('build'):
+            mtime = self.fs.getmtime(self.file)
+            self.assertEqual(1, self.size())
+            self.change_file()
+            # from the cache
+            self.assertEqual(1, self.size())
+            self.assertEqual(mtime, self.fs.getmtime(self.file))
+            self.assertEqual({'epoch': 'build', 'hits': 3, 'misses': 1, 'size': 1}, self.fs.stat_cache_info)
+            # a nested epoch continues the one in progress
+            with self.fs.stat_epoch('reload'):
+                self.assertEqual(1, self.size())
+                self.assertEqual('build', self.fs.epoch)
+
+        # refreshed in the next epoch
+        with self.fs.stat_epoch('reload'):
+            self.assertEqual(7, self.size())
+            self.assertNotEqual(mtime, self.fs.getmtime(self.file))
+        self.assertEqual(0, self.fs.stat_cache_info['size'])
+
+    def test_invalidate(self):
+        with self.fs.stat_epoch('build'):
+            self.assertEqual(1, self.size())
+            self.change_file()
+            self.fs.invalidate(self.file)
+            self.assertEqual(7, self.size())
+            sample_project.write_file(self.file, 'changed again')
+            self.fs.invalidate_all()
+            self.assertEqual(13, self.size())
+
+    def test_removed_in_epoch(self):
+        with self.fs.stat_epoch('build'):
+            self.size()
+            os.remove(self.file)
+            self.fs.invalidate(self.file)
+            with self.assertRaises(SynamicFSError):
+                self.size()
+
+
+if __name__ == '__main__':
+    unittest.main()
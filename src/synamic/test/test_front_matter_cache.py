@@ -0,0 +1,174 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from synamic.core.object_manager.parallel_load import PARALLEL_LOAD_MIN_FILES
+from synamic.test import sample_project
+
+
+def _load(root):
+    """Returns the stats of the front matter cache, titles and bodies of the contents by file name"""
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+    contents = {}
+    for cfields in site.object_manager.query_cfields(':sortby title'):
+        content = site.object_manager.get_marked_content(cfields.cpath)
+        contents[cfields.cpath.basename] = cfields.get('title'), str(content.body.as_markup)
+    return synamic.object_manager.front_matter_cache.stats, contents
+
+
+def _load_with_jobs(root, jobs):
+    """Returns the number of parallel reads and the raw front matters and urls of the cfields by file name, the
+    error message instead when the load fails"""
+    from synamic import Synamic
+    from synamic.exceptions import SynamicError
+    from synamic.core.object_manager import front_matter_cache
+    n_parallel_reads = [0]
+    read_front_matters_in_parallel = front_matter_cache.read_front_matters_in_parallel
+
+    def counting_read_front_matters_in_parallel(*args):
+        n_parallel_reads[0] += 1
+        return read_front_matters_in_parallel(*args)
+    front_matter_cache.read_front_matters_in_parallel = counting_read_front_matters_in_parallel
+
+    synamic = Synamic(root)
+    try:
+        synamic.load(jobs=jobs)
+    except SynamicError as e:
+        return str(e)
+    site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+    cfields_s = {
+        cfields.cpath.basename: (str(cfields.raw), cfields.curl.url)
+        for cfields in site.object_manager.query_cfields(':sortby title')
+    }
+    return n_parallel_reads[0], cfields_s
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestFrontMatterCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        self.posts = sample_project.make_posts(10)
+        sample_project.make_project(self.root, self.posts)
+        self.post_path = os.path.join(self.root, 'contents', 'blog', 'post-3.md')
+        self.n_contents = len(self.posts) + 2
+        stats, self.contents = sample_project.run_in_process(_load, self.root)
+        self.assertEqual({'hits': 0, 'misses': self.n_contents}, stats)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def load(self):
+        return sample_project.run_in_process(_load, self.root)
+
+    def test_unchanged(self):
+        stats, contents = self.load()
+        self.assertEqual({'hits': self.n_contents, 'misses': 0}, stats)
+        self.assertEqual(self.contents, contents)
+
+    def test_touched(self):
+        st = os.stat(self.post_path)
+        os.utime(self.post_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 10))
+        stats, contents = self.load()
+        self.assertEqual({'hits': self.n_contents, 'misses': 0}, stats)
+        self.assertEqual(self.contents, contents)
+
+    def test_front_matter_changed(self):
+        post = dict(self.posts[2], title='Changed Title')
+        sample_project.write_file(self.post_path, sample_project.post_text(post))
+        stats, contents = self.load()
+        self.assertEqual({'hits': self.n_contents - 1, 'misses': 1}, stats)
+        self.assertEqual('Changed Title', contents['post-3.md'][0])
+        self.assertEqual(self.load(), ({'hits': self.n_contents, 'misses': 0}, contents))
+
+    def test_body_changed(self):
+        with open(self.post_path, 'a', encoding='utf-8') as f:
+            f.write('\nAn extra line.\n')
+        stats, contents = self.load()
+        self.assertEqual({'hits': self.n_contents, 'misses': 0}, stats)
+        self.assertIn('An extra line.', contents['post-3.md'][1])
+        self.assertNotIn('An extra line.', self.contents['post-3.md'][1])
+
+    def test_front_matter_grown(self):
+        # the body starts later in the file, the body offset of the record must not be used
+        post = dict(self.posts[2], title='A much longer title than before')
+        sample_project.write_file(self.post_path, sample_project.post_text(post, 'The same body.'))
+        stats, contents = self.load()
+        self.assertEqual(1, stats['misses'])
+        body = contents['post-3.md'][1].strip()
+        self.assertTrue(body.startswith("<h1 id='A_much_longer_title_than_before'>"), body)
+        self.assertIn('The same body.', body)
+
+    def test_removed_and_added(self):
+        os.remove(self.post_path)
+        post = dict(self.posts[2], title='New Post', slug='new-post')
+        sample_project.write_file(os.path.join(self.root, 'contents', 'blog', 'new-post.md'), sample_project.post_text(post))
+        stats, contents = self.load()
+        self.assertEqual({'hits': self.n_contents - 1, 'misses': 1}, stats)
+        self.assertNotIn('post-3.md', contents)
+        self.assertEqual('New Post', contents['new-post.md'][0])
+
+    def test_corrupt_store(self):
+        store_paths = [
+            os.path.join(dir_path, file_name)
+            for dir_path, dir_names, file_names in os.walk(os.path.join(self.root, '_cache'))
+            for file_name in file_names if file_name.startswith('front_matter')
+        ]
+        self.assertTrue(store_paths)
+        for store_path in store_paths:
+            with open(store_path, 'wb') as f:
+                f.write(b'not a pickle')
+        stats, contents = self.load()
+        self.assertEqual({'hits': 0, 'misses': self.n_contents}, stats)
+        self.assertEqual(self.contents, contents)
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestParallelLoad(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        self.posts = sample_project.make_posts(PARALLEL_LOAD_MIN_FILES + 6)
+        sample_project.make_project(self.root, self.posts)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def load(self, jobs):
+        # without the cache of the last load, so that every front matter is read
+        shutil.rmtree(os.path.join(self.root, '_cache'), ignore_errors=True)
+        return sample_project.run_in_process(_load_with_jobs, self.root, jobs)
+
+    def test_same_as_serial(self):
+        n_parallel_reads, parallel_cfields = self.load(3)
+        self.assertEqual(1, n_parallel_reads)
+        n_parallel_reads, serial_cfields = self.load(1)
+        self.assertEqual(0, n_parallel_reads)
+        self.assertEqual(len(self.posts) + 2, len(serial_cfields))
+        self.assertEqual(serial_cfields, parallel_cfields)
+
+    def test_error_names_the_file(self):
+        sample_project.write_file(
+            os.path.join(self.root, 'contents', 'blog', 'post-7.md'), '---\ntitle: Broken\nsite {\n---\nbody\n'
+        )
+        message = self.load(3)
+        self.assertIsInstance(message, str)
+        self.assertIn('contents/blog/post-7.md', message)
+        self.assertIn('load worker', message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from synamic.test import sample_project
+
+
+def _build_reading_bodies(root):
+    """Builds incrementally and returns the names of the content files whose bodies were read"""
+    from synamic import Synamic
+    from synamic.core.object_manager.object_manager import ObjectManager
+    read = []
+    get_content_body = ObjectManager.get_content_body
+
+    def recording_get_content_body(self, site, content_path):
+        read.append(content_path.basename)
+        return get_content_body(self, site, content_path)
+    ObjectManager.get_content_body = recording_get_content_body
+    synamic = Synamic(root)
+    synamic.load()
+    assert synamic.sites.build()
+    return read
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Builds run in forked processes')
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        self.posts = sample_project.make_posts(12)
+        sample_project.make_project(self.root, self.posts, sub_sites=('a',))
+        self.assertTrue(sample_project.build(self.root, full=True))
+        self.first_outputs = sample_project.read_outputs(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def path(self, *comps):
+        return os.path.join(self.root, *comps)
+
+    def append(self, text, *comps):
+        with open(self.path(*comps), 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def assertIncrementalEqualsFull(self, jobs=None):
+        """Builds incrementally, then from scratch and returns the outputs if both are the same"""
+        self.assertTrue(sample_project.build(self.root, jobs=jobs))
+        incremental_outputs = sample_project.read_outputs(self.root)
+        self.assertTrue(sample_project.build(self.root, full=True))
+        full_outputs = sample_project.read_outputs(self.root)
+        self.assertEqual(sorted(full_outputs), sorted(incremental_outputs))
+        for path, data in full_outputs.items():
+            self.assertEqual(data, incremental_outputs[path], path)
+        return full_outputs
+
+    def rewritten_by_build(self):
+        """Builds incrementally and returns the paths of the outputs that were written again"""
+        outputs_root = self.path('_outputs')
+        mtimes = {path: os.stat(os.path.join(outputs_root, path)).st_mtime_ns for path in self.first_outputs}
+        self.assertTrue(sample_project.build(self.root))
+        return {path for path, mtime in mtimes.items() if os.stat(os.path.join(outputs_root, path)).st_mtime_ns != mtime}
+
+    def test_nothing_changed(self):
+        outputs_root = self.path('_outputs')
+        mtimes = {path: os.stat(os.path.join(outputs_root, path)).st_mtime_ns for path in self.first_outputs}
+        self.assertTrue(sample_project.build(self.root))
+        for path, mtime in mtimes.items():
+            self.assertEqual(mtime, os.stat(os.path.join(outputs_root, path)).st_mtime_ns, path)
+        self.assertEqual(self.first_outputs, self.assertIncrementalEqualsFull())
+
+    def test_up_to_date_contents_not_read(self):
+        # only the paginated blog is made to plan its pages
+        self.assertEqual(['blog.md'], sample_project.run_in_process(_build_reading_bodies, self.root))
+        self.append('\nAn extra line.\n', 'contents', 'blog', 'post-3.md')
+        self.assertIn('post-3.md', sample_project.run_in_process(_build_reading_bodies, self.root))
+
+    def test_body_changed(self):
+        self.append('\nAn extra line.\n', 'contents', 'blog', 'post-3.md')
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertIn(b'An extra line.', outputs[os.path.join('blog', 'post-3', 'index.html')])
+
+    def test_title_changed(self):
+        post = dict(self.posts[4], title='Changed Title')
+        sample_project.write_file(self.path('contents', 'blog', 'post-5.md'), sample_project.post_text(post))
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertIn(b'Changed Title', outputs[os.path.join('blog', 'post-5', 'index.html')])
+
+    def test_post_added(self):
+        post = dict(self.posts[0], title='New Post', slug='new-post')
+        sample_project.write_file(self.path('contents', 'blog', 'new-post.md'), sample_project.post_text(post))
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertIn(os.path.join('blog', 'new-post', 'index.html'), outputs)
+
+    def test_post_removed(self):
+        os.remove(self.path('contents', 'blog', 'post-12.md'))
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertNotIn(os.path.join('blog', 'post-12', 'index.html'), outputs)
+
+    def test_included_template_changed(self):
+        self.append('<!-- sidebar changed -->\n', 'themes', 'sidebar.html')
+        outputs = self.assertIncrementalEqualsFull(jobs=3)
+        self.assertIn(b'sidebar changed', outputs['index.html'])
+
+    def test_user_template_changed(self):
+        self.append('<!-- user template changed -->\n', 'themes', 'user.html')
+        rewritten = self.rewritten_by_build()
+        author_pages = {path for path in self.first_outputs if '/author/' in path.replace(os.sep, '/')}
+        self.assertTrue(author_pages)
+        self.assertTrue(author_pages <= rewritten)
+        self.assertFalse({path for path in rewritten if '/m/' in path.replace(os.sep, '/')})
+        self.assertFalse({path for path in rewritten if path.endswith('index.html') and path not in author_pages})
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertIn(b'user template changed', outputs[os.path.join('_', 'author', 'user1', 'index.html')])
+
+    def test_mark_template_changed(self):
+        self.append('<!-- mark template changed -->\n', 'themes', 'mark.html')
+        rewritten = self.rewritten_by_build()
+        mark_pages = {path for path in self.first_outputs if '/m/' in path.replace(os.sep, '/')}
+        self.assertTrue(mark_pages)
+        self.assertTrue(mark_pages <= rewritten)
+        self.assertFalse({path for path in rewritten if path.endswith('index.html') and path not in mark_pages})
+        self.assertIncrementalEqualsFull()
+
+    def test_meta_changed(self):
+        sample_project.write_file(self.path('contents', 'blog', '.meta.syd'), 'type: page\n')
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertNotEqual(self.first_outputs[os.path.join('blog', 'index.html')], outputs[os.path.join('blog', 'index.html')])
+
+    def test_user_changed(self):
+        sample_project.write_file(self.path('metas', 'users', 'user1.syd'), 'name: Renamed User\ntitle: Profile\n')
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertIn(b'Renamed User', outputs[os.path.join('_', 'author', 'user1', 'index.html')])
+
+    def test_shadowing_template_added(self):
+        sample_project.write_file(self.path('sites', 'a', 'themes', 'default.html'), 'CHILD {{ content.title }}\n')
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertEqual(b'CHILD Welcome', outputs[os.path.join('a', 'index.html')].strip())
+
+    def test_shadowing_template_removed(self):
+        sample_project.write_file(self.path('sites', 'a', 'themes', 'default.html'), 'CHILD {{ content.title }}\n')
+        self.assertTrue(sample_project.build(self.root))
+        os.remove(self.path('sites', 'a', 'themes', 'default.html'))
+        outputs = self.assertIncrementalEqualsFull()
+        self.assertEqual(self.first_outputs, outputs)
+
+    def test_output_removed(self):
+        os.remove(self.path('_outputs', 'blog', 'post-2', 'index.html'))
+        self.assertEqual(self.first_outputs, self.assertIncrementalEqualsFull())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import shutil
+import tempfile
+import unittest
+
+from synamic.test import sample_project
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Parallel build needs fork')
+class TestParallelBuild(unittest.TestCase):
+    def setUp(self):
+        self.posts = sample_project.make_posts(20)
+        self.roots = []
+
+    def tearDown(self):
+        for root in self.roots:
+            shutil.rmtree(root)
+
+    def build_outputs(self, jobs):
+        root = tempfile.mkdtemp(prefix='synamic_test_')
+        self.roots.append(root)
+        sample_project.make_project(root, self.posts, sub_sites=('a',))
+        self.assertTrue(sample_project.build(root, jobs=jobs, full=True))
+        return sample_project.read_outputs(root)
+
+    def test_parallel_outputs_equal_serial_outputs(self):
+        serial_outputs = self.build_outputs(1)
+        self.assertIn('blog/post-1/index.html', serial_outputs)
+        self.assertIn('a/index.html', serial_outputs)
+        for jobs in (2, 4):
+            self.assertEqual(serial_outputs, self.build_outputs(jobs), f'jobs {jobs}')
+
+    def test_all_cpus(self):
+        self.assertEqual(self.build_outputs(None), self.build_outputs(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import random
+import shutil
+import datetime
+import tempfile
+import unittest
+
+from synamic.test import sample_project
+
+
+def _query_all(root, query_strs):
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    site = synamic.sites.get_by_id(synamic.sites.make_id(''))
+    results = []
+    # every query twice, the second time it may come from the result cache
+    for query_str in query_strs + query_strs:
+        results.append([cfields.cpath.basename for cfields in site.object_manager.query_cfields(query_str)])
+    return results
+
+
+def _sections(posts):
+    """Returns (query section, predicate on a record) pairs, a record is a dict of the front matter of a content.
+
+    Contents without a field match only != and !in of that field."""
+    def has(key, test):
+        return lambda record: record.get(key) is not None and test(record[key])
+
+    def has_not(key, test):
+        return lambda record: record.get(key) is None or test(record[key])
+
+    sections = [
+        ('type == post', has('type', lambda v: v == 'post')),
+        ('type == page', has('type', lambda v: v == 'page')),
+        ('type != post', has_not('type', lambda v: v != 'post')),
+        ('author == user1', has('author', lambda v: v == 'user1')),
+    ]
+    for tag in sample_project.TAGS:
+        sections.append((f'tags contains {tag}', has('tags', lambda v, tag=tag: tag in v)))
+        sections.append((f'tags !contains {tag}', has('tags', lambda v, tag=tag: tag not in v)))
+    for tags in (('Design', 'Career'), ('Programming', 'Marketing', 'Design')):
+        sections.append((f'tags in {", ".join(tags)}', has('tags', lambda v, tags=tags: set(v) <= set(tags))))
+        sections.append((f'tags !in {", ".join(tags)}', has_not('tags', lambda v, tags=tags: not set(v) <= set(tags))))
+    for category in sample_project.CATEGORIES:
+        sections.append((f'categories contains {category}', has('categories', lambda v, c=category: c in v)))
+    for post in posts[::4]:
+        sections.append((f'title == {post["title"]}', has('title', lambda v, t=post['title']: v == t)))
+        sections.append((f'slug != {post["slug"]}', has_not('slug', lambda v, s=post['slug']: v != s)))
+        # a value cannot have a colon, dates are compared as their midnights
+        at = datetime.datetime.combine(post['created_on'].date(), datetime.time())
+        at_str = at.strftime('%Y-%m-%d')
+        sections.append((f'created_on > {at_str}', has('created_on', lambda v, at=at: v > at)))
+        sections.append((f'created_on <= {at_str}', has('created_on', lambda v, at=at: v <= at)))
+        sections.append((f'updated_on >= {at_str}', has('updated_on', lambda v, at=at: v >= at)))
+        sections.append((f'updated_on < {at_str}', has('updated_on', lambda v, at=at: v < at)))
+    return sections
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestQuery(unittest.TestCase):
+    """Compares query_cfields() with evaluating the queries one content at a time on the front matters"""
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        self.posts = sample_project.make_posts(40, seed=7)
+        sample_project.make_project(self.root, self.posts)
+        self.records = {
+            'home.md': {
+                'title': 'Welcome',
+                'created_on': datetime.datetime(2017, 12, 1, 10),
+                'updated_on': datetime.datetime(2017, 12, 1, 10),
+            },
+            'blog.md': {
+                'title': 'Blog',
+                'type': 'page',
+                'created_on': datetime.datetime(2017, 12, 2, 10),
+                'updated_on': datetime.datetime(2017, 12, 2, 10),
+            },
+        }
+        for post in self.posts:
+            self.records[f'{post["slug"]}.md'] = dict(post, type=post.get('type', 'post'), author='user1')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def sort_key(self, key):
+        """Contents without the field come first in ascending order"""
+        return lambda name: (False, 0) if self.records[name].get(key) is None else (True, self.records[name][key])
+
+    def brute_force(self, groups, sort=None, limit=None, offset=None):
+        """groups: an or of ands of predicates, & binds tighter than |"""
+        names = [
+            name for name, record in self.records.items()
+            if not groups or any(all(test(record) for test in group) for group in groups)
+        ]
+        if sort is not None:
+            key, order = sort
+            names.sort(key=self.sort_key(key), reverse=order == 'desc')
+        offset = offset or 0
+        return names[offset:] if limit is None else names[offset:offset + limit]
+
+    def assertQueryResults(self, cases):
+        query_strs = [case[0] for case in cases]
+        results = sample_project.run_in_process(_query_all, self.root, query_strs)
+        for idx, (query_str, groups, sort, limit, offset) in enumerate(cases):
+            expected = self.brute_force(groups, sort, limit, offset)
+            for result in (results[idx], results[idx + len(cases)]):
+                if sort is None:
+                    self.assertEqual(sorted(expected), sorted(result), query_str)
+                else:
+                    # the order of contents with the same sort value is not defined
+                    sort_key = self.sort_key(sort[0])
+                    self.assertEqual([sort_key(name) for name in expected], [sort_key(name) for name in result], query_str)
+                    self.assertTrue(set(result) <= set(self.brute_force(groups)), query_str)
+                    if sort[0] != 'rating':
+                        self.assertEqual(expected, result, query_str)
+
+    def test_single_sections(self):
+        self.assertQueryResults([
+            (section, [[test]], None, None, None) for section, test in _sections(self.posts)
+        ])
+
+    def test_random_trees(self):
+        rnd = random.Random(3)
+        sections = _sections(self.posts)
+        cases = []
+        for _ in range(300):
+            groups = [rnd.sample(sections, rnd.randint(1, 3)) for _ in range(rnd.randint(1, 3))]
+            query_str = ' | '.join(' & '.join(section for section, test in group) for group in groups)
+            cases.append((query_str, [[test for section, test in group] for group in groups], None, None, None))
+        self.assertQueryResults(cases)
+
+    def test_sort_limit_offset(self):
+        rnd = random.Random(5)
+        sections = _sections(self.posts)
+        cases = []
+        for key in ('created_on', 'updated_on', 'title', 'rating'):
+            for order in ('asc', 'desc'):
+                for limit, offset in ((None, None), (5, None), (3, 2), (None, 4), (0, 1), (100, 0), (2, 39)):
+                    section, test = rnd.choice(sections + [(None, None)])
+                    query_str = f'{section or ""} :sortby {key} {order}'
+                    query_str += f' :limit {limit}' if limit is not None else ''
+                    query_str += f' :offset {offset}' if offset is not None else ''
+                    groups = [[test]] if test is not None else []
+                    cases.append((query_str, groups, (key, order), limit, offset))
+        self.assertQueryResults(cases)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import unittest
+
+from synamic.core.standalones.syd import SydContainer, SydData
+
+
+def _make_syds():
+    a = SydContainer()
+    a.add('title', 'A')
+    a.add('n', 1)
+    site = SydContainer('site')
+    site.add('url', 'http://a')
+    deep = SydContainer('deep')
+    deep.add('k', 1)
+    site.add(deep)
+    a.add(site)
+    lst = SydContainer('lst', is_list=True)
+    for i in (1, 2, 3):
+        lst.add(SydData(None, i))
+    a.add(lst)
+
+    b = SydContainer()
+    b.add('title', 'B')
+    b.add('site', {'url': 'http://b', 'extra': 5})
+    b.add('new', 'N')
+
+    c = SydContainer()
+    c_site = SydContainer('site')
+    c_deep = SydContainer('deep')
+    c_deep.add('k', 9)
+    c_site.add(c_deep)
+    c.add(c_site)
+    return a, b, c
+
+
+class TestSydSharing(unittest.TestCase):
+    """Clones and merges share subtrees until they are changed, a change must never show through in another tree"""
+    def setUp(self):
+        self.a, self.b, self.c = _make_syds()
+
+    def snapshot(self):
+        return str(self.a), str(self.b), str(self.c)
+
+    def test_clone(self):
+        before = self.snapshot()
+        clone = self.a.clone()
+        self.assertEqual(str(self.a), str(clone))
+        clone.set('title', 'Clone')
+        clone.set('site.deep.k', 42)
+        clone.set('site.url', 'http://clone')
+        del clone['n']
+        clone.add('added', 3)
+        self.assertEqual(before, self.snapshot())
+        self.assertEqual(42, clone.get('site.deep.k'))
+        self.assertEqual(3, clone.get('added'))
+        self.assertIsNone(clone.get('n', None))
+
+        cloned = str(clone)
+        self.a.set('site.deep.k', 7)
+        self.a.set('title', 'Changed')
+        self.assertEqual(cloned, str(clone))
+
+    def test_clone_of_clone(self):
+        first = self.a.clone()
+        second = first.clone()
+        second.set('site.deep.k', 2)
+        first.set('site.deep.k', 3)
+        self.assertEqual(1, self.a.get('site.deep.k'))
+        self.assertEqual(3, first.get('site.deep.k'))
+        self.assertEqual(2, second.get('site.deep.k'))
+
+    def test_merged_new(self):
+        before = self.snapshot()
+        merged = self.a.merged_new(self.b, self.c)
+        self.assertEqual('B', merged.get('title'))
+        self.assertEqual('http://b', merged.get('site.url'))
+        self.assertEqual(5, merged.get('site.extra'))
+        self.assertEqual(9, merged.get('site.deep.k'))
+        self.assertEqual('N', merged.get('new'))
+        self.assertEqual(1, merged.get('n'))
+
+        merged.set('title', 'M')
+        merged.set('site.url', 'http://m')
+        merged.set('site.deep.k', 42)
+        merged.update('site.extra', SydData('extra', 6))
+        self.assertEqual(before, self.snapshot())
+
+        merged_str = str(merged)
+        self.a.set('n', 100)
+        self.a.set('site.deep.k', 100)
+        self.b.set('site.extra', 100)
+        self.c.set('site.deep.k', 100)
+        self.assertEqual(merged_str, str(merged))
+
+    def test_children_changed_in_place(self):
+        before = self.snapshot()
+        clone = self.a.clone()
+        clone.get_child('site').add('q', 5)
+        clone.get_child('site')['url'] = 'http://clone'
+        clone.get_child('site.deep')['k'] = 2
+        clone.get('site').add('r', 6)
+        clone['site'].get_child('deep').add('s', 7)
+        clone.get_child('lst').add(SydData(None, 4))
+        clone.get_children()[0].set_converted('Clone')
+        for site in clone.get_child('site', multi=True):
+            site.add('t', 8)
+        self.assertEqual(before, self.snapshot())
+        self.assertEqual((5, 'http://clone', 2, 6, 7, 8), tuple(
+            clone.get(key) for key in ('site.q', 'site.url', 'site.deep.k', 'site.r', 'site.deep.s', 'site.t')
+        ))
+        self.assertEqual((1, 2, 3, 4), clone['lst'].as_tuple)
+        self.assertEqual('Clone', clone.get('title'))
+
+        clone_str = str(clone)
+        self.a.get_child('site').add('q', 9)
+        self.a.get_child('site.deep')['k'] = 9
+        self.assertEqual(clone_str, str(clone))
+
+    def test_merged_children_changed_in_place(self):
+        before = self.snapshot()
+        merged = self.a.merged_new(self.b, self.c)
+        merged.get_child('site').add('q', 5)
+        merged.get_child('site')['extra'] = 6
+        merged.get_child('site.deep')['k'] = 42
+        merged.get_child('lst').add(SydData(None, 4))
+        self.assertEqual(before, self.snapshot())
+        self.assertEqual((5, 6, 42), tuple(merged.get(key) for key in ('site.q', 'site.extra', 'site.deep.k')))
+
+    def test_new(self):
+        before = self.snapshot()
+        # new() replaces the children of the same keys, site of b replaces site of a
+        new = self.a.new(self.b)
+        self.assertIsNone(new.get('site.deep', None))
+        new.set('site.url', 'http://new')
+        new.set('site.extra', 7)
+        new.set('n', 2)
+        self.assertEqual(before, self.snapshot())
+        new_str = str(new)
+        self.b.set('site.url', 'http://b2')
+        self.b.set('site.extra', 8)
+        self.a.set('n', 6)
+        self.assertEqual(new_str, str(new))
+
+    def test_locked_clone(self):
+        locked = self.a.clone()
+        locked.lock()
+        locked_str = str(locked)
+        with self.assertRaises(AssertionError):
+            locked.set('title', 'Locked')
+        self.a.set('title', 'Changed')
+        self.a.set('site.deep.k', 8)
+        self.assertEqual(locked_str, str(locked))
+
+        unlocked = locked.clone()
+        unlocked.set('site.deep.k', 9)
+        unlocked.get_child('site').add('q', 5)
+        self.assertEqual(locked_str, str(locked))
+        with self.assertRaises(AssertionError):
+            locked.get_child('site').add('q', 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,362 @@
+"""
+    author: "Md. Sabuj Sarker"
+    copyright: "Copyright 2017-2018, The Synamic Project"
+    credits: ["Md. Sabuj Sarker"]
+    license: "MIT"
+    maintainer: "Md. Sabuj Sarker"
+    email: "md.sabuj.sarker@gmail.com"
+    status: "Development"
+"""
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from synamic.core.services.template.template_service import RENDER_CHUNK_SIZE, TEMPLATE_BYTECODE_DIR_NAME
+from synamic.test import sample_project
+
+
+def _load_counting_scans(root):
+    """Returns the loaded synamic and a list with the number of directory scans done since the load"""
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    fs = synamic.path_tree.fs
+    scandir = fs.scandir
+    n_scans = [0]
+
+    def counting_scandir(path):
+        n_scans[0] += 1
+        return scandir(path)
+    fs.scandir = counting_scandir
+    return synamic, n_scans
+
+
+def _edit_default_html(root, replacements):
+    path = os.path.join(root, 'themes', 'default.html')
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    for old, new in replacements:
+        assert old in text
+        text = text.replace(old, new)
+    sample_project.write_file(path, text)
+
+
+def _count_fragment_renders():
+    """Counts the {% cache %} fragments asked for and rendered in this process. Returns two lists that get the site id
+    and the key of every fragment asked for and rendered."""
+    from synamic.core.object_manager.object_manager import ObjectManager
+    asked, rendered = [], []
+    get_fragment = ObjectManager.get_fragment
+
+    def counting_get_fragment(self, site, key, render, **kwargs):
+        fragment_id = site.id.as_string, key
+        asked.append(fragment_id)
+
+        def counting_render():
+            rendered.append(fragment_id)
+            return render()
+        return get_fragment(self, site, key, counting_render, **kwargs)
+    ObjectManager.get_fragment = counting_get_fragment
+    return asked, rendered
+
+
+def _build_counting_fragments(root, full):
+    from synamic import Synamic
+    asked, rendered = _count_fragment_renders()
+    synamic = Synamic(root)
+    synamic.load()
+    assert synamic.sites.build(full=full)
+    return asked, rendered
+
+
+def _serve_editing_sidebar(root):
+    """Requests the home page as the dev server does, twice before and twice after the sidebar template included in a
+    {% cache %} block changed. Returns the pages and the number of fragments rendered after every request."""
+    from synamic import Synamic
+    asked, rendered = _count_fragment_renders()
+    synamic = Synamic(root)
+    synamic.load()
+
+    def request():
+        content = synamic.router.get_content('/')
+        return b''.join(content.iter_chunks()), len(rendered)
+
+    results = [request(), request()]
+    with open(os.path.join(root, 'themes', 'sidebar.html'), 'a', encoding='utf-8') as f:
+        f.write('<!-- sidebar changed -->\n')
+    results.extend([request(), request()])
+    return results
+
+
+def _render_streamed_and_whole(root, urls):
+    """Returns the number of chunks, the joined chunks and the text rendered as a whole of the contents at urls"""
+    from synamic import Synamic
+    synamic = Synamic(root)
+    synamic.load()
+    results = []
+    for url in urls:
+        content = synamic.router.get_content(url)
+        chunks = list(content.iter_chunks())
+        results.append((len(chunks), b''.join(chunks), content.get_stream().read()))
+    return results
+
+
+def _render_counting_compiles(root, urls):
+    """Renders the contents at urls, returns the pages and the number of compiles by template path relative to root"""
+    from synamic import Synamic
+    from synamic.core.services.template.template_service import SynamicJinjaEnvironment
+    n_compiles = {}
+    compile_template = SynamicJinjaEnvironment.compile
+
+    def counting_compile(self, source, name=None, filename=None, *args, **kwargs):
+        path = os.path.relpath(filename, root)
+        n_compiles[path] = n_compiles.get(path, 0) + 1
+        return compile_template(self, source, name, filename, *args, **kwargs)
+    SynamicJinjaEnvironment.compile = counting_compile
+
+    synamic = Synamic(root)
+    synamic.load()
+    pages = [b''.join(synamic.router.get_content(url).iter_chunks()) for url in urls]
+    return pages, n_compiles
+
+
+def _serve_shadowing(root):
+    """Requests the home page of the sub site a as the dev server does, while a template that shadows the one of the
+    parent site is added to and removed from its theme. Returns the start of the page and the number of scans."""
+    synamic, n_scans = _load_counting_scans(root)
+
+    def request():
+        content = synamic.router.get_content('/a/')
+        return b''.join(content.iter_chunks())[:20], n_scans[0]
+
+    child_template = os.path.join(root, 'sites', 'a', 'themes', 'default.html')
+    results = [request(), request()]
+    sample_project.write_file(child_template, 'CHILD {{ content.title }}\n')
+    results.extend([request(), request()])
+    os.remove(child_template)
+    results.extend([request(), request()])
+    return results
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestTemplateResolution(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.make_project(self.root, sample_project.make_posts(3), sub_sites=('a',))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_shadowing_template_added_and_removed_while_serving(self):
+        results = sample_project.run_in_process(_serve_shadowing, self.root)
+        pages = [page for page, _ in results]
+        self.assertTrue(pages[0].startswith(b'<!doctype html>'))
+        self.assertEqual([pages[0], pages[0], b'CHILD Welcome', b'CHILD Welcome', pages[0], pages[0]], pages)
+        # dirs are scanned again only after they changed
+        n_scans = [n for _, n in results]
+        self.assertEqual(n_scans[0], n_scans[1])
+        self.assertEqual(n_scans[2], n_scans[3])
+        self.assertEqual(n_scans[4], n_scans[5])
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestCompiledTemplates(unittest.TestCase):
+    """Templates are compiled once for all the sites of the process"""
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.make_project(self.root, sample_project.make_posts(3), sub_sites=('a', 'b'))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def render(self):
+        return sample_project.run_in_process(_render_counting_compiles, self.root, ('/', '/a/', '/b/'))
+
+    def test_shared_by_sites(self):
+        pages, n_compiles = self.render()
+        self.assertEqual({
+            os.path.join('themes', 'default.html'): 1,
+            os.path.join('themes', 'sidebar.html'): 1,
+        }, n_compiles)
+        # rendered with the contents of every site
+        self.assertIn(b'<li>Post 1</li>', pages[0])
+        self.assertIn(b'<ul><li>Sub a</li></ul>', pages[1])
+        self.assertIn(b'<ul><li>Sub b</li></ul>', pages[2])
+
+    def test_different_template_dirs(self):
+        child_sidebar = os.path.join(self.root, 'sites', 'a', 'themes', 'sidebar.html')
+        sample_project.write_file(child_sidebar, '<p>CHILD SIDEBAR</p>\n')
+        pages, n_compiles = self.render()
+        self.assertEqual({
+            os.path.join('themes', 'default.html'): 1,
+            os.path.join('themes', 'sidebar.html'): 1,
+            os.path.join('sites', 'a', 'themes', 'sidebar.html'): 1,
+        }, n_compiles)
+        self.assertNotIn(b'CHILD SIDEBAR', pages[0])
+        self.assertIn(b'<p>CHILD SIDEBAR</p>', pages[1])
+        self.assertNotIn(b'<ul><li>Sub a</li></ul>', pages[1])
+        self.assertNotIn(b'CHILD SIDEBAR', pages[2])
+        self.assertIn(b'<ul><li>Sub b</li></ul>', pages[2])
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestBytecodeCache(unittest.TestCase):
+    """Templates compiled by a load are loaded from the bytecode cache by the next ones, till their sources change"""
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.make_project(self.root, sample_project.make_posts(3))
+        self.sidebar = os.path.join(self.root, 'themes', 'sidebar.html')
+        pages, n_compiles = self.render()
+        self.assertEqual(2, len(n_compiles))
+        self.assertTrue(os.listdir(os.path.join(self.root, '_cache', TEMPLATE_BYTECODE_DIR_NAME)))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def render(self):
+        return sample_project.run_in_process(_render_counting_compiles, self.root, ('/', ))
+
+    def edit_sidebar(self):
+        """Changes the sidebar keeping its size and mtime"""
+        st = os.stat(self.sidebar)
+        with open(self.sidebar, encoding='utf-8') as f:
+            text = f.read()
+        sample_project.write_file(self.sidebar, text.replace('<ul>', '<ol>').replace('</ul>', '</ol>'))
+        os.utime(self.sidebar, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def test_unchanged(self):
+        pages, n_compiles = self.render()
+        self.assertEqual({}, n_compiles)
+        self.assertIn(b'<ul><li>', pages[0])
+
+    def test_changed(self):
+        self.edit_sidebar()
+        pages, n_compiles = self.render()
+        self.assertEqual({os.path.join('themes', 'sidebar.html'): 1}, n_compiles)
+        self.assertIn(b'<ol><li>', pages[0])
+        self.assertNotIn(b'<ul>', pages[0])
+
+    def test_changed_between_builds(self):
+        self.assertTrue(sample_project.build(self.root))
+        self.edit_sidebar()
+        self.assertTrue(sample_project.build(self.root, full=True))
+        outputs = sample_project.read_outputs(self.root)
+        self.assertIn(b'<ol><li>', outputs['index.html'])
+        self.assertNotIn(b'<ul>', outputs['index.html'])
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestFragmentCache(unittest.TestCase):
+    """{% cache %} blocks around the sidebar and the heading of the pages, the heading varies on the title"""
+    def setUp(self):
+        posts = sample_project.make_posts(8)
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.make_project(self.root, posts, sub_sites=('a',))
+        _edit_default_html(self.root, (
+            ('{% include "sidebar.html" %}', '{% cache "sidebar" %}{% include "sidebar.html" %}{% endcache %}'),
+            ('<body>', '<body>\n<h2>{% cache "heading", content.title %}{{ content.title }}{% endcache %}</h2>'),
+        ))
+        # the same without the cache tags
+        self.plain_root = tempfile.mkdtemp(prefix='synamic_test_')
+        sample_project.make_project(self.plain_root, posts, sub_sites=('a',))
+        _edit_default_html(self.plain_root, (('<body>', '<body>\n<h2>{{ content.title }}</h2>'),))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        shutil.rmtree(self.plain_root)
+
+    def build(self, full=True):
+        return sample_project.run_in_process(_build_counting_fragments, self.root, full)
+
+    def test_same_as_without_cache(self):
+        self.build()
+        self.assertTrue(sample_project.build(self.plain_root, full=True))
+        outputs = sample_project.read_outputs(self.root)
+        plain_outputs = sample_project.read_outputs(self.plain_root)
+        self.assertEqual(sorted(plain_outputs), sorted(outputs))
+        for path, data in plain_outputs.items():
+            self.assertEqual(data, outputs[path], path)
+        self.assertIn(b'<h2>Post 3</h2>', outputs[os.path.join('blog', 'post-3', 'index.html')])
+
+    def test_rendered_once_for_every_vary_on_value(self):
+        asked, rendered = self.build()
+        # every fragment is rendered the first time it is asked for in the site and only then
+        self.assertEqual(sorted(set(asked)), sorted(rendered))
+        self.assertGreater(len(asked), len(rendered))
+        sidebars = sorted(fragment_id for fragment_id in rendered if fragment_id[1] == ('sidebar', ))
+        self.assertEqual([('', ('sidebar', )), ('a', ('sidebar', ))], sidebars)
+        headings = {key for _, key in rendered if key[0] == 'heading'}
+        self.assertIn(('heading', 'Post 3'), headings)
+        self.assertIn(('heading', 'Welcome'), headings)
+
+    def test_included_template_changed_while_serving(self):
+        results = sample_project.run_in_process(_serve_editing_sidebar, self.root)
+        pages = [page for page, _ in results]
+        self.assertEqual(pages[0], pages[1])
+        self.assertNotIn(b'sidebar changed', pages[0])
+        self.assertEqual(pages[2], pages[3])
+        self.assertIn(b'sidebar changed', pages[2])
+        self.assertEqual(pages[0], pages[2].replace(b'<!-- sidebar changed -->\n', b''))
+        # rendered again only after the change
+        n_rendered = [n for _, n in results]
+        self.assertEqual(n_rendered[0], n_rendered[1])
+        self.assertLess(n_rendered[1], n_rendered[2])
+        self.assertEqual(n_rendered[2], n_rendered[3])
+
+    def test_included_template_changed_between_builds(self):
+        self.build()
+        with open(os.path.join(self.root, 'themes', 'sidebar.html'), 'a', encoding='utf-8') as f:
+            f.write('<!-- sidebar changed -->\n')
+        self.build(full=False)
+        outputs = sample_project.read_outputs(self.root)
+        for path in ('index.html', os.path.join('blog', 'post-3', 'index.html'), os.path.join('a', 'index.html')):
+            self.assertIn(b'sidebar changed', outputs[path], path)
+        self.build()
+        self.assertEqual(sample_project.read_outputs(self.root), outputs)
+
+
+@unittest.skipUnless(sample_project.CAN_FORK, 'Projects are loaded in forked processes')
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='synamic_test_')
+        self.posts = sample_project.make_posts(6)
+        sample_project.make_project(self.root, self.posts)
+        # a body of some chunks of rendered text
+        big_post = dict(self.posts[0], title='Big Post', slug='big-post')
+        body = '\n\n'.join(f'Paragraph {idx} with **some** text.' for idx in range(3000))
+        sample_project.write_file(
+            os.path.join(self.root, 'contents', 'blog', 'big-post.md'), sample_project.post_text(big_post, body)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_chunks_joined_same_as_render(self):
+        urls = ('/', '/blog/', '/blog/_/page/1/', '/blog/post-2/', '/blog/big-post/')
+        results = sample_project.run_in_process(_render_streamed_and_whole, self.root, urls)
+        for url, (n_chunks, joined, rendered) in zip(urls, results):
+            self.assertEqual(rendered, joined, url)
+        n_chunks, joined, _ = results[-1]
+        self.assertGreater(len(joined), 3 * RENDER_CHUNK_SIZE)
+        self.assertGreater(n_chunks, 3)
+
+    def test_error_while_streaming(self):
+        self.assertTrue(sample_project.build(self.root, full=True))
+        big_output = os.path.join(self.root, '_outputs', 'blog', 'big-post', 'index.html')
+        self.assertTrue(os.path.exists(big_output))
+        # fails after the body is rendered
+        _edit_default_html(self.root, ((
+            '{{ content.body.as_markup }}',
+            "{{ content.body.as_markup }}{% if content.title == 'Big Post' %}{{ content.title.no_method() }}{% endif %}"
+        ), ))
+        self.assertFalse(sample_project.build(self.root))
+        self.assertFalse(os.path.exists(big_output))
+        self.assertFalse(sample_project.build(self.root, full=True))
+        self.assertFalse(os.path.exists(big_output))
+
+
+if __name__ == '__main__':
+    unittest.main()